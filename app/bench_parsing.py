@@ -0,0 +1,97 @@
+# app/bench_parsing.py
+# Run with: python -m app.bench_parsing
+import re
+import time
+from app.services.section_segmenter import skills_section_text
+from app.services.field_scanner import scan_fields
+
+# Skills-section regex used by extract_skills before the one-pass segmenter
+LEGACY_SKILLS_PATTERN = re.compile(
+    r"(Required Skills(?: & Tools)?|Requirements)\s*[:\-]?\s*(.*?)(?=\n[A-Z][A-Za-z\s&]*\n|\Z)", re.S | re.I
+)
+
+# Field regexes used by parse_resume before the fused scanner (one pass each)
+LEGACY_EXPERIENCE_REGEX = re.compile(r"(\d+(\.\d+)?)\s*(years?|yrs?|months?|mos?)", re.I)
+LEGACY_SALARY_REGEX = re.compile(r"(₹|\$)\s*\d+(,\d{3})*(\.\d+)?", re.I)
+
+SAMPLE_RESUME = """John Doe
+john@example.com
+Summary
+Backend engineer with 4 years of experience building APIs.
+Technical Skills:
+Python, Django, SQL, Docker / Kubernetes, Machine Learning (Regression, Classification)
+Experience
+Software Engineer, Acme Corp - 2 years
+Built data pipelines with Pandas and deployed on AWS. Expected salary $85,000.
+Education
+B.Tech in Computer Science, Example University, 4 years
+"""
+
+
+def adversarial_inputs(size=200_000):
+    """Inputs that make the legacy lazy/lookahead pattern work hard."""
+    # Heading-poor prose: one giant section, the lookahead is retried at every newline
+    prose = "Requirements: " + ("Worked on many projects using several tools and libraries 1\n" * (size // 60))
+    # Capitalised lines that almost look like headings but end in punctuation
+    near_headings = "Required Skills\n" + ("Almost A Heading But Not Quite.\n" * (size // 32))
+    # Single huge line with no newline at all
+    one_line = "Required Skills & Tools - " + ("python sql docker " * (size // 18))
+    # No heading at all: the legacy fallback hands the whole text to spaCy
+    no_heading = "lorem ipsum dolor sit amet\n" * (size // 27)
+    return {
+        "resume": SAMPLE_RESUME,
+        "prose": prose,
+        "near_headings": near_headings,
+        "one_line": one_line,
+        "no_heading": no_heading,
+    }
+
+
+def time_call(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def legacy_skills_section(text):
+    match = LEGACY_SKILLS_PATTERN.search(text)
+    return match.group(2) if match else text
+
+
+def bench_sections():
+    print(f"{'input':<15}{'chars':>10}{'legacy ms':>12}{'segmenter ms':>14}{'legacy spaCy chars':>20}{'new spaCy chars':>17}")
+    for name, text in adversarial_inputs().items():
+        legacy = time_call(lambda: legacy_skills_section(text)) * 1000
+        segmented = time_call(lambda: skills_section_text(text)) * 1000
+        print(
+            f"{name:<15}{len(text):>10}{legacy:>12.2f}{segmented:>14.2f}"
+            f"{len(legacy_skills_section(text)):>20}{len(skills_section_text(text)):>17}"
+        )
+
+
+def legacy_fields(text):
+    """The four scans (plus post-processing) parse_resume used to run."""
+    experience = [m[0] + " " + m[2] for m in LEGACY_EXPERIENCE_REGEX.findall(text)]
+    salary = ["".join(m) for m in LEGACY_SALARY_REGEX.findall(text)]
+    degrees = set(re.findall(r"(B\.?Tech|M\.?Tech|Bachelor|Master|MBA|Ph\.?D)", text, re.I))
+    institutes = set(re.findall(r"(University|College|Institute|School of [A-Za-z]+)", text, re.I))
+    return experience, salary, degrees, institutes
+
+
+def bench_fields():
+    print(f"{'copies':<10}{'chars':>10}{'4 scans ms':>12}{'fused ms':>10}{'speedup':>9}")
+    for copies in (1, 50, 500, 2000):
+        text = SAMPLE_RESUME * copies
+        legacy = time_call(lambda: legacy_fields(text)) * 1000
+        fused = time_call(lambda: scan_fields(text)) * 1000
+        print(f"{copies:<10}{len(text):>10}{legacy:>12.2f}{fused:>10.2f}{legacy / fused:>8.1f}x")
+
+
+if __name__ == "__main__":
+    print("🔍 Skills section: legacy regex vs one-pass segmenter")
+    bench_sections()
+    print("\n🔍 Experience / salary / education: four scans vs one fused scan")
+    bench_fields()
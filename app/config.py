@@ -0,0 +1,103 @@
+# app/config.py
+import os
+
+# ---------------- Matching ----------------
+# Total time a /match_resumes_job request may take before it answers with partial results
+MATCH_REQUEST_BUDGET_SECONDS = float(os.getenv("MATCH_REQUEST_BUDGET_SECONDS", "30"))
+# Time one resume may spend being processed before it is reported as timed out. Its thread
+# cannot be stopped and finishes in the background (the result is still stored); keep this
+# above PDF_TIMEOUT_SECONDS, which bounds the extraction stage, to leave time for parsing
+MATCH_RESUME_TIMEOUT_SECONDS = float(os.getenv("MATCH_RESUME_TIMEOUT_SECONDS", "15"))
+# Threads parsing and scoring resumes
+MATCH_WORKERS = int(os.getenv("MATCH_WORKERS", str(os.cpu_count() or 4)))
+# Resumes parsed at the same moment (by any request) share one spaCy pass: the most per pass,
+# and how long the first one waits for others to join
+NLP_BATCH_MAX_DOCUMENTS = int(os.getenv("NLP_BATCH_MAX_DOCUMENTS", "32"))
+NLP_BATCH_MAX_WAIT_MS = float(os.getenv("NLP_BATCH_MAX_WAIT_MS", "5"))
+
+# ---------------- Admission control ----------------
+# Matching requests processed at once, and how many of those may be bulk (the rest is kept for interactive ones)
+ADMISSION_MAX_ACTIVE = int(os.getenv("ADMISSION_MAX_ACTIVE", str(max(2, MATCH_WORKERS))))
+ADMISSION_BULK_MAX_ACTIVE = int(os.getenv("ADMISSION_BULK_MAX_ACTIVE", str(max(1, ADMISSION_MAX_ACTIVE // 2))))
+# Requests waiting per priority class, and how long one may wait before it is turned away (503)
+ADMISSION_MAX_QUEUED = int(os.getenv("ADMISSION_MAX_QUEUED", "50"))
+ADMISSION_QUEUE_TIMEOUT_SECONDS = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", "10"))
+# Requests one client (X-Client-Id header, else its address) may have running or queued (429 beyond)
+ADMISSION_CLIENT_MAX_ACTIVE = int(os.getenv("ADMISSION_CLIENT_MAX_ACTIVE", "4"))
+# Behind a reverse proxy: count clients by the first X-Forwarded-For address instead of the proxy's.
+# Only enable it when the proxy sets that header, since clients can send it themselves.
+ADMISSION_TRUST_FORWARDED_FOR = os.getenv("ADMISSION_TRUST_FORWARDED_FOR", "false").lower() == "true"
+# Requests are admitted before their body is read: bodies up to this size (by Content-Length) are
+# interactive; larger ones, bodies without a length, ZIPs, background batches and rescoring are bulk
+ADMISSION_INTERACTIVE_MAX_BYTES = int(os.getenv("ADMISSION_INTERACTIVE_MAX_BYTES", str(5 * 1024 * 1024)))
+# Resumes of requests with at most this many take worker threads ahead of those of larger ones
+ADMISSION_INTERACTIVE_MAX_RESUMES = int(os.getenv("ADMISSION_INTERACTIVE_MAX_RESUMES", "5"))
+# Retry-After sent with 429 and 503
+ADMISSION_RETRY_AFTER_SECONDS = int(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", "5"))
+
+# ---------------- Uploads ----------------
+# Largest PDF, largest request body and most files accepted per request
+UPLOAD_MAX_FILE_BYTES = int(os.getenv("UPLOAD_MAX_FILE_BYTES", str(10 * 1024 * 1024)))
+UPLOAD_MAX_REQUEST_BYTES = int(os.getenv("UPLOAD_MAX_REQUEST_BYTES", str(200 * 1024 * 1024)))
+UPLOAD_MAX_FILES = int(os.getenv("UPLOAD_MAX_FILES", "500"))
+# Resumable (chunked) uploads: where sessions are kept, largest chunk, and how long an idle session is kept
+UPLOAD_SESSION_DIR = os.getenv("UPLOAD_SESSION_DIR", os.path.join("uploaded_resumes", "sessions"))
+UPLOAD_CHUNK_MAX_BYTES = int(os.getenv("UPLOAD_CHUNK_MAX_BYTES", str(8 * 1024 * 1024)))
+UPLOAD_SESSION_TTL_SECONDS = int(os.getenv("UPLOAD_SESSION_TTL_SECONDS", str(24 * 3600)))
+# ZIP uploads: most bytes the PDFs may inflate to in total, and the highest compression ratio of one PDF
+ZIP_MAX_TOTAL_BYTES = int(os.getenv("ZIP_MAX_TOTAL_BYTES", str(1024 * 1024 * 1024)))
+ZIP_MAX_RATIO = int(os.getenv("ZIP_MAX_RATIO", "100"))
+
+# ---------------- Background batches ----------------
+# Where uploads of /match_resumes_job/async are spooled until they are processed
+BATCH_SPOOL_DIR = os.getenv("BATCH_SPOOL_DIR", os.path.join("uploaded_resumes", "batches"))
+# Resumes of a background batch processed at once (leaves workers free for interactive requests)
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", str(max(1, MATCH_WORKERS // 2))))
+
+# ---------------- PDF extraction workers ----------------
+# Worker processes extracting PDF text
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", str(MATCH_WORKERS)))
+# Wall-clock limit for one PDF; the worker is killed when it is exceeded. Part of the
+# per-resume MATCH_RESUME_TIMEOUT_SECONDS, so it is shorter
+PDF_TIMEOUT_SECONDS = float(os.getenv("PDF_TIMEOUT_SECONDS", "10"))
+# Address-space limit of each worker process (0 disables it)
+PDF_MEMORY_LIMIT_MB = int(os.getenv("PDF_MEMORY_LIMIT_MB", "1024"))
+# Documents a worker extracts before it is replaced with a fresh process
+PDF_WORKER_MAX_DOCUMENTS = int(os.getenv("PDF_WORKER_MAX_DOCUMENTS", "50"))
+
+# ---------------- MongoDB ----------------
+MONGODB_URL = os.getenv("MONGODB_URL", "mongodb://localhost:27017/")
+DB_NAME = os.getenv("DB_NAME", "resume_db")
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "50"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "5"))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "60000"))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "5000"))
+MONGO_SOCKET_TIMEOUT_MS = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "20000"))
+# Write concern: "1", "majority", ...; journal=true waits for the on-disk journal
+MONGO_WRITE_CONCERN = os.getenv("MONGO_WRITE_CONCERN", "1")
+MONGO_JOURNAL = os.getenv("MONGO_JOURNAL", "false").lower() == "true"
+
+# ---------------- Write-behind persistence ----------------
+# Documents per bulk insert, and the longest a document waits before its batch is flushed
+WRITE_BEHIND_BATCH_SIZE = int(os.getenv("WRITE_BEHIND_BATCH_SIZE", "100"))
+WRITE_BEHIND_FLUSH_INTERVAL_SECONDS = float(os.getenv("WRITE_BEHIND_FLUSH_INTERVAL_SECONDS", "0.5"))
+# Documents buffered in memory; producers wait (backpressure) once it is full
+WRITE_BEHIND_MAX_PENDING = int(os.getenv("WRITE_BEHIND_MAX_PENDING", "1000"))
+# Attempts per batch before it is dropped and logged
+WRITE_BEHIND_RETRIES = int(os.getenv("WRITE_BEHIND_RETRIES", "3"))
+
+# ---------------- Upload deduplication ----------------
+# Expected number of distinct resumes and the Bloom filter's false-positive rate
+DEDUP_BLOOM_CAPACITY = int(os.getenv("DEDUP_BLOOM_CAPACITY", "1000000"))
+DEDUP_BLOOM_ERROR_RATE = float(os.getenv("DEDUP_BLOOM_ERROR_RATE", "0.001"))
+# How often resumes stored by other processes (other app workers, python -m app.ingest) are added to
+# the filter, and how far back each refresh looks: documents are written some time after they are
+# created (write-behind, ingest chunks), so it must exceed that delay
+DEDUP_BLOOM_REFRESH_SECONDS = float(os.getenv("DEDUP_BLOOM_REFRESH_SECONDS", "60"))
+DEDUP_BLOOM_REFRESH_OVERLAP_SECONDS = float(os.getenv("DEDUP_BLOOM_REFRESH_OVERLAP_SECONDS", "600"))
+
+# ---------------- Job leaderboards ----------------
+# Candidates kept per job, and events (new resumes / saved jobs) buffered for the updater
+LEADERBOARD_SIZE = int(os.getenv("LEADERBOARD_SIZE", "100"))
+LEADERBOARD_MAX_PENDING = int(os.getenv("LEADERBOARD_MAX_PENDING", "10000"))
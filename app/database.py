@@ -1,5 +1,77 @@
+# app/database.py
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorGridFSBucket
 from pymongo import MongoClient
+from app.config import (
+    MONGODB_URL, DB_NAME, MONGO_MAX_POOL_SIZE, MONGO_MIN_POOL_SIZE, MONGO_MAX_IDLE_TIME_MS,
+    MONGO_SERVER_SELECTION_TIMEOUT_MS, MONGO_CONNECT_TIMEOUT_MS, MONGO_SOCKET_TIMEOUT_MS,
+    MONGO_WRITE_CONCERN, MONGO_JOURNAL,
+)
+
+
+def client_options():
+    """Connection pool, timeout and write concern settings."""
+    return {
+        "maxPoolSize": MONGO_MAX_POOL_SIZE,
+        "minPoolSize": MONGO_MIN_POOL_SIZE,
+        "maxIdleTimeMS": MONGO_MAX_IDLE_TIME_MS,
+        "serverSelectionTimeoutMS": MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "connectTimeoutMS": MONGO_CONNECT_TIMEOUT_MS,
+        "socketTimeoutMS": MONGO_SOCKET_TIMEOUT_MS,
+        "w": int(MONGO_WRITE_CONCERN) if MONGO_WRITE_CONCERN.isdigit() else MONGO_WRITE_CONCERN,
+        "journal": MONGO_JOURNAL,
+    }
+
+
+class MongoDB:
+    """
+    Async (motor) access to MongoDB for request handlers.
+    Opened and closed by the FastAPI lifespan, so nothing connects at import time.
+    """
+
+    def __init__(self):
+        self.client = None
+        self.db = None
+        self.files = None
+
+    async def connect(self):
+        self.client = AsyncIOMotorClient(MONGODB_URL, **client_options())
+        self.db = self.client[DB_NAME]
+        # Resume PDFs live in GridFS, outside the resumes collection
+        self.files = AsyncIOMotorGridFSBucket(self.db, bucket_name="resume_files")
+
+    def close(self):
+        if self.client is not None:
+            self.client.close()
+            self.client = None
+            self.db = None
+            self.files = None
+
+    @property
+    def resumes(self):
+        return self.db["resumes"]
+
+    @property
+    def batches(self):
+        return self.db["batches"]
+
+    @property
+    def match_results(self):
+        return self.db["match_results"]
+
+    @property
+    def jobs(self):
+        return self.db["jobs"]
+
+    @property
+    def job_matches(self):
+        return self.db["job_matches"]
+
+
+mongo = MongoDB()
+
+
+def sync_database():
+    """Blocking (pymongo) client and database for command-line jobs that run outside the app."""
+    client = MongoClient(MONGODB_URL, **client_options())
+    return client, client[DB_NAME]
 
-client = MongoClient("mongodb://localhost:27017/")  # adjust URI
-db = client["resume_db"]
-resumes_collection = db["resumes"]
@@ -0,0 +1,234 @@
+# app/ingest.py
+# Run with: python -m app.ingest resumes/ [--resume] [--workers N]
+#
+# Loads a directory of resume PDFs straight into MongoDB, without going through the HTTP
+# endpoint. Each file is read once, in a worker process: hashed, deduplicated (within the
+# chunk and against stored resumes), extracted in a sandboxed PDF worker and stored in the
+# blob store from the same bytes; the chunk is then parsed with batched spaCy and the parent
+# writes the resume documents in bulk. Progress is checkpointed per chunk, in path order, so
+# an interrupted run continues where it stopped with --resume. Job leaderboards are not
+# updated here; python -m app.rescore rebuilds them once the run is done.
+import argparse
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from bson import ObjectId
+from gridfs import GridFSBucket
+from gridfs.errors import FileExists, NoFile
+from pymongo import UpdateOne
+from pymongo.errors import DuplicateKeyError
+from app.config import PDF_MEMORY_LIMIT_MB, PDF_TIMEOUT_SECONDS, PDF_WORKER_MAX_DOCUMENTS
+from app.database import sync_database
+from app.services.blob_store import CHUNK_SIZE_BYTES, content_hash
+from app.services.pdf_workers import PdfExtractionError, PdfWorkerPool
+
+# Per worker process: its own sandboxed PDF extractor and database connection
+# (spaCy is loaded on first use)
+_pdf_pool = None
+_db = None
+_bucket = None
+
+
+def _init_worker():
+    global _pdf_pool, _db, _bucket
+    _pdf_pool = PdfWorkerPool(
+        size=1, timeout=PDF_TIMEOUT_SECONDS, memory_limit_mb=PDF_MEMORY_LIMIT_MB,
+        max_documents=PDF_WORKER_MAX_DOCUMENTS,
+    )
+    _pdf_pool.start()
+    _, _db = sync_database()
+    _bucket = GridFSBucket(_db, bucket_name="resume_files")
+
+
+def _find_blob(bucket, resume_hash):
+    return next(iter(bucket.find({"metadata.sha256": resume_hash}, limit=1)), None)
+
+
+def _put_blob(bucket, filename, resume_hash, data):
+    existing = _find_blob(bucket, resume_hash)
+    if existing is not None:
+        return {"sha256": resume_hash, "gridfs_id": existing._id, "size": existing.length}
+    file_id = ObjectId()
+    try:
+        bucket.upload_from_stream_with_id(
+            file_id, filename, data, chunk_size_bytes=CHUNK_SIZE_BYTES,
+            metadata={"sha256": resume_hash, "content_type": "application/pdf"},
+        )
+    except (FileExists, DuplicateKeyError):
+        # Stored meanwhile by the app or another worker (unique sha256 index): drop our chunks
+        try:
+            bucket.delete(file_id)
+        except NoFile:
+            pass
+        file_id = _find_blob(bucket, resume_hash)._id
+    return {"sha256": resume_hash, "gridfs_id": file_id, "size": len(data)}
+
+
+def ingest_chunk(paths, spacy_batch_size):
+    """
+    Read, deduplicate, extract, store and parse a chunk of PDFs (runs in a worker process).
+    Each file is read once. Returns (resume documents, failures, duplicate count).
+    """
+    # Imported here so the parent process never loads spaCy
+    from app.services.matching_service import term_counts
+    from app.services.resume_parser import parse_resume_texts
+    from app.services.resume_store import build_resume_document, known_hashes_query
+
+    files, failures = {}, []  # hash -> (path, bytes), first path wins within the chunk
+    duplicates = 0
+    for path in paths:
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError as e:
+            failures.append((path, "unreadable", str(e)))
+            continue
+        resume_hash = content_hash(data)
+        if resume_hash in files:
+            duplicates += 1
+        else:
+            files[resume_hash] = (path, data)
+
+    # One query per chunk, answered from the unique content_hash index
+    stored = {doc["content_hash"] for doc in _db["resumes"].find(*known_hashes_query(files))}
+    duplicates += len(stored)
+
+    texts, extracted = [], []
+    for resume_hash, (path, data) in files.items():
+        if resume_hash in stored:
+            continue
+        try:
+            texts.append(_pdf_pool.extract_text(data))
+        except PdfExtractionError as e:
+            failures.append((path, e.code, str(e)))
+            continue
+        file_ref = _put_blob(_bucket, os.path.basename(path), resume_hash, data)
+        extracted.append((path, resume_hash, file_ref))
+    files.clear()
+
+    documents = []
+    for (path, resume_hash, file_ref), text, parsed in zip(extracted, texts, parse_resume_texts(texts, spacy_batch_size)):
+        document = build_resume_document(os.path.basename(path), resume_hash, parsed, text, term_counts(text))
+        document["file_ref"] = file_ref
+        documents.append(document)
+    return documents, failures, duplicates
+
+
+def find_pdfs(directory):
+    """Every PDF under `directory`, in a stable (sorted) order so checkpoints are meaningful."""
+    paths = []
+    for root, _, files in os.walk(directory):
+        paths += [os.path.join(root, name) for name in files if name.lower().endswith(".pdf")]
+    return sorted(paths)
+
+
+class Ingester:
+    """One ingestion run over a directory: its checkpoint, dedup state and counters."""
+
+    def __init__(self, db, directory, resume):
+        self.db = db
+        self.runs = db["ingest_runs"]
+        self.seen = set()  # hashes stored by this run
+
+        directory = os.path.abspath(directory)
+        self.run = self.runs.find_one({"_id": directory, "status": "running"}) if resume else None
+        if self.run is None:
+            self.run = {
+                "_id": directory, "status": "running", "last_path": None,
+                "new": 0, "duplicates": 0, "failed": 0, "started_at": datetime.now(timezone.utc),
+            }
+            self.runs.replace_one({"_id": directory}, self.run, upsert=True)
+        else:
+            print(f"Resuming after {self.run['last_path']}")
+
+    def pending_paths(self, paths):
+        last = self.run["last_path"]
+        return [p for p in paths if last is None or p > last]
+
+    def write_chunk(self, last_path, result):
+        """Store a chunk's resumes in bulk (its PDFs are already stored), then checkpoint past it."""
+        parsed, failures, duplicates = result
+        # Copies of one PDF in chunks that were processed at the same time are told apart here
+        documents = [d for d in parsed if d["content_hash"] not in self.seen]
+        duplicates += len(parsed) - len(documents)
+        self.seen.update(d["content_hash"] for d in documents)
+        if documents:
+            # Insert-if-absent on the unique hash, like the app's resume writer
+            self.db["resumes"].bulk_write([
+                UpdateOne({"content_hash": d["content_hash"]}, {"$setOnInsert": d}, upsert=True) for d in documents
+            ], ordered=False)
+        for path, code, message in failures:
+            print(f"⚠️ {path}: {code}: {message}")
+
+        self.run["last_path"] = last_path
+        self.run["new"] += len(documents)
+        self.run["duplicates"] += duplicates
+        self.run["failed"] += len(failures)
+        self.runs.update_one({"_id": self.run["_id"]}, {"$set": {
+            "last_path": last_path, "new": self.run["new"], "duplicates": self.run["duplicates"],
+            "failed": self.run["failed"], "updated_at": datetime.now(timezone.utc),
+        }})
+
+    def finish(self):
+        self.runs.update_one({"_id": self.run["_id"]}, {
+            "$set": {"status": "done", "finished_at": datetime.now(timezone.utc)}
+        })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-load a directory of resume PDFs into MongoDB.")
+    parser.add_argument("directory")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=64, help="files per worker task")
+    parser.add_argument("--spacy-batch-size", type=int, default=32, help="texts per nlp.pipe batch")
+    parser.add_argument("--resume", action="store_true", help="continue the last interrupted run over this directory")
+    args = parser.parse_args()
+
+    client, db = sync_database()
+    try:
+        ingester = Ingester(db, args.directory, args.resume)
+        paths = ingester.pending_paths(find_pdfs(ingester.run["_id"]))
+        print(f"📥 Ingesting {len(paths)} PDFs with {args.workers} workers")
+
+        started, done = time.perf_counter(), 0
+
+        def write_next():
+            nonlocal done
+            last_path, chunk_size, future = in_flight.popleft()
+            ingester.write_chunk(last_path, future.result())
+            done += chunk_size
+            run = ingester.run
+            print(f"{done:>8}/{len(paths)} files {run['new']:>8} new {run['duplicates']:>8} duplicates "
+                  f"{run['failed']:>6} failed {done / (time.perf_counter() - started):>8.1f} files/s")
+
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(args.workers, mp_context=context, initializer=_init_worker) as pool:
+            # Chunks complete out of order but are written in order, so the checkpoint never skips one
+            in_flight = deque()
+            for start in range(0, len(paths), args.chunk_size):
+                chunk = paths[start:start + args.chunk_size]
+                future = pool.submit(ingest_chunk, chunk, args.spacy_batch_size)
+                in_flight.append((chunk[-1], len(chunk), future))
+                while len(in_flight) > args.workers * 2 or (in_flight and in_flight[0][2].done()):
+                    write_next()
+            while in_flight:
+                write_next()
+
+        ingester.finish()
+        elapsed = time.perf_counter() - started
+        run = ingester.run
+        print(f"✅ {done} files in {elapsed:.1f}s ({done / elapsed if elapsed else 0:.1f} files/s): "
+              f"{run['new']} new, {run['duplicates']} duplicates, {run['failed']} failed")
+        if run["new"]:
+            # Leaderboards are left to rescore: it scores the whole corpus against every open job
+            # in one pass instead of one event per resume here
+            print("Run python -m app.rescore to add the new resumes to the job leaderboards")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,309 @@
 # app/main.py
-from fastapi import FastAPI, UploadFile, File, Form
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Request
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from scipy.sparse import csr_matrix
-from app.services.resume_parser import parse_resume
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.datastructures import Headers
+from contextlib import aclosing, asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+from app.services.resume_parser import parse_resume_texts
 from app.services.job_parser import parse_job_post
-from app.database import resumes_collection
-import pdfplumber
+from app.services.matching_service import compile_job, rank_features, score_features, score_resume_counts, term_counts
+from app.services.batch_runner import CANCELLED, BatchItem, check_cancelled, iter_batch
+from app.services.micro_batch import MicroBatcher
+from app.services.scheduler import (
+    BULK, CLIENT_LIMIT, INTERACTIVE, OVERLOADED, AdmissionController, AdmissionRejected, PriorityExecutor,
+)
+from app.services.pdf_workers import PdfWorkerPool, PdfExtractionError
+from app.services.write_behind import WriteBehindQueue
+from app.services.blob_store import ResumeBlobStore, content_hash
+from app.services.resume_store import (
+    LEADERBOARD_ORDER, SEARCH_PROJECTION, build_resume_document, ensure_indexes, known_hashes_query, search_query,
+    stored_parses_query,
+)
+from app.services.job_store import build_job_document, compiled_job, job_response, parse_job_id
+from app.services.leaderboard import LeaderboardUpdater
+from app.services.batch_jobs import BatchJobQueue, PENDING
+from app.services.upload_spool import SpooledUpload, UploadLimitError, UploadSpool, map_file, map_path
+from app.services.chunked_uploads import (
+    CHECKSUM_MISMATCH, INCOMPLETE, NOT_FOUND, OFFSET_MISMATCH, TOO_LARGE, ChunkedUploadError, ChunkedUploadStore,
+)
+from app.services.zip_upload import close_after, open_archive, pdf_members, read_member
+from app.services.dedup import BloomFilter, load_known_hashes
+from app.services.resume_features import FEATURES_PROJECTION, FEATURES_VERSION, decode_features
+from app.models.schemas import HashQuery, JobPost, UploadCreate
+from app.database import mongo
+from app.config import (
+    MATCH_REQUEST_BUDGET_SECONDS, MATCH_RESUME_TIMEOUT_SECONDS, MATCH_WORKERS, BATCH_SPOOL_DIR, BATCH_CONCURRENCY,
+    NLP_BATCH_MAX_DOCUMENTS, NLP_BATCH_MAX_WAIT_MS,
+    ADMISSION_MAX_ACTIVE, ADMISSION_BULK_MAX_ACTIVE, ADMISSION_MAX_QUEUED, ADMISSION_QUEUE_TIMEOUT_SECONDS,
+    ADMISSION_CLIENT_MAX_ACTIVE, ADMISSION_INTERACTIVE_MAX_BYTES, ADMISSION_INTERACTIVE_MAX_RESUMES,
+    ADMISSION_RETRY_AFTER_SECONDS,
+    ADMISSION_TRUST_FORWARDED_FOR,
+    PDF_WORKERS, PDF_TIMEOUT_SECONDS, PDF_MEMORY_LIMIT_MB, PDF_WORKER_MAX_DOCUMENTS,
+    WRITE_BEHIND_BATCH_SIZE, WRITE_BEHIND_FLUSH_INTERVAL_SECONDS, WRITE_BEHIND_MAX_PENDING, WRITE_BEHIND_RETRIES,
+    DEDUP_BLOOM_CAPACITY, DEDUP_BLOOM_ERROR_RATE, DEDUP_BLOOM_REFRESH_SECONDS, DEDUP_BLOOM_REFRESH_OVERLAP_SECONDS,
+    LEADERBOARD_SIZE, LEADERBOARD_MAX_PENDING,
+    UPLOAD_MAX_FILE_BYTES, UPLOAD_MAX_REQUEST_BYTES, UPLOAD_MAX_FILES, ZIP_MAX_TOTAL_BYTES, ZIP_MAX_RATIO,
+    UPLOAD_SESSION_DIR, UPLOAD_CHUNK_MAX_BYTES, UPLOAD_SESSION_TTL_SECONDS,
+)
+from pymongo import ReturnDocument
+import asyncio
+import heapq
+import json
 import logging
+import re
+import shutil
+import threading
+import zipfile
 
 logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Resumes are parsed and scored off the event loop; bulk work only gets threads no interactive work is waiting for
+executor = PriorityExecutor(max_workers=MATCH_WORKERS, thread_name_prefix="match")
+bulk_executor = executor.with_priority(BULK)
+
+# Matching requests are admitted by priority class, with per-client and queue limits
+admission = AdmissionController(
+    max_active=ADMISSION_MAX_ACTIVE,
+    bulk_max_active=ADMISSION_BULK_MAX_ACTIVE,
+    max_queued=ADMISSION_MAX_QUEUED,
+    queue_timeout=ADMISSION_QUEUE_TIMEOUT_SECONDS,
+    client_max_active=ADMISSION_CLIENT_MAX_ACTIVE,
+    retry_after=ADMISSION_RETRY_AFTER_SECONDS,
+)
+
+# Resumes parsed at the same moment by any of those threads (from any request) share one nlp.pipe
+resume_parsing = MicroBatcher(
+    parse_resume_texts,
+    max_size=NLP_BATCH_MAX_DOCUMENTS,
+    max_wait=NLP_BATCH_MAX_WAIT_MS / 1000,
+)
+
+# Uploads are read where the form parser spooled them and memory-mapped rather than copied
+upload_spool = UploadSpool(
+    max_file_bytes=UPLOAD_MAX_FILE_BYTES,
+    max_request_bytes=UPLOAD_MAX_REQUEST_BYTES,
+    max_files=UPLOAD_MAX_FILES,
+)
+# Files sent in chunks over several requests; a session holds at most one request's worth
+chunked_uploads = ChunkedUploadStore(
+    UPLOAD_SESSION_DIR,
+    max_bytes=UPLOAD_MAX_REQUEST_BYTES,
+    max_chunk_bytes=UPLOAD_CHUNK_MAX_BYTES,
+    ttl_seconds=UPLOAD_SESSION_TTL_SECONDS,
+)
+# A ZIP of resumes arrives as one file, bounded by the request limit
+zip_spool = UploadSpool(
+    max_file_bytes=UPLOAD_MAX_REQUEST_BYTES,
+    max_request_bytes=UPLOAD_MAX_REQUEST_BYTES,
+    max_files=1,
+)
+
+# PDFs are turned into text in sandboxed worker processes
+pdf_pool = PdfWorkerPool(
+    size=PDF_WORKERS,
+    timeout=PDF_TIMEOUT_SECONDS,
+    memory_limit_mb=PDF_MEMORY_LIMIT_MB,
+    max_documents=PDF_WORKER_MAX_DOCUMENTS,
+)
+
+# Parsed resumes (one per content hash) and per-batch match results are persisted in bulk,
+# off the request path
+resume_writer = WriteBehindQueue(
+    lambda: mongo.resumes,
+    batch_size=WRITE_BEHIND_BATCH_SIZE,
+    flush_interval=WRITE_BEHIND_FLUSH_INTERVAL_SECONDS,
+    max_pending=WRITE_BEHIND_MAX_PENDING,
+    retries=WRITE_BEHIND_RETRIES,
+    upsert_key="content_hash",
+)
+match_writer = WriteBehindQueue(
+    lambda: mongo.match_results,
+    batch_size=WRITE_BEHIND_BATCH_SIZE,
+    flush_interval=WRITE_BEHIND_FLUSH_INTERVAL_SECONDS,
+    max_pending=WRITE_BEHIND_MAX_PENDING,
+    retries=WRITE_BEHIND_RETRIES,
+)
+
+# Resume PDFs are stored once per content hash in GridFS
+blob_store = ResumeBlobStore(lambda: mongo.files)
+
+# Top candidates per open job, updated in the background as resumes and jobs are saved
+leaderboard = LeaderboardUpdater(lambda: mongo.db, bulk_executor, size=LEADERBOARD_SIZE, max_pending=LEADERBOARD_MAX_PENDING)
+
+# Content hashes of stored resumes, so most new uploads skip the database lookup
+known_hashes = BloomFilter(DEDUP_BLOOM_CAPACITY, DEDUP_BLOOM_ERROR_RATE)
+
+async def fill_known_hashes():
+    """
+    Load the stored hashes, then keep adding those of resumes stored by other processes (other
+    app workers, python -m app.ingest), which this process never sees being written. Until a
+    refresh picks one up (DEDUP_BLOOM_REFRESH_SECONDS), such a resume counts as new here.
+    """
+    overlap = timedelta(seconds=DEDUP_BLOOM_REFRESH_OVERLAP_SECONDS)
+    loaded_at = datetime.now(timezone.utc)
+    try:
+        await load_known_hashes(known_hashes, mongo.resumes)
+        logger.info("Loaded %s known resume hashes", known_hashes.count)
+    except Exception:
+        # The filter stays "not ready": every upload is checked against the database
+        logger.exception("Could not load known resume hashes")
+        return
+    while True:
+        await asyncio.sleep(DEDUP_BLOOM_REFRESH_SECONDS)
+        started = datetime.now(timezone.utc)
+        try:
+            await load_known_hashes(known_hashes, mongo.resumes, since=loaded_at - overlap)
+        except Exception:
+            # Looked for again, from the same point, on the next refresh
+            logger.exception("Could not refresh known resume hashes")
+            continue
+        loaded_at = started
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await mongo.connect()
+    await ensure_indexes(mongo.db)
+    hash_loader = asyncio.create_task(fill_known_hashes())
+    resume_writer.start()
+    match_writer.start()
+    leaderboard.start()
+    pdf_pool.start()
+    batch_jobs.start()
+    yield
+    hash_loader.cancel()
+    await batch_jobs.stop()
+    pdf_pool.close()
+    await resume_writer.stop()
+    await match_writer.stop()
+    await leaderboard.stop()
+    mongo.close()
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+app = FastAPI(lifespan=lifespan)
+
+# How often a running batch checks whether its client has disconnected
+DISCONNECT_POLL_SECONDS = 0.5
+# Fire-and-forget tasks, referenced until they finish
+background_tasks = set()
 
-app = FastAPI()
+# Multipart framing and the form fields on top of the files themselves
+MULTIPART_OVERHEAD_BYTES = 1024 * 1024
+
+
+# ---------------- Admission control, before the body is read ----------------
+# Requests are counted per client: by this header (index.html sends a random id per browser), else
+# by address. Behind a proxy every peer address is the proxy's, see ADMISSION_TRUST_FORWARDED_FOR.
+CLIENT_ID_HEADER = "X-Client-Id"
+
+ADMISSION_ERROR_STATUS = {CLIENT_LIMIT: 429, OVERLOADED: 503}
+
+# Endpoints admitted by priority class; None: INTERACTIVE if the body is small enough, else BULK
+ADMITTED_ENDPOINTS = {
+    "/match_resumes_job": None,
+    "/match_resumes_job/stream": None,
+    "/match_resumes_zip": BULK,
+    "/match_resumes_job/async": BULK,
+    "/resumes/rescore": BULK,
+}
+
+
+def client_id(request):
+    if request.headers.get(CLIENT_ID_HEADER):
+        return "id:" + request.headers[CLIENT_ID_HEADER]
+    forwarded = request.headers.get("X-Forwarded-For")
+    if ADMISSION_TRUST_FORWARDED_FOR and forwarded:
+        # The address the (trusted) proxy received the request from
+        return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else ""
+
+
+def request_priority(request):
+    """Priority class of an admitted request, from its Content-Length (bodies without one are BULK)."""
+    priority = ADMITTED_ENDPOINTS[request.url.path]
+    if priority is None:
+        length = request.headers.get("content-length", "")
+        priority = INTERACTIVE if length.isdigit() and int(length) <= ADMISSION_INTERACTIVE_MAX_BYTES else BULK
+    return priority
+
+
+class Admission:
+    """
+    Waits for a slot of the request's class for its client before the endpoint reads the body,
+    so a client over its limit or a full queue gets 429 or 503 (with Retry-After) before uploading
+    anything. The slot is held until the response has been sent, for a stream until its last line.
+    Plain ASGI, like RequestSizeLimit.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in ADMITTED_ENDPOINTS:
+            await self.app(scope, receive, send)
+            return
+        request = Request(scope)
+        client, priority = client_id(request), request_priority(request)
+        try:
+            await admission.acquire(client, priority)
+        except AdmissionRejected as e:
+            response = JSONResponse(
+                status_code=ADMISSION_ERROR_STATUS[e.code], content={"detail": str(e)},
+                headers={"Retry-After": str(e.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            admission.release(client, priority)
+
+
+# ---------------- Reject oversized bodies before and while they are parsed ----------------
+class RequestSizeLimit:
+    """
+    Plain ASGI rather than @app.middleware("http"), which would hide the client's disconnect
+    from the endpoints (they cancel a batch when it arrives).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        limit = UPLOAD_MAX_REQUEST_BYTES + MULTIPART_OVERHEAD_BYTES
+        detail = f"Upload is larger than {UPLOAD_MAX_REQUEST_BYTES} bytes"
+        length = Headers(scope=scope).get("content-length")
+        if length and length.isdigit() and int(length) > limit:
+            await JSONResponse(status_code=413, content={"detail": detail})(scope, receive, send)
+            return
+
+        # Bodies sent without a length (or with a wrong one) are counted as they arrive, so the
+        # form parser stops at the limit instead of spooling the rest; per-file limits are
+        # checked once the form is parsed
+        received = 0
+
+        async def counted_receive():
+            nonlocal received
+            message = await receive()
+            received += len(message.get("body", b""))
+            if received > limit:
+                raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        await self.app(scope, counted_receive, send)
+
+
+# Oversized bodies are turned away before they are admitted
+app.add_middleware(Admission)
+app.add_middleware(RequestSizeLimit)
 
 # ---------------- Enable CORS ----------------
 app.add_middleware(
@@ -20,123 +311,914 @@ app.add_middleware(
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Retry-After"],
 )
 
-# ---------------- Extract text from PDF ----------------
-def extract_text_from_upload(file):
-    text = ""
-    file.seek(0)
-    with pdfplumber.open(file) as pdf:
-        for page in pdf.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text += page_text + "\n"
-    return text
-
-# ---------------- Build job text ----------------
-def build_job_text(job_data):
-    skills = " ".join(job_data.get("skills", []))
-    experience = str(job_data.get("experience") or "")
-    education = " ".join(job_data.get("education") or [])
-    salary = str(job_data.get("salary") or "")
-    job_text = f"{skills} {experience} {education} {salary}"
-    return job_text
-
-# ---------------- Skills matched ----------------
-def get_skills_matched(resume_skills, job_skills):
-    resume_skills = [s.strip().lower() for s in resume_skills]
-    job_skills = [s.strip().lower() for s in job_skills]
-    matched = [skill for skill in job_skills if skill in resume_skills]
-    return matched
-
-# ---------------- Boost TF-IDF skill weights ----------------
-def boost_skill_weights(vectorizer: TfidfVectorizer, vectors: csr_matrix, skills: list, factor: float = 5.0):
-    feature_names = vectorizer.get_feature_names_out()
-    indices_to_boost = [i for i, f in enumerate(feature_names) if f.lower() in [s.lower() for s in skills]]
-    if indices_to_boost:
-        vectors = vectors.tocsc(copy=True)
-        for idx in indices_to_boost:
-            vectors[:, idx] = vectors[:, idx] * factor
-        vectors = vectors.tocsr()
-    return vectors
+# ---------------- Process one resume (runs in a worker thread) ----------------
+def process_resume(filename, resume_bytes, resume_hash, stored_parse, job, batch_id, cancel=None):
+    # `cancel` is checked between stages, so a resume of a cancelled batch stops at the next one
+    check_cancelled(cancel)
+    features = decode_features(stored_parse) if stored_parse else None
+    if features is not None:
+        # Known resume with stored features: score it without touching the PDF
+        parsed_resume = stored_parse
+        score, skills_matched = score_features(features, job)
+        resume_text = counts = None
+    else:
+        # Extract full text (once, in an isolated worker process) and parse its structure,
+        # unless this exact PDF was parsed before
+        try:
+            resume_text = pdf_pool.extract_text(resume_bytes, cancel)
+        except PdfExtractionError:
+            check_cancelled(cancel)  # the worker was killed because the batch was cancelled
+            raise
+        check_cancelled(cancel)
+        parsed_resume = stored_parse or resume_parsing.submit(resume_text)
+        check_cancelled(cancel)
+        counts = term_counts(resume_text)
+        score, skills_matched = score_resume_counts(
+            counts, parsed_resume["parsed_skills"], job.job_data, job.counts, job.boost_terms
+        )
+
+    result = {
+        "candidate_name": filename.replace(".pdf", ""),
+        "match_score": round(score * 100, 2),
+        "skills_matched": skills_matched,
+        "parsed_skills": parsed_resume.get("parsed_skills", []),
+        "parsed_education": parsed_resume.get("parsed_education", []),
+        "parsed_experience": parsed_resume.get("parsed_experience", ""),
+        "parsed_salary": parsed_resume.get("parsed_salary", "")
+    }
+
+    # Documents stored in MongoDB by the caller: the resume (only if it is new; the PDF
+    # itself goes to the blob store) and this batch's result for it (how late results of a
+    # timed-out request are retrieved)
+    resume_document = None if stored_parse else build_resume_document(
+        filename, resume_hash, parsed_resume, resume_text, counts
+    )
+    match_document = {
+        "batch_id": batch_id,
+        "content_hash": resume_hash,
+        "filename": filename,
+        "match_result": result,
+        "created_at": datetime.now(timezone.utc)
+    }
+    return result, resume_document, match_document
+
+
+def error_result(filename, error):
+    return {
+        "candidate_name": filename.replace(".pdf", ""),
+        "match_score": 0.0,
+        "skills_matched": [],
+        "error": str(error) or type(error).__name__,
+        "error_code": error.code if isinstance(error, PdfExtractionError) else "processing_failed"
+    }
+
+
+async def record_failure(batch_id, index, filename, error):
+    """Failed resumes are recorded on the batch, with their file index, so /match_results can report them."""
+    logger.warning("Resume %s in batch %s failed: %s", filename, batch_id, error)
+    await mongo.batches.update_one(
+        {"_id": batch_id}, {"$push": {"errors": {"file_index": index, **error_result(filename, error)}}}
+    )
+
+
+async def store_resume(resume_document, match_document, resume_bytes):
+    """Store a new resume's PDF and parse, and queue this batch's result for it."""
+    if resume_document is not None:
+        resume_document["file_ref"] = await blob_store.put(
+            resume_bytes, resume_document["filename"], resume_document["content_hash"]
+        )
+        # Upsert on content_hash: a concurrent upload of the same PDF cannot create a duplicate
+        await resume_writer.put(resume_document)
+        known_hashes.add(resume_document["content_hash"])
+        features = decode_features(resume_document)
+        if features is not None:
+            await leaderboard.resume_added(features)
+    if match_document is not None:
+        await match_writer.put(match_document)
+
+
+async def find_stored_parses(hashes):
+    """Stored parse of every already-known resume among `hashes` (Bloom filter, then unique index)."""
+    candidates = list({h for h in hashes if known_hashes.might_contain(h)})
+    if not candidates:
+        return {}
+    cursor = mongo.resumes.find(*stored_parses_query(candidates))
+    return {doc.pop("content_hash"): doc async for doc in cursor}
+
+
+async def store_late_result(batch_id, index, upload, outcome):
+    """Store a resume that finished after its request already answered."""
+    filename = upload.filename
+    try:
+        if isinstance(outcome, Exception):
+            await record_failure(batch_id, index, filename, outcome)
+        else:
+            _, resume_document, match_document = outcome
+            match_document["file_index"] = index
+            await store_resume(resume_document, match_document, upload.data)
+    except Exception:
+        logger.exception("Could not store late result for %s in batch %s", filename, batch_id)
+
+
+async def load_job(job_id):
+    object_id = parse_job_id(job_id)
+    document = await mongo.jobs.find_one({"_id": object_id}) if object_id else None
+    if document is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return document
+
+
+async def resolve_job(job_id, skills, experience, education, salary):
+    """A stored job's compiled query, or one compiled from the form fields."""
+    if job_id:
+        return compiled_job(await load_job(job_id))
+    if not skills.strip():
+        raise HTTPException(status_code=400, detail="Provide skills or a job_id")
+    return compile_job(parse_job_post(skills=skills, experience=experience, salary=salary, education=education))
+
+
+async def spool_uploads(resumes, directory=None):
+    """Spool a request's files to disk within the upload limits (413 otherwise)."""
+    try:
+        if directory:
+            return await upload_spool.spool_to(resumes, directory)
+        return await upload_spool.spool(resumes)
+    except UploadLimitError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+
+async def record_batch(uploads, job, job_id):
+    batch_id = uuid4().hex
+    await mongo.batches.insert_one({
+        "_id": batch_id,
+        "filenames": [upload.filename for upload in uploads],
+        "job_id": job_id or None,
+        "job_inputs": job.job_data,
+        "created_at": datetime.now(timezone.utc)
+    })
+    return batch_id
+
+
+def parse_known(known):
+    """(filename, sha256) pairs from the `known` form field, a JSON list of {"filename", "sha256"}."""
+    if not known:
+        return []
+    try:
+        pairs = [(str(entry["filename"]), str(entry["sha256"]).lower()) for entry in json.loads(known)]
+    except (ValueError, TypeError, KeyError):
+        raise HTTPException(status_code=400, detail='known must be a JSON list of {"filename", "sha256"}')
+    if not all(SHA256_PATTERN.match(sha256) for _, sha256 in pairs):
+        raise HTTPException(status_code=400, detail="known contains an invalid SHA-256 hash")
+    return pairs
+
+
+async def referenced_uploads(pairs):
+    """
+    Resumes the client referenced by hash instead of uploading them, and their stored parses.
+    The PDF is only fetched from the blob store when the stored parse has no usable features.
+    """
+    cursor = mongo.resumes.find(*stored_parses_query({h for _, h in pairs}))
+    stored = {doc.pop("content_hash"): doc async for doc in cursor}
+    uploads = []
+    for filename, sha256 in pairs:
+        data = b""
+        if sha256 in stored and decode_features(stored[sha256]) is None:
+            data = await blob_store.get(sha256)
+            if data is None:
+                stored.pop(sha256)
+                data = b""
+        uploads.append(SpooledUpload(filename, sha256, len(data), data))
+    return uploads, stored
+
+
+async def take_uploads(ids):
+    """SpooledUploads for completed resumable uploads; their sessions are consumed."""
+    taken = []
+    try:
+        sessions = [await asyncio.to_thread(chunked_uploads.status, upload_id) for upload_id in ids]
+        for session in sessions:
+            if not session["complete"]:
+                raise ChunkedUploadError(INCOMPLETE, f"Upload {session['upload_id']} is not complete", session["offset"])
+            if session["size"] > UPLOAD_MAX_FILE_BYTES:
+                raise ChunkedUploadError(TOO_LARGE, f"{session['filename']} is larger than {UPLOAD_MAX_FILE_BYTES} bytes")
+        if sum(session["size"] for session in sessions) > UPLOAD_MAX_REQUEST_BYTES:
+            raise ChunkedUploadError(TOO_LARGE, f"Uploads are larger than {UPLOAD_MAX_REQUEST_BYTES} bytes")
+        for upload_id in ids:
+            taken.append(await asyncio.to_thread(chunked_uploads.take, upload_id))
+    except BaseException as e:
+        # Uploads taken before the failure are not used: close them so their files go away
+        close_taken(taken)
+        if isinstance(e, ChunkedUploadError):
+            raise upload_error(e)
+        raise
+
+    try:
+        return [SpooledUpload(session["filename"], session["sha256"], session["size"], map_file(f)) for session, f in taken]
+    finally:
+        # The memory maps keep the data; the files themselves are no longer needed
+        close_taken(taken)
+
+
+def close_taken(taken):
+    for _, f in taken:
+        f.close()
+
+
+def missing_resume(filename):
+    raise LookupError(f"{filename} is not stored on the server; upload the file itself")
+
+
+def split_upload_ids(upload_ids):
+    return [upload_id.strip() for upload_id in upload_ids.split(",") if upload_id.strip()]
+
+
+async def start_batch(resumes, job, job_id, cancel, known="", upload_ids=""):
+    """Spool the uploads, record the batch and build one BatchItem per resume."""
+    pairs = parse_known(known)
+    ids = split_upload_ids(upload_ids)
+    if not resumes and not pairs and not ids:
+        raise HTTPException(status_code=400, detail="Upload resumes or reference stored or uploaded ones")
+    if len(resumes) + len(pairs) + len(ids) > UPLOAD_MAX_FILES:
+        raise HTTPException(status_code=413, detail=f"At most {UPLOAD_MAX_FILES} files per request")
+
+    # Uploads are closed once the response is sent, so slow resumes work from their own
+    # (memory-mapped) copy on disk
+    spooled = await spool_uploads(resumes) + await take_uploads(ids)
+    referenced, referenced_parses = await referenced_uploads(pairs) if pairs else ([], {})
+    uploads = spooled + referenced
+    batch_id = await record_batch(uploads, job, job_id)
+
+    # Skip parsing (and re-storing) resumes that are already known; hashes were taken while spooling
+    stored_parses = await find_stored_parses([upload.content_hash for upload in spooled])
+    stored_parses.update(referenced_parses)
+
+    items = []
+    for index, upload in enumerate(uploads):
+        stored_parse = stored_parses.get(upload.content_hash)
+        if index >= len(spooled) and stored_parse is None:
+            items.append(BatchItem(index, missing_resume, upload.filename))
+        else:
+            items.append(BatchItem(
+                index, process_resume, upload.filename, upload.data, upload.content_hash, stored_parse, job, batch_id,
+                cancel
+            ))
+    return batch_id, uploads, items
+
+
+async def batch_outcomes(batch_id, uploads, items, unfinished, request, cancel, priority):
+    """
+    Process a batch's items, bounded by the request budget and per-resume timeout.
+    If the client disconnects, the rest of the batch is cancelled (see iter_batch).
+    """
+    loop = asyncio.get_running_loop()
+    watcher = asyncio.create_task(watch_disconnect(request, cancel))
+    outcomes = iter_batch(
+        items,
+        executor.with_priority(priority),
+        budget=MATCH_REQUEST_BUDGET_SECONDS,
+        item_timeout=MATCH_RESUME_TIMEOUT_SECONDS,
+        unfinished=unfinished,
+        # Late results complete in worker threads; hand them back to the event loop to store
+        on_late_result=lambda index, outcome: asyncio.run_coroutine_threadsafe(
+            store_late_result(batch_id, index, uploads[index], outcome), loop
+        ),
+        cancel=cancel
+    )
+    try:
+        async with aclosing(outcomes):
+            async for outcome in outcomes:
+                yield outcome
+    finally:
+        watcher.cancel()
+        if cancel.is_set():
+            # May run while this task is being cancelled, so it is not awaited here
+            spawn(mark_cancelled(batch_id))
+
+
+async def watch_disconnect(request, cancel):
+    """Set `cancel` once the client has gone away."""
+    while not cancel.is_set():
+        if await request.is_disconnected():
+            cancel.set()
+            return
+        await asyncio.sleep(DISCONNECT_POLL_SECONDS)
+
+
+async def mark_cancelled(batch_id):
+    logger.info("Client of batch %s disconnected; its unfinished resumes were cancelled", batch_id)
+    await mongo.batches.update_one(
+        {"_id": batch_id}, {"$set": {"status": CANCELLED, "cancelled_at": datetime.now(timezone.utc)}}
+    )
+
+
+def spawn(coro):
+    task = asyncio.create_task(coro)
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+
+
+async def store_outcome(batch_id, index, upload, outcome):
+    """Store one finished resume (or its failure), keyed by its index in the batch; returns its result entry."""
+    if isinstance(outcome, Exception):
+        await record_failure(batch_id, index, upload.filename, outcome)
+        return error_result(upload.filename, outcome)
+    result, resume_document, match_document = outcome
+    match_document["file_index"] = index
+    await store_resume(resume_document, match_document, upload.data)
+    return result
+
+
+def batch_summary(batch_id, uploads, results, unfinished):
+    """Ranked results, best match and pending resumes of a batch."""
+    pending = [
+        {"candidate_name": uploads[index].filename.replace(".pdf", ""), "status": status}
+        for index, status in sorted(unfinished.items())
+    ]
+
+    # Find best match
+    scored = [r for r in results if "error" not in r]
+    best_match = max(scored, key=lambda x: x["match_score"]) if scored else None
+
+    if pending:
+        message = f"{len(results)} of {len(uploads)} resumes processed; the rest are still processing, fetch them from /match_results/{batch_id}"
+    else:
+        message = "All resumes processed and stored successfully"
+
+    return {
+        "batch_id": batch_id,
+        "total_candidates": len(results),
+        "results": results,
+        "pending": pending,
+        "best_match": best_match,
+        "message": message
+    }
+
+
+# ---------------- Worker-thread priority ----------------
+def batch_priority(resumes, known, upload_ids):
+    """INTERACTIVE for a handful of resumes, BULK for more: the order their resumes get worker threads."""
+    count = len(resumes) + len(parse_known(known)) + len(split_upload_ids(upload_ids))
+    return INTERACTIVE if count <= ADMISSION_INTERACTIVE_MAX_RESUMES else BULK
 
 
 # ---------------- Endpoint for multiple resumes ----------------
 @app.post("/match_resumes_job")
 async def match_resumes_job(
-    resumes: list[UploadFile] = File(...),
-    skills: str = Form(...),
+    request: Request,
+    resumes: list[UploadFile] = File([]),
+    skills: str = Form(""),
+    experience: str = Form(""),
+    education: str = Form(""),
+    salary: str = Form(""),
+    job_id: str = Form(""),
+    known: str = Form(""),
+    upload_ids: str = Form("")
+):
+    # 1️⃣ Parse job data (or reuse a stored job's compiled query)
+    job = await resolve_job(job_id, skills, experience, education, salary)
+
+    # 2️⃣ Record the batch; already known resumes (uploaded or referenced by hash) skip parsing
+    cancel = threading.Event()
+    batch_id, uploads, items = await start_batch(resumes, job, job_id, cancel, known, upload_ids)
+
+    # 3️⃣ Process resumes in parallel, then 4️⃣ find the best match
+    priority = batch_priority(resumes, known, upload_ids)
+    return await run_match_batch(batch_id, uploads, items, request, cancel, priority)
+
+
+async def run_match_batch(batch_id, uploads, items, request, cancel, priority):
+    """Process a batch's items within the request budget; returns the batch summary."""
+    finished, unfinished = {}, {}
+    async for index, outcome in batch_outcomes(batch_id, uploads, items, unfinished, request, cancel, priority):
+        finished[index] = outcome
+    results = await asyncio.gather(*(
+        store_outcome(batch_id, index, uploads[index], finished[index]) for index in sorted(finished)
+    ))
+    return batch_summary(batch_id, uploads, list(results), unfinished)
+
+
+# ---------------- ZIP archive of resumes ----------------
+def process_zip_member(archive, member, job, batch_id, loop, cancel):
+    """Inflate one PDF of an archive and process it (runs in a worker thread)."""
+    check_cancelled(cancel)
+    member.data = read_member(archive, member, ZIP_MAX_RATIO)
+    member.content_hash = content_hash(member.data)
+    stored_parse = asyncio.run_coroutine_threadsafe(
+        find_stored_parses([member.content_hash]), loop
+    ).result().get(member.content_hash)
+    return process_resume(member.filename, member.data, member.content_hash, stored_parse, job, batch_id, cancel)
+
+
+@app.post("/match_resumes_zip")
+async def match_resumes_zip(
+    request: Request,
+    archive: UploadFile | None = File(None),
+    skills: str = Form(""),
+    experience: str = Form(""),
+    education: str = Form(""),
+    salary: str = Form(""),
+    job_id: str = Form(""),
+    upload_id: str = Form("")
+):
+    """
+    /match_resumes_job for a single ZIP of PDFs. The archive is spooled, never extracted:
+    each member is inflated in memory by the worker that processes it. A large archive can
+    be sent as a resumable upload and referenced by `upload_id` instead.
+    """
+    archive_file = zip_archive = None
+    items = []
+    try:
+        job = await resolve_job(job_id, skills, experience, education, salary)
+        try:
+            if upload_id:
+                try:
+                    _, archive_file = await asyncio.to_thread(chunked_uploads.take, upload_id)
+                except ChunkedUploadError as e:
+                    raise upload_error(e)
+            elif archive is not None:
+                archive_file = await zip_spool.spool_file(archive)
+            else:
+                raise HTTPException(status_code=400, detail="Upload an archive or give the upload_id of one")
+            zip_archive = open_archive(archive_file)
+            members = pdf_members(
+                zip_archive, max_files=UPLOAD_MAX_FILES, max_file_bytes=UPLOAD_MAX_FILE_BYTES,
+                max_total_bytes=ZIP_MAX_TOTAL_BYTES, max_ratio=ZIP_MAX_RATIO,
+            )
+        except UploadLimitError as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        except zipfile.BadZipFile:
+            raise HTTPException(status_code=400, detail="Not a ZIP archive")
+        if not members:
+            raise HTTPException(status_code=400, detail="The archive contains no PDFs")
+
+        batch_id = await record_batch(members, job, job_id)
+        loop, cancel = asyncio.get_running_loop(), threading.Event()
+        items = [
+            BatchItem(index, process_zip_member, zip_archive, member, job, batch_id, loop, cancel)
+            for index, member in enumerate(members)
+        ]
+        return await run_match_batch(batch_id, members, items, request, cancel, BULK)
+    finally:
+        close_after(items, [f for f in (zip_archive, archive_file) if f is not None])
+
+
+# ---------------- Streaming variant: one line per resume as it finishes ----------------
+@app.post("/match_resumes_job/stream")
+async def match_resumes_job_stream(
+    request: Request,
+    resumes: list[UploadFile] = File([]),
+    skills: str = Form(""),
     experience: str = Form(""),
     education: str = Form(""),
-    salary: str = Form("")
+    salary: str = Form(""),
+    job_id: str = Form(""),
+    known: str = Form(""),
+    upload_ids: str = Form("")
 ):
-    # 1️⃣ Parse job data
-    job_data = parse_job_post(skills=skills, experience=experience, salary=salary, education=education)
-    job_text = build_job_text(job_data)
+    """
+    Same as /match_resumes_job, streamed as NDJSON: a "batch" line, one "result" line per
+    resume in completion order, then a "summary" line with the ranking, best match and pending.
+    """
+    job = await resolve_job(job_id, skills, experience, education, salary)
+    cancel = threading.Event()
+    batch_id, uploads, items = await start_batch(resumes, job, job_id, cancel, known, upload_ids)
+    priority = batch_priority(resumes, known, upload_ids)
+    started = False
+
+    async def lines():
+        nonlocal started
+        started = True
+        yield ndjson({"type": "batch", "batch_id": batch_id, "total": len(uploads)})
+        results, unfinished = [], {}
+        outcomes = batch_outcomes(batch_id, uploads, items, unfinished, request, cancel, priority)
+        async with aclosing(outcomes):
+            async for index, outcome in outcomes:
+                result = await store_outcome(batch_id, index, uploads[index], outcome)
+                results.append(result)
+                yield ndjson({"type": "result", **result})
+        # Rows were already sent; the summary only carries their order
+        summary = batch_summary(batch_id, uploads, results, unfinished)
+        summary["ranking"] = [
+            {"candidate_name": r["candidate_name"], "match_score": r["match_score"]}
+            for r in sorted(summary.pop("results"), key=lambda x: x["match_score"], reverse=True)
+        ]
+        yield ndjson({"type": "summary", **summary})
+
+    def finish():
+        if not started:
+            # The client went away before the first line: nothing was submitted
+            cancel.set()
+            close_uploads(uploads)
+            spawn(mark_cancelled(batch_id))
+
+    return ClosingStreamingResponse(lines(), finish, media_type="application/x-ndjson")
+
+
+def ndjson(frame):
+    return json.dumps(jsonable_encoder(frame)) + "\n"
 
-    results = []
 
-    # 2️⃣ Process each resume
-    for resume in resumes:
+class ClosingStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse that closes its generator and calls `on_close()` however the response
+    ends, including when the client is gone before the generator ever started.
+    """
+
+    def __init__(self, content, on_close, **kwargs):
+        super().__init__(content, **kwargs)
+        self.on_close = on_close
+
+    async def __call__(self, scope, receive, send):
         try:
-            # Parse resume structure
-            parsed_resume = parse_resume(resume.file)
-
-            # Extract full text
-            resume_text = extract_text_from_upload(resume.file)
-
-            # Compute TF-IDF
-            vectorizer = TfidfVectorizer(stop_words="english")
-            vectors = vectorizer.fit_transform([resume_text, job_text])
-            vectors = boost_skill_weights(vectorizer, vectors, skills=job_data.get("skills", []), factor=5.0)
-            score = cosine_similarity(vectors[0], vectors[1])[0][0]
-
-            # Identify skills matched
-            skills_matched = get_skills_matched(parsed_resume["parsed_skills"], job_data.get("skills", []))
-
-            # Store in MongoDB
-            resume.file.seek(0)
-            resume_bytes = resume.file.read()
-            resumes_collection.insert_one({
-                "filename": resume.filename,
-                "parsed_skills": parsed_resume["parsed_skills"],
-                "parsed_education": parsed_resume["parsed_education"],
-                "parsed_experience": parsed_resume["parsed_experience"],
-                "parsed_salary": parsed_resume["parsed_salary"],
-                "job_inputs": job_data,
-                "file_data": resume_bytes
-            })
-
-            # Append to result
-            results.append({
-            "candidate_name": resume.filename.replace(".pdf", ""),
-            "match_score": round(score * 100, 2),
-            "skills_matched": skills_matched,
-            "parsed_skills": parsed_resume.get("parsed_skills", []),
-            "parsed_education": parsed_resume.get("parsed_education", []),
-            "parsed_experience": parsed_resume.get("parsed_experience", ""),
-            "parsed_salary": parsed_resume.get("parsed_salary", "")
-        })
-
-
-        except Exception as e:
-            results.append({
-            "candidate_name": resume.filename.replace(".pdf", ""),
-            "match_score": round(score * 100, 2),
-            "skills_matched": skills_matched,
-            "extracted_skills": parsed_resume.get("parsed_skills", []),
-            "education": ", ".join(parsed_resume.get("parsed_education", [])) if parsed_resume.get("parsed_education") else "Not specified",
-            "experience": parsed_resume.get("parsed_experience", ""),
-            "expected_salary": parsed_resume.get("parsed_salary", "")
-        })
-
-
-    # 3️⃣ Find best match
-    best_match = max(results, key=lambda x: x["match_score"]) if results else None
+            await super().__call__(scope, receive, send)
+        finally:
+            try:
+                await self.body_iterator.aclose()
+            finally:
+                self.on_close()
+
+
+def close_uploads(uploads):
+    """Release the memory maps of uploads no worker is using."""
+    for upload in uploads:
+        if hasattr(upload.data, "close"):
+            upload.data.close()
+
+
+# ---------------- Background batches ----------------
+async def load_batch_job(batch):
+    if batch.get("job_id"):
+        return compiled_job(await load_job(batch["job_id"]))
+    return compile_job(batch["job_inputs"])
+
+
+async def process_spooled_resume(batch, job, item):
+    """Process one spooled file of a background batch; its result is written before it counts as done."""
+    batch_id, filename = batch["_id"], item["filename"]
+    loop = asyncio.get_running_loop()
+    try:
+        data = await loop.run_in_executor(bulk_executor, map_path, item["path"])
+        # Hashed while spooling (batches spooled by older versions are hashed here)
+        resume_hash = item.get("content_hash") or await loop.run_in_executor(bulk_executor, content_hash, data)
+        stored_parse = (await find_stored_parses([resume_hash])).get(resume_hash)
+        _, resume_document, match_document = await loop.run_in_executor(
+            bulk_executor, process_resume, filename, data, resume_hash, stored_parse, job, batch_id
+        )
+        await store_resume(resume_document, None, data)
+        # Written directly (not write-behind) and keyed by file, so redoing a file after a restart is harmless
+        match_document["file_index"] = item["index"]
+        await mongo.match_results.replace_one(
+            {"batch_id": batch_id, "file_index": item["index"]}, match_document, upsert=True
+        )
+        return True
+    except Exception as e:
+        await record_failure(batch_id, item["index"], filename, e)
+        return False
+
+
+# Batches too large to hold a request open for: spooled to disk and processed in the background
+batch_jobs = BatchJobQueue(
+    lambda: mongo.batches, load_batch_job, process_spooled_resume,
+    spool_dir=BATCH_SPOOL_DIR, concurrency=BATCH_CONCURRENCY,
+)
+
+
+@app.post("/match_resumes_job/async", status_code=202)
+async def submit_match_batch(
+    resumes: list[UploadFile] = File(...),
+    skills: str = Form(""),
+    experience: str = Form(""),
+    education: str = Form(""),
+    salary: str = Form(""),
+    job_id: str = Form("")
+):
+    """Accept a batch, spool it to disk and answer at once; poll /match_results/{batch_id} for progress."""
+    # Only the spooling is admitted (see Admission); the batch itself is processed at BULK priority in the background
+    job = await resolve_job(job_id, skills, experience, education, salary)
+    batch_id = uuid4().hex
+    try:
+        spooled = await spool_uploads(resumes, batch_jobs.batch_dir(batch_id))
+    except HTTPException:
+        await asyncio.to_thread(shutil.rmtree, batch_jobs.batch_dir(batch_id), True)
+        raise
+    files = [
+        {"index": index, "filename": resume.filename, "path": path, "content_hash": sha256, "status": PENDING}
+        for index, (resume, (path, sha256)) in enumerate(zip(resumes, spooled))
+    ]
+
+    await batch_jobs.submit({
+        "_id": batch_id,
+        "mode": "background",
+        "filenames": [f["filename"] for f in files],
+        "files": files,
+        "job_id": job_id or None,
+        "job_inputs": job.job_data,
+        "created_at": datetime.now(timezone.utc)
+    })
+    return {
+        "batch_id": batch_id,
+        "status": "queued",
+        "total": len(files),
+        "status_url": f"/match_results/{batch_id}"
+    }
+
+
+# ---------------- Results of a batch (including resumes that finished late) ----------------
+@app.get("/match_results/{batch_id}")
+async def get_match_results(batch_id: str):
+    batch = await mongo.batches.find_one({"_id": batch_id})
+    stored = await mongo.match_results.find(
+        {"batch_id": batch_id}, {"match_result": 1, "file_index": 1}
+    ).to_list(length=None)
+    if batch is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+
+    # (file index, result) of every finished resume; two uploads may share a filename
+    finished = [(doc.get("file_index"), doc["match_result"]) for doc in stored] + [
+        (error.get("file_index"), {k: v for k, v in error.items() if k != "file_index"})
+        for error in batch.get("errors", [])
+    ]
+    results = [result for _, result in finished]
+    done = {index for index, _ in finished}
+    # Results stored before file indexes were recorded are matched by name
+    done_names = {result["candidate_name"] for index, result in finished if index is None}
+    # Resumes of a batch whose client disconnected will not finish
+    unfinished_status = CANCELLED if batch.get("status") == CANCELLED else "pending"
+    pending = [
+        {"candidate_name": name.replace(".pdf", ""), "status": unfinished_status}
+        for index, name in enumerate(batch["filenames"])
+        if index not in done and name.replace(".pdf", "") not in done_names
+    ]
+    total = len(batch["filenames"])
+    progress = {
+        "total": total,
+        "processed": total - len(pending),
+        "failed": len(batch.get("errors", [])),
+        "percent": round((total - len(pending)) / total * 100, 1) if total else 100.0
+    }
+    scored = [r for r in results if "error" not in r]
+    results.sort(key=lambda x: x["match_score"], reverse=True)
 
     return {
+        "batch_id": batch_id,
+        "status": batch.get("status") or ("processing" if pending else "done"),
+        "progress": progress,
         "total_candidates": len(results),
         "results": results,
-        "best_match": best_match,
-        "message": "All resumes processed and stored successfully"
+        "pending": pending,
+        "best_match": max(scored, key=lambda x: x["match_score"]) if scored else None
     }
+
+
+# ---------------- Resumable uploads: create, send chunks by offset, complete ----------------
+UPLOAD_ERROR_STATUS = {
+    NOT_FOUND: 404, OFFSET_MISMATCH: 409, INCOMPLETE: 409, TOO_LARGE: 413, CHECKSUM_MISMATCH: 422,
+}
+
+
+def upload_error(e):
+    """HTTP error for a ChunkedUploadError; Upload-Offset tells the client where to continue."""
+    headers = {"Upload-Offset": str(e.offset)} if e.offset is not None else None
+    return HTTPException(status_code=UPLOAD_ERROR_STATUS[e.code], detail=str(e), headers=headers)
+
+
+def upload_status(session):
+    return {
+        "upload_id": session["upload_id"],
+        "filename": session["filename"],
+        "size": session["size"],
+        "offset": session["offset"],
+        "complete": session["complete"],
+        "chunk_size": UPLOAD_CHUNK_MAX_BYTES
+    }
+
+
+@app.post("/uploads", status_code=201)
+async def create_upload(upload: UploadCreate):
+    """Announce a file (name, size, SHA-256); its bytes follow with PUT /uploads/{upload_id}."""
+    if not SHA256_PATTERN.match(upload.sha256.lower()) or upload.size < 0:
+        raise HTTPException(status_code=400, detail="size and a SHA-256 hex digest are required")
+    try:
+        session = await asyncio.to_thread(chunked_uploads.create, upload.filename, upload.size, upload.sha256)
+    except ChunkedUploadError as e:
+        raise upload_error(e)
+    return upload_status(session)
+
+
+@app.get("/uploads/{upload_id}")
+async def get_upload(upload_id: str):
+    """Where an interrupted upload continues from."""
+    try:
+        return upload_status(await asyncio.to_thread(chunked_uploads.status, upload_id))
+    except ChunkedUploadError as e:
+        raise upload_error(e)
+
+
+@app.put("/uploads/{upload_id}")
+async def upload_chunk(upload_id: str, offset: int, request: Request):
+    """
+    Append the request body at `offset` (the bytes received so far). An X-Chunk-SHA256 header
+    is checked before anything is written.
+    """
+    chunks, size = [], 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > UPLOAD_CHUNK_MAX_BYTES:
+            raise HTTPException(status_code=413, detail=f"Chunks are at most {UPLOAD_CHUNK_MAX_BYTES} bytes")
+        chunks.append(chunk)
+    try:
+        new_offset = await asyncio.to_thread(
+            chunked_uploads.append, upload_id, offset, b"".join(chunks), request.headers.get("x-chunk-sha256")
+        )
+    except ChunkedUploadError as e:
+        raise upload_error(e)
+    return {"upload_id": upload_id, "offset": new_offset}
+
+
+@app.post("/uploads/{upload_id}/complete")
+async def complete_upload(upload_id: str):
+    """Verify size and SHA-256; the upload_id can then be passed to the matching endpoints."""
+    try:
+        return upload_status(await asyncio.to_thread(chunked_uploads.complete, upload_id))
+    except ChunkedUploadError as e:
+        raise upload_error(e)
+
+
+@app.delete("/uploads/{upload_id}", status_code=204)
+async def delete_upload(upload_id: str):
+    try:
+        await asyncio.to_thread(chunked_uploads.status, upload_id)
+        await asyncio.to_thread(chunked_uploads.delete, upload_id)
+    except ChunkedUploadError as e:
+        raise upload_error(e)
+
+
+# ---------------- Upload negotiation: skip uploading PDFs the server already has ----------------
+SHA256_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+@app.post("/resumes/known")
+async def known_resumes(query: HashQuery):
+    """
+    Which of these SHA-256 hashes are stored resumes. The client uploads only the others and
+    references these by hash (the `known` field of /match_resumes_job).
+    """
+    hashes = {h.lower() for h in query.hashes}
+    if len(hashes) > UPLOAD_MAX_FILES:
+        raise HTTPException(status_code=413, detail=f"At most {UPLOAD_MAX_FILES} hashes per request")
+    if not all(SHA256_PATTERN.match(h) for h in hashes):
+        raise HTTPException(status_code=400, detail="Invalid SHA-256 hash")
+    candidates = [h for h in hashes if known_hashes.might_contain(h)]
+    if not candidates:
+        return {"known": []}
+    cursor = mongo.resumes.find(*known_hashes_query(candidates))
+    return {"known": [doc["content_hash"] async for doc in cursor]}
+
+
+# ---------------- Search stored resumes ----------------
+@app.get("/resumes/search")
+async def search_resumes(
+    skills: str = "",
+    degree: str = "",
+    min_experience: float | None = None,
+    max_salary: float | None = None,
+    limit: int = 50
+):
+    query, sort = search_query(
+        skills=[s for s in skills.split(",") if s.strip()],
+        degree=degree or None,
+        min_experience=min_experience,
+        max_salary=max_salary,
+    )
+    cursor = mongo.resumes.find(query, SEARCH_PROJECTION).sort(sort).limit(min(limit, 500))
+    return {"results": await cursor.to_list(length=None)}
+
+
+# ---------------- Re-score stored resumes against a job ----------------
+RESCORE_BATCH_SIZE = 1000
+RESCORE_PROJECTION = {"_id": 0, "content_hash": 1, "filename": 1, "parsed_skills": 1, **FEATURES_PROJECTION}
+
+
+def rank_stored(documents, job, limit, best):
+    """Merge the best of a batch of stored resume documents into the running top `limit`."""
+    features = (f for f in map(decode_features, documents) if f is not None)
+    return heapq.nlargest(limit, best + rank_features(features, job, limit), key=lambda x: x[0])
+
+
+@app.post("/resumes/rescore")
+async def rescore_resumes(
+    skills: str = Form(""),
+    experience: str = Form(""),
+    education: str = Form(""),
+    salary: str = Form(""),
+    job_id: str = Form(""),
+    limit: int = Form(50)
+):
+    """Rank every stored resume against a job from its stored features (no PDFs are read)."""
+    job = await resolve_job(job_id, skills, experience, education, salary)
+    limit = min(limit, 500)
+    loop = asyncio.get_running_loop()
+
+    cursor = mongo.resumes.find({"features.version": FEATURES_VERSION}, RESCORE_PROJECTION)
+    best, documents = [], []
+    async for document in cursor.batch_size(RESCORE_BATCH_SIZE):
+        documents.append(document)
+        if len(documents) == RESCORE_BATCH_SIZE:
+            best = await loop.run_in_executor(bulk_executor, rank_stored, documents, job, limit, best)
+            documents = []
+    best = await loop.run_in_executor(bulk_executor, rank_stored, documents, job, limit, best)
+
+    return {
+        "results": [
+            {
+                "candidate_name": (features.filename or "").replace(".pdf", ""),
+                "content_hash": features.content_hash,
+                "match_score": round(score * 100, 2),
+                "skills_matched": skills_matched
+            }
+            for score, skills_matched, features in best
+        ]
+    }
+
+
+# ---------------- Jobs ----------------
+@app.post("/jobs", status_code=201)
+async def create_job(job_post: JobPost):
+    document = build_job_document(job_post.model_dump(exclude={"id"}))
+    document["created_at"] = document["updated_at"]
+    document["revision"] = 1
+    result = await mongo.jobs.insert_one(document)
+    document["_id"] = result.inserted_id
+    await leaderboard.job_saved(document["_id"])
+    return job_response(document)
+
+
+@app.get("/jobs")
+async def list_jobs(limit: int = 50):
+    cursor = mongo.jobs.find({}, {"compiled": 0}).sort("created_at", -1).limit(min(limit, 500))
+    return {"jobs": [job_response(document) async for document in cursor]}
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    return job_response(await load_job(job_id))
+
+
+@app.put("/jobs/{job_id}")
+async def update_job(job_id: str, job_post: JobPost):
+    # Recompiled on every save, so matches never see a stale compiled query
+    document = await mongo.jobs.find_one_and_update(
+        {"_id": parse_job_id(job_id)},
+        {"$set": build_job_document(job_post.model_dump(exclude={"id"})), "$inc": {"revision": 1}},
+        return_document=ReturnDocument.AFTER,
+    )
+    if document is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    await leaderboard.job_saved(document["_id"])
+    return job_response(document)
+
+
+@app.delete("/jobs/{job_id}")
+async def delete_job(job_id: str):
+    object_id = parse_job_id(job_id)
+    result = await mongo.jobs.delete_one({"_id": object_id})
+    if result.deleted_count == 0:
+        raise HTTPException(status_code=404, detail="Job not found")
+    await leaderboard.job_deleted(object_id)
+    return {"id": job_id, "deleted": True}
+
+
+@app.get("/jobs/{job_id}/leaderboard")
+async def job_leaderboard(job_id: str, limit: int = LEADERBOARD_SIZE):
+    """Best stored candidates for a job, read straight from its materialized leaderboard."""
+    object_id = parse_job_id(job_id)
+    if object_id is None or await mongo.jobs.count_documents({"_id": object_id}, limit=1) == 0:
+        raise HTTPException(status_code=404, detail="Job not found")
+    cursor = mongo.job_matches.find({"job_id": object_id}, {"_id": 0, "job_id": 0})
+    entries = await cursor.sort(LEADERBOARD_ORDER).limit(min(limit, LEADERBOARD_SIZE)).to_list(length=None)
+    return {"job_id": job_id, "results": entries}
+
+
+# ---------------- Persistence metrics ----------------
+@app.get("/metrics/persistence")
+async def persistence_metrics():
+    return {
+        "resumes": resume_writer.metrics(),
+        "match_results": match_writer.metrics(),
+        "leaderboards": leaderboard.metrics()
+    }
+
+
+# ---------------- Parsing metrics ----------------
+@app.get("/metrics/parsing")
+async def parsing_metrics():
+    return {"resume_parsing": resume_parsing.metrics()}
+
+
+# ---------------- Admission metrics ----------------
+@app.get("/metrics/admission")
+async def admission_metrics():
+    return {"admission": admission.metrics()}
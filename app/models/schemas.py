@@ -9,7 +9,7 @@ class PyObjectId(ObjectId):
         yield cls.validate
 
     @classmethod
-    def validate(cls, v):
+    def validate(cls, v, *_):
         if not ObjectId.is_valid(v):
             raise ValueError("Invalid ObjectId")
         return ObjectId(v)
@@ -37,20 +37,38 @@ class Resume(BaseModel):
 # Job Post Schema
 # ---------------------------
 class JobPost(BaseModel):
-    id: Optional[PyObjectId] = Field(alias="_id")
+    id: Optional[PyObjectId] = Field(default=None, alias="_id")
     title: str
     company: str
     description: str
     required_skills: List[str]
     min_experience: Optional[int] = None
     salary_range: Optional[str] = None
+    education: Optional[str] = None
     location: Optional[str] = None
+    status: str = "open"  # "closed" jobs keep their leaderboard but stop receiving candidates
 
     class Config:
         json_encoders = {ObjectId: str}
         populate_by_name = True
 
 
+# ---------------------------
+# Upload negotiation: SHA-256 hashes of the files a client is about to upload
+# ---------------------------
+class HashQuery(BaseModel):
+    hashes: List[str]
+
+
+# ---------------------------
+# Resumable upload: a file announced before its chunks are sent
+# ---------------------------
+class UploadCreate(BaseModel):
+    filename: str
+    size: int
+    sha256: str
+
+
 # ---------------------------
 # Bifurcation Result Schema
 # ---------------------------
@@ -0,0 +1,252 @@
+# app/rescore.py
+# Run with: python -m app.rescore [--resume] [--retokenize] [--workers N]
+#
+# Rebuilds every open job's leaderboard from the stored resume features, e.g. after the
+# scoring weights or the tokenizer change. Resumes are streamed from MongoDB in content-hash
+# order, scored in a process pool and staged in bulk; progress is checkpointed after every
+# chunk, so an interrupted run continues where it stopped with --resume.
+import argparse
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from uuid import uuid4
+from pymongo import DESCENDING, DeleteMany, UpdateOne
+from app.config import LEADERBOARD_SIZE
+from app.database import sync_database
+from app.services.leaderboard import OPEN_JOBS_QUERY, build_match_document
+from app.services.matching_service import compile_job, rank_features, term_counts
+from app.services.resume_features import (
+    FEATURES_PROJECTION, ResumeFeatures, decode_features, decode_text, encode_features,
+)
+from app.services.resume_store import JOB_MATCH_INDEXES, LEADERBOARD_ORDER, LEADERBOARD_RANK_PROJECTION, leaderboard_rank
+from app.services.skill_taxonomy import TAXONOMY
+
+# Jobs being rescored, set once per worker process
+_jobs = None
+
+
+def _init_worker(jobs):
+    global _jobs
+    _jobs = jobs
+
+
+def _retokenized(document):
+    """ResumeFeatures recomputed from the stored text, and the refreshed stored features."""
+    text = decode_text(document)
+    if not text:
+        return None, None
+    counts = term_counts(text)
+    skills = document.get("parsed_skills", [])
+    experience, salary = document.get("experience_years"), document.get("salary_amount")
+    features = ResumeFeatures(
+        document["content_hash"], document.get("filename"), counts, TAXONOMY.skills_mask(skills),
+        skills, experience, salary
+    )
+    return features, encode_features(text, counts, skills, experience, salary)
+
+
+def score_chunk(documents, size, retokenize, now):
+    """
+    Score a chunk of stored resumes against every job (runs in a worker process).
+    Returns (resumes scored, resumes skipped, {job id: top `size` match documents}, refreshed features).
+    """
+    features, refreshed = [], []
+    for document in documents:
+        if retokenize:
+            resume, stored = _retokenized(document)
+            if stored is not None:
+                refreshed.append((document["content_hash"], stored))
+        else:
+            resume = decode_features(document)
+        if resume is not None:
+            features.append(resume)
+
+    boards = {
+        job_id: [
+            build_match_document(job_id, job, resume, score, skills_matched, now)
+            for score, skills_matched, resume in rank_features(features, job, size)
+        ]
+        for job_id, job in _jobs.items()
+    }
+    return len(features), len(documents) - len(features), boards, refreshed
+
+
+def chunked(cursor, size):
+    chunk = []
+    for document in cursor:
+        chunk.append(document)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class Rescorer:
+    """One rescoring run: its checkpoint document, staging collection and per-job cut-offs."""
+
+    def __init__(self, db, size, resume):
+        self.db = db
+        self.size = size
+        self.runs = db["rescore_runs"]
+
+        self.run = self.runs.find_one({"status": "running"}, sort=[("started_at", DESCENDING)]) if resume else None
+        if self.run is None:
+            self.run = {
+                "_id": uuid4().hex,
+                "status": "running",
+                "job_ids": [job["_id"] for job in db["jobs"].find(OPEN_JOBS_QUERY, {"_id": 1})],
+                "last_hash": None,
+                "scored": 0,
+                "skipped": 0,
+                "started_at": datetime.now(timezone.utc),
+            }
+            self.runs.insert_one(self.run)
+        else:
+            print(f"Resuming run {self.run['_id']} after {self.run['scored']} resumes")
+
+        # Candidates are staged per run and only replace the live leaderboards once the run completes
+        self.staging = db[f"job_matches_rescore_{self.run['_id']}"]
+        self.staging.create_indexes(JOB_MATCH_INDEXES)
+        self.jobs = {
+            job["_id"]: compile_job(job["job_data"])
+            for job in db["jobs"].find({"_id": {"$in": self.run["job_ids"]}}, {"job_data": 1})
+        }
+        self.cutoffs = {job_id: self._cutoff(job_id) for job_id in self.jobs}
+
+    def _cutoff(self, job_id):
+        """Rank of the last staged entry still in the top `size`, or None while fewer are staged."""
+        cursor = self.staging.find({"job_id": job_id}, LEADERBOARD_RANK_PROJECTION).sort(LEADERBOARD_ORDER)
+        last = list(cursor.skip(self.size - 1).limit(1))
+        return leaderboard_rank(last[0]) if last else None
+
+    def _trim(self, collection, job_id):
+        """Delete the entries ranked below `size` (ties included); returns the new cutoff."""
+        cursor = collection.find({"job_id": job_id}, LEADERBOARD_RANK_PROJECTION).sort(LEADERBOARD_ORDER)
+        ranked = list(cursor.skip(self.size - 1))
+        if not ranked:
+            return None
+        if len(ranked) > 1:
+            collection.delete_many({"_id": {"$in": [d["_id"] for d in ranked[1:]]}})
+        return leaderboard_rank(ranked[0])
+
+    def resumes(self, batch_size, retokenize):
+        projection = {"_id": 0, "content_hash": 1, "filename": 1, "parsed_skills": 1}
+        if retokenize:
+            projection.update({"features": 1, "experience_years": 1, "salary_amount": 1})
+        else:
+            projection.update(FEATURES_PROJECTION)
+        query = {"content_hash": {"$gt": self.run["last_hash"]}} if self.run["last_hash"] else {}
+        cursor = self.db["resumes"].find(query, projection).sort("content_hash", 1).hint("content_hash_unique")
+        return cursor.batch_size(batch_size)
+
+    def write_chunk(self, last_hash, result):
+        """Stage a chunk's candidates in bulk, then checkpoint past it."""
+        scored, skipped, boards, refreshed = result
+        requests, touched = [], []
+        for job_id, documents in boards.items():
+            cutoff = self.cutoffs[job_id]
+            entries = [d for d in documents if cutoff is None or leaderboard_rank(d) < cutoff]
+            requests += [
+                UpdateOne({"job_id": job_id, "content_hash": d["content_hash"]}, {"$set": d}, upsert=True)
+                for d in entries
+            ]
+            if entries:
+                touched.append(job_id)
+        if requests:
+            self.staging.bulk_write(requests, ordered=False)
+        for job_id in touched:
+            self.cutoffs[job_id] = self._trim(self.staging, job_id)
+
+        if refreshed:
+            self.db["resumes"].bulk_write([
+                UpdateOne({"content_hash": content_hash}, {"$set": {
+                    f"features.{key}": value for key, value in features.items() if key != "text"
+                }})
+                for content_hash, features in refreshed
+            ], ordered=False)
+
+        self.run["last_hash"] = last_hash
+        self.run["scored"] += scored
+        self.run["skipped"] += skipped
+        self.runs.update_one({"_id": self.run["_id"]}, {
+            "$set": {"last_hash": last_hash, "updated_at": datetime.now(timezone.utc)},
+            "$inc": {"scored": scored, "skipped": skipped},
+        })
+
+    def publish(self):
+        """Replace each live leaderboard with the staged one and close the run."""
+        for job_id in self.jobs:
+            best = list(self.staging.find({"job_id": job_id}, {"_id": 0}).sort(LEADERBOARD_ORDER).limit(self.size))
+            requests = [
+                UpdateOne({"job_id": job_id, "content_hash": d["content_hash"]}, {"$set": d}, upsert=True)
+                for d in best
+            ]
+            # Entries the live updater wrote during the run are newer than the run and are kept
+            requests.append(DeleteMany({
+                "job_id": job_id,
+                "content_hash": {"$nin": [d["content_hash"] for d in best]},
+                "updated_at": {"$lt": self.run["started_at"]},
+            }))
+            self.db["job_matches"].bulk_write(requests, ordered=True)
+            # ...but only as long as they rank within the top `size`
+            self._trim(self.db["job_matches"], job_id)
+
+        self.staging.drop()
+        self.runs.update_one({"_id": self.run["_id"]}, {
+            "$set": {"status": "done", "finished_at": datetime.now(timezone.utc)}
+        })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rescore stored resumes against every open job.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch-size", type=int, default=5000, help="documents per cursor batch")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="resumes per worker task")
+    parser.add_argument("--size", type=int, default=LEADERBOARD_SIZE, help="candidates kept per job")
+    parser.add_argument("--resume", action="store_true", help="continue the last interrupted run")
+    parser.add_argument("--retokenize", action="store_true",
+                        help="recompute term counts from the stored text and refresh stored features")
+    args = parser.parse_args()
+
+    client, db = sync_database()
+    try:
+        rescorer = Rescorer(db, args.size, args.resume)
+        print(f"🔁 Rescoring against {len(rescorer.jobs)} open jobs with {args.workers} workers")
+
+        started, done = time.perf_counter(), 0
+
+        def write_next():
+            nonlocal done
+            last_hash, count, future = in_flight.popleft()
+            rescorer.write_chunk(last_hash, future.result())
+            done += count
+            print(f"{rescorer.run['scored']:>10} scored {rescorer.run['skipped']:>8} skipped "
+                  f"{done / (time.perf_counter() - started):>10.0f} resumes/s")
+
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(args.workers, mp_context=context, initializer=_init_worker,
+                                 initargs=(rescorer.jobs,)) as pool:
+            # Chunks complete out of order but are written in order, so the checkpoint never skips one
+            in_flight = deque()
+            for chunk in chunked(rescorer.resumes(args.batch_size, args.retokenize), args.chunk_size):
+                future = pool.submit(score_chunk, chunk, args.size, args.retokenize, rescorer.run["started_at"])
+                in_flight.append((chunk[-1]["content_hash"], len(chunk), future))
+                while len(in_flight) > args.workers * 2 or (in_flight and in_flight[0][2].done()):
+                    write_next()
+            while in_flight:
+                write_next()
+
+        rescorer.publish()
+        elapsed = time.perf_counter() - started
+        print(f"✅ {done} resumes in {elapsed:.1f}s ({done / elapsed if elapsed else 0:.0f} resumes/s); "
+              f"{rescorer.run['skipped']} skipped without usable features")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
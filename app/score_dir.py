@@ -0,0 +1,227 @@
+# app/score_dir.py
+# Run with: python -m app.score_dir resumes/ --skills "Python, SQL" [--top 20 | --stream] [--format csv]
+#
+# Ranks a folder of resume PDFs against a job spec on one machine, with no server and no
+# database. PDFs are extracted in sandboxed workers and parsed with batched spaCy across all
+# cores. Every row is written in rank order at the end: rows are spilled to a temporary file
+# as chunks finish and only (score, path, offset) per file is kept in memory. With --top N
+# only the N best are kept (a heap). With --stream rows are written as chunks finish, in
+# completion order and without a rank.
+import argparse
+import csv
+import heapq
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from app.config import PDF_MEMORY_LIMIT_MB, PDF_TIMEOUT_SECONDS, PDF_WORKER_MAX_DOCUMENTS
+from app.services.job_parser import parse_job_post
+from app.services.matching_service import compile_job, score_resume_counts, term_counts
+from app.services.pdf_workers import PdfExtractionError, PdfWorkerPool
+
+CSV_FIELDS = [
+    "rank", "file", "candidate_name", "match_score", "skills_matched", "parsed_skills",
+    "degrees", "parsed_experience", "parsed_salary", "error",
+]
+
+# Per worker process: the job being scored and a sandboxed PDF extractor
+_job = None
+_pdf_pool = None
+
+
+def _init_worker(job):
+    global _job, _pdf_pool
+    _job = job
+    _pdf_pool = PdfWorkerPool(
+        size=1, timeout=PDF_TIMEOUT_SECONDS, memory_limit_mb=PDF_MEMORY_LIMIT_MB,
+        max_documents=PDF_WORKER_MAX_DOCUMENTS,
+    )
+    _pdf_pool.start()
+
+
+def score_chunk(paths, spacy_batch_size):
+    """Extract, parse (batched spaCy) and score a chunk of PDFs; returns one result row per file."""
+    # Imported here so the parent process never loads spaCy
+    from app.services.resume_parser import parse_resume_texts
+
+    rows, texts, extracted = [], [], []
+    for path in paths:
+        try:
+            with open(path, "rb") as f:
+                texts.append(_pdf_pool.extract_text(f.read()))
+            extracted.append(path)
+        except (PdfExtractionError, OSError) as e:
+            rows.append(result_row(path, error=f"{getattr(e, 'code', 'unreadable')}: {e}"))
+
+    for path, text, parsed in zip(extracted, texts, parse_resume_texts(texts, spacy_batch_size)):
+        score, skills_matched = score_resume_counts(
+            term_counts(text), parsed["parsed_skills"], _job.job_data, _job.counts, _job.boost_terms
+        )
+        rows.append(result_row(path, score, skills_matched, parsed))
+    return rows
+
+
+def result_row(path, score=0.0, skills_matched=(), parsed=None, error=None):
+    parsed = parsed or {}
+    return {
+        "file": path,
+        "candidate_name": os.path.basename(path).replace(".pdf", ""),
+        "match_score": round(score * 100, 2),
+        "skills_matched": list(skills_matched),
+        "parsed_skills": parsed.get("parsed_skills", []),
+        "degrees": (parsed.get("parsed_education") or {}).get("degrees", []),
+        "parsed_experience": parsed.get("parsed_experience", []),
+        "parsed_salary": parsed.get("parsed_salary", []),
+        "error": error,
+    }
+
+
+def iter_pdfs(directory):
+    """PDF paths under `directory`, yielded as the walk finds them (never listed in full)."""
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for name in sorted(files):
+            if name.lower().endswith(".pdf"):
+                yield os.path.join(root, name)
+
+
+def iter_chunks(paths, size):
+    chunk = []
+    for path in paths:
+        chunk.append(path)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class RankedSpool:
+    """
+    Result rows spilled to a temporary file as they finish, read back in rank order (best
+    score first, ties by path) at the end. Rows that failed follow, without a rank.
+    """
+
+    def __init__(self):
+        self.file = tempfile.TemporaryFile()
+        self.scored = []  # (-score, path, offset)
+        self.failed = []  # offsets
+
+    def add(self, row):
+        offset = self.file.seek(0, os.SEEK_END)
+        self.file.write(json.dumps(row, ensure_ascii=False).encode("utf-8") + b"\n")
+        if row["error"] is None:
+            self.scored.append((-row["match_score"], row["file"], offset))
+        else:
+            self.failed.append(offset)
+
+    def _read(self, offset):
+        self.file.seek(offset)
+        return json.loads(self.file.readline())
+
+    def ranked(self):
+        for rank, (_, _, offset) in enumerate(sorted(self.scored), 1):
+            yield {"rank": rank, **self._read(offset)}
+        for offset in self.failed:
+            yield {"rank": None, **self._read(offset)}
+
+    def close(self):
+        self.file.close()
+
+
+class ResultWriter:
+    """Writes result rows as JSONL or CSV (list fields joined with "; "; no rank column unless `ranked`)."""
+
+    def __init__(self, out, fmt, ranked=True):
+        self.out = out
+        fields = CSV_FIELDS if ranked else [f for f in CSV_FIELDS if f != "rank"]
+        self.csv = csv.DictWriter(out, fields, extrasaction="ignore") if fmt == "csv" else None
+        if self.csv:
+            self.csv.writeheader()
+
+    def write(self, row):
+        if self.csv:
+            self.csv.writerow({
+                key: "; ".join(map(str, value)) if isinstance(value, list) else value
+                for key, value in row.items()
+            })
+        else:
+            self.out.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank a directory of resume PDFs against a job, offline.")
+    parser.add_argument("directory")
+    parser.add_argument("--skills", required=True, help='comma-separated, e.g. "Python, SQL"')
+    parser.add_argument("--experience", default="")
+    parser.add_argument("--education", default="")
+    parser.add_argument("--salary", default="")
+    parser.add_argument("--top", type=int, default=0, help="only write the N best, in rank order")
+    parser.add_argument("--stream", action="store_true", help="write rows as they finish, unranked")
+    parser.add_argument("--format", choices=["jsonl", "csv"], default="jsonl")
+    parser.add_argument("--output", help="output file (default: stdout)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=16, help="files per worker task")
+    parser.add_argument("--spacy-batch-size", type=int, default=32, help="texts per nlp.pipe batch")
+    args = parser.parse_args()
+    if args.top and args.stream:
+        parser.error("--top and --stream cannot be combined")
+
+    job = compile_job(parse_job_post(
+        skills=args.skills, experience=args.experience, salary=args.salary, education=args.education
+    ))
+    out = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+    writer = ResultWriter(out, args.format, ranked=not args.stream)
+    spool = None if args.top or args.stream else RankedSpool()
+    best, seq = [], 0  # --top: min-heap of (score, seq, row)
+    started, done = time.perf_counter(), 0
+
+    def collect(future):
+        nonlocal done, seq
+        for row in future.result():
+            done += 1
+            if args.stream:
+                writer.write(row)
+            elif spool is not None:
+                spool.add(row)
+            elif row["error"] is None:
+                seq += 1
+                entry = (row["match_score"], -seq, row)
+                if len(best) < args.top:
+                    heapq.heappush(best, entry)
+                elif entry > best[0]:
+                    heapq.heapreplace(best, entry)
+        out.flush()
+        print(f"{done} files, {done / (time.perf_counter() - started):.1f} files/s", file=sys.stderr)
+
+    try:
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(args.workers, mp_context=context, initializer=_init_worker, initargs=(job,)) as pool:
+            # At most two chunks per worker in flight: memory does not grow with the folder
+            in_flight = deque()
+            for chunk in iter_chunks(iter_pdfs(args.directory), args.chunk_size):
+                in_flight.append(pool.submit(score_chunk, chunk, args.spacy_batch_size))
+                while len(in_flight) > args.workers * 2 or (in_flight and in_flight[0].done()):
+                    collect(in_flight.popleft())
+            while in_flight:
+                collect(in_flight.popleft())
+
+        if spool is not None:
+            for row in spool.ranked():
+                writer.write(row)
+        for rank, (_, _, row) in enumerate(sorted(best, reverse=True), 1):
+            writer.write({"rank": rank, **row})
+    finally:
+        if spool is not None:
+            spool.close()
+        if args.output:
+            out.close()
+    print(f"✅ {done} files in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# app/services/batch_jobs.py
+# Batches submitted for background processing: spooled to disk, state kept in MongoDB.
+import asyncio
+import logging
+import os
+import shutil
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+# Batch and file states, as stored in the batches collection
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+PENDING = "pending"
+
+
+class BatchJobQueue:
+    """
+    Processes submitted batches in the background, one batch at a time with up to
+    `concurrency` resumes of it in flight.
+
+    Uploads are spooled to `spool_dir/<batch id>/` before the batch is queued, and every batch
+    and file state change is written to the batches collection, so a restart picks up queued
+    and half-finished batches and only redoes the files that had not finished.
+    `load_job(batch)` returns the batch's CompiledJob (once per batch) and
+    `process_file(batch, job, item)` does the work for one file, returning True if it succeeded.
+    """
+
+    def __init__(self, get_batches, load_job, process_file, spool_dir, concurrency):
+        self.get_batches = get_batches
+        self.load_job = load_job
+        self.process_file = process_file
+        self.spool_dir = spool_dir
+        self.concurrency = concurrency
+        self._queue = None
+        self._task = None
+
+    def start(self):
+        # Filled by _run from the batches collection, so nothing queued before a restart is lost
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop processing; unfinished files stay pending and are redone after a restart."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def batch_dir(self, batch_id):
+        return os.path.join(self.spool_dir, batch_id)
+
+    async def submit(self, batch):
+        """Persist a batch whose files are already spooled and queue it."""
+        batch.update({"status": QUEUED, "processed": 0, "failed": 0, "total": len(batch["files"])})
+        await self.get_batches().insert_one(batch)
+        await self._queue.put(batch["_id"])
+
+    async def _run(self):
+        # Batches accepted before a restart
+        cursor = self.get_batches().find({"status": {"$in": [QUEUED, RUNNING]}}, {"_id": 1}).sort("created_at", 1)
+        async for batch in cursor:
+            self._queue.put_nowait(batch["_id"])
+
+        while True:
+            batch_id = await self._queue.get()
+            try:
+                await self._process(batch_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.exception("Background batch %s failed", batch_id)
+                await self.get_batches().update_one(
+                    {"_id": batch_id}, {"$set": {"status": FAILED, "error": str(e), "finished_at": _now()}}
+                )
+
+    async def _process(self, batch_id):
+        batches = self.get_batches()
+        batch = await batches.find_one({"_id": batch_id})
+        if batch is None or batch["status"] not in (QUEUED, RUNNING):
+            return
+        await batches.update_one({"_id": batch_id}, {"$set": {"status": RUNNING, "started_at": _now()}})
+        job = await self.load_job(batch)
+
+        slots = asyncio.Semaphore(self.concurrency)
+
+        async def run(item):
+            async with slots:
+                ok = await self.process_file(batch, job, item)
+            await batches.update_one(
+                {"_id": batch_id, "files.index": item["index"]},
+                {"$set": {"files.$.status": DONE if ok else FAILED}, "$inc": {"processed": 1, "failed": 0 if ok else 1}},
+            )
+            await asyncio.to_thread(_remove, item["path"])
+
+        await asyncio.gather(*(run(item) for item in batch["files"] if item["status"] == PENDING))
+        await batches.update_one({"_id": batch_id}, {"$set": {"status": DONE, "finished_at": _now()}})
+        await asyncio.to_thread(shutil.rmtree, self.batch_dir(batch_id), True)
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,109 @@
+# app/services/batch_runner.py
+import asyncio
+import time
+
+# Status of a resume that did not finish within the request
+PENDING = "pending"      # queued or still within its own timeout when the request budget ran out
+TIMED_OUT = "timed_out"  # ran longer than the per-resume timeout
+CANCELLED = "cancelled"  # dropped because the client went away
+
+# How often a waiting batch checks whether it was cancelled
+CANCEL_POLL_SECONDS = 0.25
+
+
+class BatchCancelled(Exception):
+    """Raised inside an item that noticed, between two stages, that its batch was cancelled."""
+
+
+def check_cancelled(cancel):
+    """Called by item functions between stages; `cancel` is the batch's threading.Event (or None)."""
+    if cancel is not None and cancel.is_set():
+        raise BatchCancelled("Batch cancelled")
+
+
+class BatchItem:
+    """One unit of work in a batch; `started_at` is set by the worker thread when it picks the item up."""
+
+    def __init__(self, key, fn, *args):
+        self.key = key
+        self.fn = fn
+        self.args = args
+        self.started_at = None
+        self.future = None
+
+    def run(self):
+        self.started_at = time.monotonic()
+        return self.fn(*self.args)
+
+
+async def iter_batch(items, executor, budget, item_timeout, unfinished, on_late_result=None, cancel=None):
+    """
+    Run items on `executor` and wait at most `budget` seconds overall. Yields
+    (key, result or exception) as each item finishes; once the budget runs out, `unfinished`
+    maps the key of every other item to PENDING or TIMED_OUT.
+
+    An item running longer than `item_timeout` is reported as TIMED_OUT, but its thread cannot
+    be stopped and keeps running; `on_late_result(key, result_or_exception)` is called when it,
+    or any other unfinished item, completes. The stages that can hang are bounded on their own
+    (PDF extraction by its worker's timeout, which kills the process), so such a thread ends soon.
+
+    `cancel` is a threading.Event shared with the item functions. Once it is set, or the
+    consumer stops early (a streaming client went away), the batch is cancelled: items still
+    queued are dropped, running ones stop at their next check_cancelled, and only items that
+    finish anyway are handed to `on_late_result`, so finished work is still persisted.
+    """
+    deadline = time.monotonic() + budget
+    by_future = {}
+    for item in items:
+        item.future = executor.submit(item.run)
+        by_future[asyncio.wrap_future(item.future)] = item
+
+    yielded = set()
+    pending = set(by_future)
+    completed = False
+    try:
+        while pending:
+            now = time.monotonic()
+            for future in [f for f in pending if by_future[f].started_at and now - by_future[f].started_at >= item_timeout]:
+                pending.discard(future)
+                unfinished[by_future[future].key] = TIMED_OUT
+            if cancel is not None and cancel.is_set():
+                return
+            if not pending or now >= deadline:
+                break
+
+            # Wake up at the first completion, the next per-item expiry, the request deadline
+            # or the next cancellation check
+            expiries = [by_future[f].started_at + item_timeout for f in pending if by_future[f].started_at]
+            wait_until = min([deadline, *expiries, now + CANCEL_POLL_SECONDS if cancel is not None else deadline])
+            done, pending = await asyncio.wait(pending, timeout=max(wait_until - now, 0.01), return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                item = by_future[future]
+                yielded.add(item.key)
+                yield item.key, future.exception() or future.result()
+        completed = True
+    finally:
+        cancelled = not completed and cancel is not None
+        if cancelled:
+            cancel.set()
+        for future, item in by_future.items():
+            if item.key not in yielded:
+                if cancelled and (item.future.cancel() or not item.future.done()):
+                    unfinished[item.key] = CANCELLED
+                unfinished.setdefault(item.key, PENDING)
+                # Outcome is delivered through on_late_result; mark the asyncio wrapper as observed
+                future.add_done_callback(lambda f: f.cancelled() or f.exception())
+
+        # Timed-out and pending items finish in the background; the callback runs in the worker
+        # thread, so it does not depend on the event loop that served the request
+        if on_late_result:
+            for item in items:
+                if item.key in unfinished:
+                    item.future.add_done_callback(lambda f, key=item.key: _deliver_late(f, key, on_late_result))
+
+
+def _deliver_late(future, key, on_late_result):
+    # Dropped and stopped items of a cancelled batch have nothing to persist
+    if future.cancelled() or isinstance(future.exception(), BatchCancelled):
+        return
+    on_late_result(key, future.exception() or future.result())
@@ -0,0 +1,65 @@
+# app/services/blob_store.py
+import hashlib
+from bson import ObjectId
+from gridfs.errors import FileExists, NoFile
+from pymongo.errors import DuplicateKeyError
+
+# GridFS chunk size; PDFs are streamed into chunks of this size instead of one document
+CHUNK_SIZE_BYTES = 255 * 1024
+
+
+def content_hash(data):
+    """SHA-256 of a file's bytes, used as its content address."""
+    return hashlib.sha256(data).hexdigest()
+
+
+class ResumeBlobStore:
+    """
+    Resume PDFs in GridFS, stored once per SHA-256 content hash (a unique index on
+    metadata.sha256, see resume_store.RESUME_FILE_INDEXES, settles concurrent uploads).
+    Resume documents keep only the small reference returned by `put`.
+    """
+
+    def __init__(self, get_bucket):
+        self.get_bucket = get_bucket
+
+    async def find(self, sha256):
+        """GridFS file document for a content hash, or None."""
+        cursor = self.get_bucket().find({"metadata.sha256": sha256}, limit=1)
+        async for grid_out in cursor:
+            return grid_out
+        return None
+
+    async def put(self, data, filename, sha256=None):
+        """Store `data` unless identical bytes are already stored; return a reference to it."""
+        sha256 = sha256 or content_hash(data)
+        existing = await self.find(sha256)
+        if existing is not None:
+            return {"sha256": sha256, "gridfs_id": existing._id, "size": len(data)}
+
+        file_id = ObjectId()
+        try:
+            await self.get_bucket().upload_from_stream_with_id(
+                file_id,
+                filename,
+                data,
+                chunk_size_bytes=CHUNK_SIZE_BYTES,
+                metadata={"sha256": sha256, "content_type": "application/pdf"},
+            )
+        except (FileExists, DuplicateKeyError):
+            # A concurrent upload of the same bytes was stored first: use it, drop our chunks
+            try:
+                await self.get_bucket().delete(file_id)
+            except NoFile:
+                pass
+            existing = await self.find(sha256)
+            file_id = existing._id
+        return {"sha256": sha256, "gridfs_id": file_id, "size": len(data)}
+
+    async def get(self, sha256):
+        """Bytes of a stored resume, or None if the hash is unknown."""
+        existing = await self.find(sha256)
+        if existing is None:
+            return None
+        stream = await self.get_bucket().open_download_stream(existing._id)
+        return await stream.read()
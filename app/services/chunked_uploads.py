@@ -0,0 +1,194 @@
+# app/services/chunked_uploads.py
+# Resumable uploads: a file is sent in chunks at explicit offsets and can be continued after a
+# dropped connection. Sessions live on local disk only (<id>.part data + <id>.json metadata).
+import hashlib
+import json
+import os
+import re
+import time
+from contextlib import contextmanager
+from uuid import uuid4
+from app.services.upload_spool import SPOOL_CHUNK_BYTES
+
+try:
+    import fcntl
+except ImportError:  # Windows: lock the first byte of the file instead
+    fcntl = None
+    import msvcrt
+
+# Error codes (ChunkedUploadError.code)
+NOT_FOUND = "not_found"
+OFFSET_MISMATCH = "offset_mismatch"
+TOO_LARGE = "too_large"
+CHECKSUM_MISMATCH = "checksum_mismatch"
+INCOMPLETE = "incomplete"
+
+UPLOAD_ID_PATTERN = re.compile(r"[0-9a-f]{32}")
+
+
+class ChunkedUploadError(Exception):
+    """A chunked upload request was rejected; `offset` is the session's current offset when known."""
+
+    def __init__(self, code, message, offset=None):
+        super().__init__(message)
+        self.code = code
+        self.offset = offset
+
+
+@contextmanager
+def _locked(f):
+    """Exclusive lock on an open session file, across threads and worker processes."""
+    if fcntl is not None:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+        return
+    f.seek(0)
+    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)  # retries for ~10 s, then raises OSError
+    try:
+        yield
+    finally:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class ChunkedUploadStore:
+    """
+    Upload sessions under `directory`. The bytes received so far are the session's offset, so
+    a client that lost its connection asks for the offset and continues from there. Chunks
+    are appended under an exclusive file lock (safe across worker processes), each optionally
+    checked against its own SHA-256, and the whole file is checked against the SHA-256 given
+    at creation before it can be used. Sessions idle for `ttl_seconds` are purged.
+    """
+
+    def __init__(self, directory, max_bytes, max_chunk_bytes, ttl_seconds):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_chunk_bytes = max_chunk_bytes
+        self.ttl_seconds = ttl_seconds
+
+    def _paths(self, upload_id):
+        if not UPLOAD_ID_PATTERN.fullmatch(upload_id):
+            raise ChunkedUploadError(NOT_FOUND, "Unknown upload")
+        base = os.path.join(self.directory, upload_id)
+        return base + ".part", base + ".json"
+
+    def _load(self, upload_id):
+        data_path, meta_path = self._paths(upload_id)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            meta["offset"] = os.path.getsize(data_path)
+        except FileNotFoundError:
+            raise ChunkedUploadError(NOT_FOUND, "Unknown upload")
+        return meta
+
+    def _save(self, meta):
+        _, meta_path = self._paths(meta["upload_id"])
+        tmp_path = meta_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({k: v for k, v in meta.items() if k != "offset"}, f)
+        os.replace(tmp_path, meta_path)
+
+    def create(self, filename, size, sha256):
+        """Start a session for a file of `size` bytes whose SHA-256 is `sha256`."""
+        if size > self.max_bytes:
+            raise ChunkedUploadError(TOO_LARGE, f"{filename} is larger than {self.max_bytes} bytes")
+        os.makedirs(self.directory, exist_ok=True)
+        self.purge_expired()
+        meta = {
+            "upload_id": uuid4().hex, "filename": filename, "size": size,
+            "sha256": sha256.lower(), "complete": False, "created_at": time.time(),
+        }
+        data_path, _ = self._paths(meta["upload_id"])
+        open(data_path, "wb").close()
+        self._save(meta)
+        meta["offset"] = 0
+        return meta
+
+    def status(self, upload_id):
+        return self._load(upload_id)
+
+    def append(self, upload_id, offset, data, chunk_sha256=None):
+        """Write `data` at `offset`, which must be the current end of the file; returns the new offset."""
+        meta = self._load(upload_id)
+        if meta["complete"]:
+            raise ChunkedUploadError(OFFSET_MISMATCH, "Upload is already complete", meta["offset"])
+        if len(data) > self.max_chunk_bytes:
+            raise ChunkedUploadError(TOO_LARGE, f"Chunks are at most {self.max_chunk_bytes} bytes", meta["offset"])
+        if chunk_sha256 and hashlib.sha256(data).hexdigest() != chunk_sha256.lower():
+            raise ChunkedUploadError(CHECKSUM_MISMATCH, "Chunk does not match its SHA-256", meta["offset"])
+
+        data_path, _ = self._paths(upload_id)
+        with open(data_path, "ab") as f, _locked(f):
+            current = os.fstat(f.fileno()).st_size
+            if offset != current:
+                raise ChunkedUploadError(OFFSET_MISMATCH, f"Expected offset {current}", current)
+            if current + len(data) > meta["size"]:
+                raise ChunkedUploadError(TOO_LARGE, "Chunk goes past the declared size", current)
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+            return current + len(data)
+
+    def complete(self, upload_id):
+        """Check the received file against its declared size and SHA-256 and mark it usable."""
+        meta = self._load(upload_id)
+        if meta["complete"]:
+            return meta
+        if meta["offset"] != meta["size"]:
+            raise ChunkedUploadError(INCOMPLETE, f"{meta['offset']} of {meta['size']} bytes received", meta["offset"])
+
+        data_path, _ = self._paths(upload_id)
+        digest = hashlib.sha256()
+        with open(data_path, "rb") as f:
+            while chunk := f.read(SPOOL_CHUNK_BYTES):
+                digest.update(chunk)
+        if digest.hexdigest() != meta["sha256"]:
+            # The bytes on disk are unusable; the client has to start over
+            self.delete(upload_id)
+            raise ChunkedUploadError(CHECKSUM_MISMATCH, "File does not match its SHA-256; upload it again")
+        meta["complete"] = True
+        self._save(meta)
+        return meta
+
+    def take(self, upload_id):
+        """
+        Hand a completed upload over to its consumer: returns (metadata, open file). The session
+        ends at once and its data file goes away once the consumer has closed the file (and
+        any memory map of it).
+        """
+        meta = self._load(upload_id)
+        if not meta["complete"]:
+            raise ChunkedUploadError(INCOMPLETE, "Upload is not complete", meta["offset"])
+        data_path, meta_path = self._paths(upload_id)
+        os.remove(meta_path)
+        if hasattr(os, "O_TEMPORARY"):
+            # Windows cannot remove an open file: it is opened delete-on-close instead
+            fd = os.open(data_path, os.O_RDONLY | os.O_BINARY | os.O_TEMPORARY)
+        else:
+            fd = os.open(data_path, os.O_RDONLY)
+            os.remove(data_path)
+        return meta, os.fdopen(fd, "rb")
+
+    def delete(self, upload_id):
+        for path in self._paths(upload_id):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def purge_expired(self):
+        """Remove sessions with no activity (chunk or creation) for `ttl_seconds`."""
+        cutoff = time.time() - self.ttl_seconds
+        for name in os.listdir(self.directory):
+            if not name.endswith(".part"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    self.delete(name[:-len(".part")])
+            except (OSError, ChunkedUploadError):
+                pass  # gone already, or still open (Windows)
@@ -0,0 +1,50 @@
+# app/services/dedup.py
+import math
+from app.services.resume_store import HASH_PROJECTION
+
+
+class BloomFilter:
+    """
+    Process-local Bloom filter of resume content hashes.
+    "Not in the filter" means the resume is certainly new, so the database is only asked
+    about hashes that may already be stored. Keys are SHA-256 hex digests, which are already
+    uniformly distributed, so bit positions are taken straight from the digest (double hashing).
+    """
+
+    def __init__(self, capacity, error_rate):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+        # Until the stored hashes are loaded every key may be known
+        self.ready = False
+
+    def _positions(self, sha256):
+        h1 = int(sha256[:16], 16)
+        h2 = int(sha256[16:32], 16) | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, sha256):
+        for pos in self._positions(sha256):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def might_contain(self, sha256):
+        if not self.ready:
+            return True
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(sha256))
+
+
+async def load_known_hashes(bloom, resumes, since=None, batch_size=10000):
+    """
+    Fill the filter from the stored resumes (an index-only scan of content_hash), or with `since`
+    add only the resumes created from then on (a scan of the created_at index).
+    """
+    if since is None:
+        cursor = resumes.find({}, HASH_PROJECTION).hint("content_hash_unique")
+    else:
+        cursor = resumes.find({"created_at": {"$gte": since}}, HASH_PROJECTION).hint("created_at")
+    async for doc in cursor.batch_size(batch_size):
+        if doc.get("content_hash"):
+            bloom.add(doc["content_hash"])
+    bloom.ready = True
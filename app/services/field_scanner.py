@@ -0,0 +1,55 @@
+# app/services/field_scanner.py
+import re
+from collections import namedtuple
+
+# One precompiled alternation for every regex-extracted field; a single finditer walks the
+# text once and the named group that matched says which field the match belongs to.
+# The leading guard only lets a match start at a currency sign or at the start of a word
+# whose first character can open a field, so most positions are rejected after one test.
+# Salary comes first so "$5" is never read as the start of an experience figure.
+FIELD_REGEX = re.compile(
+    r"(?:(?=[₹$])|(?<![A-Za-z0-9])(?=[\dBMPUCIS]))(?:"
+    r"(?P<salary>(?:₹|\$)\s*\d+(?:,\d{3})*(?:\.\d+)?)"
+    r"|(?P<experience>(?P<exp_value>\d+(?:\.\d+)?)\s*(?P<exp_unit>years?|yrs?|months?|mos?))"
+    r"|(?P<degree>B(?:\.?Tech|achelor)|M(?:\.?Tech|aster|BA)|Ph\.?D)"
+    r"|(?P<institute>University|College|Institute|School of [A-Za-z]+)"
+    r")",
+    re.I,
+)
+
+FIELDS = ("experience", "salary", "degree", "institute")
+
+# text: matched text, section: resume section it was found in,
+# value: numeric value (experience amount / salary figure), unit: experience unit
+FieldMatch = namedtuple("FieldMatch", ["text", "section", "value", "unit"])
+
+
+def _salary_value(text):
+    return float(re.sub(r"[^\d.]", "", text))
+
+
+def scan_fields(text, sections=None):
+    """
+    Scan text once and return {field: [FieldMatch, ...]} for experience, salary,
+    degree and institute, in document order.
+    With `sections` from segment_sections, each match records the section it falls in.
+    """
+    fields = {name: [] for name in FIELDS}
+    sections = sections or []
+    index, section = -1, "header"
+
+    for match in FIELD_REGEX.finditer(text):
+        # Matches and sections are both in document order, so the section pointer only moves forward
+        while index + 1 < len(sections) and sections[index + 1].start <= match.start():
+            index += 1
+            section = sections[index].name
+
+        kind = match.lastgroup
+        if kind == "experience":
+            value, unit = match.group("exp_value"), match.group("exp_unit")
+            fields[kind].append(FieldMatch(f"{value} {unit}", section, float(value), unit))
+        elif kind == "salary":
+            fields[kind].append(FieldMatch(match.group(kind), section, _salary_value(match.group(kind)), None))
+        else:
+            fields[kind].append(FieldMatch(match.group(kind), section, None, None))
+    return fields
@@ -1,11 +1,4 @@
-import re
-
-# Regex patterns
-EXPERIENCE_REGEX = re.compile(r"(\d+(\.\d+)?)\s*(years?|yrs?|months?|mos?)", re.I)
-SALARY_REGEX = re.compile(r"(₹|\$)\s*\d+(,\d{3})*(\.\d+)?", re.I)
-# Education keywords can be dynamically searched
-EDUCATION_KEYWORDS = ["B.Tech", "M.Tech", "Bachelor", "Master", "MBA", "PhD"]
-EDUCATION_REGEX = re.compile(r"\b(" + "|".join(EDUCATION_KEYWORDS) + r")\b", re.I)
+from app.services.field_scanner import scan_fields
 
 def extract_job_skills(skills_input: str):
     """Split comma-separated skills."""
@@ -13,16 +6,16 @@ def extract_job_skills(skills_input: str):
     return skills  # no validation needed now
 
 def extract_job_experience(exp_input: str):
-    match = EXPERIENCE_REGEX.findall(exp_input)
-    return match[0][0] + " " + match[0][2] if match else None
+    matches = scan_fields(exp_input)["experience"]
+    return matches[0].text if matches else None
 
 def extract_job_salary(salary_input: str):
-    match = SALARY_REGEX.findall(salary_input)
-    return "".join(match[0]) if match else None
+    matches = scan_fields(salary_input)["salary"]
+    return matches[0].text if matches else None
 
 def extract_job_education(education_input: str):
-    matches = EDUCATION_REGEX.findall(education_input)
-    return list(set(matches)) if matches else None
+    matches = scan_fields(education_input)["degree"]
+    return list({m.text for m in matches}) if matches else None
 
 def parse_job_post(skills="", experience="", salary="", education=""):
     """Return parsed job post details as a dict from form inputs."""
@@ -0,0 +1,67 @@
+# app/services/job_store.py
+# Stored job postings. Each job is compiled once when it is saved (normalized skills, term
+# counts of the job text, boost terms, numeric requirements), and every match against it
+# reuses those artifacts instead of re-parsing the job form.
+from datetime import datetime, timezone
+from bson import ObjectId
+from app.services.job_parser import parse_job_post
+from app.services.matching_service import CompiledJob, compile_job
+from app.services.resume_features import decode_counts, encode_counts
+from app.services.resume_store import canonical_skill, experience_years, salary_amount
+
+# Bump when the compiled artifacts change shape; older jobs are recompiled on read
+COMPILED_VERSION = 2
+
+
+def parse_job_id(job_id):
+    """ObjectId of a job id string, or None if it is not a valid id."""
+    return ObjectId(job_id) if ObjectId.is_valid(job_id) else None
+
+
+def job_inputs(job_post):
+    """Parsed job data (the dict parse_job_post returns for the match form) of a JobPost."""
+    min_experience = job_post.get("min_experience")
+    return parse_job_post(
+        skills=", ".join(job_post.get("required_skills") or []),
+        experience=f"{min_experience} years" if min_experience is not None else "",
+        salary=job_post.get("salary_range") or "",
+        education=job_post.get("education") or "",
+    )
+
+
+def build_job_document(job_post):
+    """Job document as stored: the posting, its parsed data and its compiled query."""
+    job_data = job_inputs(job_post)
+    job = compile_job(job_data)
+    terms, counts = encode_counts(job.counts)
+    return {
+        **job_post,
+        "job_data": job_data,
+        "skills_normalized": sorted({canonical_skill(s) for s in job_data["skills"]}),
+        "min_experience_years": experience_years([job_data["experience"]] if job_data["experience"] else []),
+        "salary_amount": salary_amount([job_data["salary"]] if job_data["salary"] else []),
+        "compiled": {
+            "version": COMPILED_VERSION,
+            "terms": terms,
+            "counts": counts,
+            "boost_terms": sorted(job.boost_terms),
+        },
+        "updated_at": datetime.now(timezone.utc),
+    }
+
+
+def compiled_job(document):
+    """CompiledJob of a stored job document, without re-parsing or re-tokenizing the job."""
+    compiled = document.get("compiled") or {}
+    if compiled.get("version") != COMPILED_VERSION:
+        return compile_job(document["job_data"])
+    return CompiledJob(
+        document["job_data"], decode_counts(compiled["terms"], compiled["counts"]), set(compiled["boost_terms"])
+    )
+
+
+def job_response(document):
+    """A stored job as returned by the API (string id, no compiled artifacts)."""
+    response = {key: value for key, value in document.items() if key not in ("_id", "compiled")}
+    response["id"] = str(document["_id"])
+    return response
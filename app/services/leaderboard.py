@@ -0,0 +1,222 @@
+# app/services/leaderboard.py
+# Materialized top-N candidates per job, kept up to date as resumes and jobs arrive.
+import asyncio
+import logging
+from collections import deque
+from datetime import datetime, timezone
+from pymongo import DeleteMany, UpdateOne
+from app.services.job_store import compiled_job
+from app.services.matching_service import rank_features, score_features
+from app.services.resume_features import FEATURES_PROJECTION, FEATURES_VERSION, decode_features
+from app.services.resume_store import LEADERBOARD_ORDER, LEADERBOARD_RANK_PROJECTION, leaderboard_rank
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+# Jobs that still take candidates (jobs stored before "status" existed count as open)
+OPEN_JOBS_QUERY = {"status": {"$ne": "closed"}}
+
+RESUME_PROJECTION = {"_id": 0, "content_hash": 1, "filename": 1, "parsed_skills": 1, **FEATURES_PROJECTION}
+RESUME_SCAN_BATCH_SIZE = 1000
+
+
+def build_match_document(job_id, job, features, score, skills_matched, now):
+    """One leaderboard entry: the job, the resume and the components of its score."""
+    return {
+        "job_id": job_id,
+        "content_hash": features.content_hash,
+        "filename": features.filename,
+        "score": round(score * 100, 2),
+        "components": {
+            "text_similarity": score,
+            "skills_matched": skills_matched,
+            "skills_required": len(job.job_data.get("skills", [])),
+            "experience_years": features.experience_years,
+            "salary_amount": features.salary_amount,
+            "experience_required": job.job_data.get("experience"),
+        },
+        "updated_at": now,
+    }
+
+
+def score_against_jobs(features, jobs):
+    """(job id, score, skills matched) of one resume against every open job."""
+    return [(job_id, *score_features(features, job)) for job_id, job in jobs.items()]
+
+
+class LeaderboardUpdater:
+    """
+    Keeps a top-`size` leaderboard per open job in the job_matches collection.
+
+    Events are handled one at a time by a background task: a new resume is scored against
+    every open job (compiled queries are cached in memory) and enters a leaderboard only if it
+    beats that job's current cut-off; a new or changed job is scored against the whole corpus
+    from stored features. Reading a leaderboard is then an index scan of `size` entries.
+    """
+
+    def __init__(self, get_db, executor, size, max_pending):
+        self.get_db = get_db
+        self.executor = executor
+        self.size = size
+        self._queue = asyncio.Queue(maxsize=max_pending)
+        self._task = None
+        self._jobs = {}  # job id -> CompiledJob of every open job
+        self._cutoffs = {}  # job id -> leaderboard_rank of the last entry, None while the leaderboard is not full
+        # Resumes seen recently may still sit in the write-behind buffer, invisible to a corpus scan
+        self._recent = deque(maxlen=max_pending)
+        self.events_processed = 0
+        self.events_failed = 0
+
+    @property
+    def matches(self):
+        return self.get_db()["job_matches"]
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Handle every queued event and stop."""
+        if self._task is None:
+            return
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+
+    async def resume_added(self, features):
+        """Queue a newly stored resume (ResumeFeatures) for scoring against the open jobs."""
+        await self._queue.put(("resume", features))
+
+    async def job_saved(self, job_id):
+        """Queue a created or updated job for a full leaderboard rebuild."""
+        await self._queue.put(("job", job_id))
+
+    async def job_deleted(self, job_id):
+        await self._queue.put(("delete", job_id))
+
+    def metrics(self):
+        return {
+            "open_jobs": len(self._jobs),
+            "queue_depth": self._queue.qsize(),
+            "events_processed": self.events_processed,
+            "events_failed": self.events_failed,
+        }
+
+    async def _run(self):
+        try:
+            await self._load_jobs()
+        except Exception:
+            logger.exception("Could not load open jobs; leaderboards update as jobs are saved")
+        while True:
+            event = await self._queue.get()
+            if event is _STOP:
+                return
+            kind, payload = event
+            try:
+                if kind == "resume":
+                    await self._add_resume(payload)
+                elif kind == "job":
+                    await self._rebuild_job(payload)
+                else:
+                    await self._drop_job(payload)
+                self.events_processed += 1
+            except Exception:
+                # Keep going: one bad event must not stop every leaderboard from updating
+                self.events_failed += 1
+                logger.exception("Leaderboard update failed for %s %s", kind, getattr(payload, "content_hash", payload))
+
+    async def _load_jobs(self):
+        async for document in self.get_db()["jobs"].find(OPEN_JOBS_QUERY):
+            self._jobs[document["_id"]] = compiled_job(document)
+            self._cutoffs[document["_id"]] = await self._cutoff(document["_id"])
+
+    async def _cutoff(self, job_id):
+        """Rank of the last leaderboard entry, or None if the leaderboard has room."""
+        cursor = self.matches.find({"job_id": job_id}, LEADERBOARD_RANK_PROJECTION).sort(LEADERBOARD_ORDER)
+        last = await cursor.skip(self.size - 1).limit(1).to_list(length=1)
+        return leaderboard_rank(last[0]) if last else None
+
+    async def _trim(self, job_id):
+        """Delete the entries ranked below `size` (ties included); returns the new cutoff."""
+        cursor = self.matches.find({"job_id": job_id}, LEADERBOARD_RANK_PROJECTION).sort(LEADERBOARD_ORDER)
+        ranked = await cursor.skip(self.size - 1).to_list(length=None)
+        if not ranked:
+            return None
+        if len(ranked) > 1:
+            await self.matches.delete_many({"_id": {"$in": [d["_id"] for d in ranked[1:]]}})
+        return leaderboard_rank(ranked[0])
+
+    async def _add_resume(self, features):
+        self._recent.append(features)
+        if not self._jobs:
+            return
+        loop = asyncio.get_running_loop()
+        scored = await loop.run_in_executor(self.executor, score_against_jobs, features, dict(self._jobs))
+
+        now = datetime.now(timezone.utc)
+        requests, touched = [], []
+        for job_id, score, skills_matched in scored:
+            document = build_match_document(job_id, self._jobs[job_id], features, score, skills_matched, now)
+            cutoff = self._cutoffs.get(job_id)
+            if cutoff is not None and leaderboard_rank(document) >= cutoff:
+                continue
+            requests.append(UpdateOne(
+                {"job_id": job_id, "content_hash": features.content_hash}, {"$set": document}, upsert=True
+            ))
+            touched.append(job_id)
+        if not requests:
+            return
+        await self.matches.bulk_write(requests, ordered=False)
+
+        # Trim each leaderboard the resume entered back to `size` entries
+        for job_id in touched:
+            self._cutoffs[job_id] = await self._trim(job_id)
+
+    async def _rebuild_job(self, job_id):
+        document = await self.get_db()["jobs"].find_one({"_id": job_id})
+        if document is None or document.get("status") == "closed":
+            # Deleted or closed: its leaderboard is kept as it was but no longer updated
+            self._jobs.pop(job_id, None)
+            self._cutoffs.pop(job_id, None)
+            return
+        job = compiled_job(document)
+        self._jobs[job_id] = job
+
+        loop = asyncio.get_running_loop()
+        best, documents = [], []
+        cursor = self.get_db()["resumes"].find({"features.version": FEATURES_VERSION}, RESUME_PROJECTION)
+        async for resume in cursor.batch_size(RESUME_SCAN_BATCH_SIZE):
+            documents.append(resume)
+            if len(documents) == RESUME_SCAN_BATCH_SIZE:
+                best = await loop.run_in_executor(self.executor, self._rank, documents, [], job, best)
+                documents = []
+        best = await loop.run_in_executor(self.executor, self._rank, documents, list(self._recent), job, best)
+
+        # Upsert the new entries first and then drop the rest, so readers never see an empty board
+        now = datetime.now(timezone.utc)
+        requests = [
+            UpdateOne(
+                {"job_id": job_id, "content_hash": features.content_hash},
+                {"$set": build_match_document(job_id, job, features, score, skills_matched, now)},
+                upsert=True,
+            )
+            for score, skills_matched, features in best
+        ]
+        requests.append(DeleteMany({"job_id": job_id, "content_hash": {"$nin": [f.content_hash for _, _, f in best]}}))
+        await self.matches.bulk_write(requests, ordered=True)
+        self._cutoffs[job_id] = await self._cutoff(job_id)
+
+    def _rank(self, documents, recent, job, best):
+        """Merge a batch of stored resumes (and recent, maybe unflushed ones) into the running top `size`."""
+        seen = {entry[2].content_hash for entry in best}
+        features = [f for f in map(decode_features, documents) if f is not None]
+        stored = {f.content_hash for f in features}
+        features += [f for f in recent if f.content_hash not in stored]
+        ranked = rank_features((f for f in features if f.content_hash not in seen), job, self.size)
+        merged = sorted(best + ranked, key=lambda x: x[0], reverse=True)
+        return merged[:self.size]
+
+    async def _drop_job(self, job_id):
+        self._jobs.pop(job_id, None)
+        self._cutoffs.pop(job_id, None)
+        await self.matches.delete_many({"job_id": job_id})
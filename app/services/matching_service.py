@@ -1,5 +1,9 @@
+import heapq
+import math
+from collections import Counter, namedtuple
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
+from app.services.skill_taxonomy import TAXONOMY, normalize_skill
 
 def preprocess_text(text_list):
     """Join all fields (like skills, education, experience) into one string."""
@@ -34,3 +38,125 @@ def calculate_similarity(resume_data, job_data):
     
     # Convert to percentage
     return round(similarity * 100, 2)
+
+
+# ---------------- Build job text ----------------
+def build_job_text(job_data):
+    skills = " ".join(job_data.get("skills", []))
+    experience = str(job_data.get("experience") or "")
+    education = " ".join(job_data.get("education") or [])
+    salary = str(job_data.get("salary") or "")
+    job_text = f"{skills} {experience} {education} {salary}"
+    return job_text
+
+# ---------------- Skills matched ----------------
+def get_skills_matched(resume_skills, job_skills, resume_mask=None):
+    """
+    Job skills satisfied by the resume, directly or through the skill taxonomy
+    (aliases such as "ML" = "Machine Learning", children such as "Django" -> "Python").
+    `resume_mask` is TAXONOMY.skills_mask(resume_skills), if already known.
+    """
+    if resume_mask is None:
+        resume_mask = TAXONOMY.skills_mask(resume_skills)
+    resume_literal = {normalize_skill(s) for s in resume_skills}
+    matched = []
+    for skill in job_skills:
+        skill = normalize_skill(skill)
+        skill_id = TAXONOMY.skill_id(skill)
+        if skill in resume_literal or (skill_id is not None and resume_mask >> skill_id & 1):
+            matched.append(skill)
+    return matched
+
+# ---------------- Term counts ----------------
+# Same tokenization as TfidfVectorizer(stop_words="english"), so stored counts score exactly
+# like the text they came from
+ANALYZER = TfidfVectorizer(stop_words="english").build_analyzer()
+SKILL_BOOST_FACTOR = 5.0
+
+
+def term_counts(text):
+    """Token -> count for a text, as TF-IDF sees it."""
+    return Counter(ANALYZER(text))
+
+
+def skill_boost_tokens(job_skills):
+    """
+    Tokens to boost for the job skills: every spelling that satisfies one, tokenized as TF-IDF
+    sees it, so a multi-word skill ("machine learning") boosts its words.
+    """
+    return {token for term in TAXONOMY.expand_terms(job_skills) for token in ANALYZER(term)}
+
+
+def score_counts(resume_counts, job_counts, boost_terms, factor=SKILL_BOOST_FACTOR):
+    """
+    Cosine similarity of the two-document TF-IDF vectors (smoothed idf, as fitted by
+    TfidfVectorizer on [resume, job]) with `boost_terms` weighted by `factor`.
+    Works on term counts alone, so no vectorizer is fitted per resume.
+    """
+    # idf over two documents: a term in one of them weighs ln(3/2) + 1, in both exactly 1
+    rare_idf = math.log(1.5) + 1
+
+    def norm(counts):
+        total = 0.0
+        for term, count in counts.items():
+            weight = count * (rare_idf if term not in shared else 1.0) * (factor if term in boost_terms else 1.0)
+            total += weight * weight
+        return math.sqrt(total)
+
+    shared = job_counts.keys() & resume_counts.keys()
+    if not shared:
+        return 0.0
+    dot = 0.0
+    for term in shared:
+        boost = factor * factor if term in boost_terms else 1.0
+        dot += resume_counts[term] * job_counts[term] * boost
+    return dot / (norm(resume_counts) * norm(job_counts))
+
+
+# ---------------- Compiled job ----------------
+# Everything about a job that scoring needs, computed once per job instead of once per resume
+CompiledJob = namedtuple("CompiledJob", ["job_data", "counts", "boost_terms"])
+
+
+def compile_job(job_data):
+    return CompiledJob(job_data, term_counts(build_job_text(job_data)), skill_boost_tokens(job_data.get("skills", [])))
+
+
+# ---------------- Score one resume against a job ----------------
+def score_resume_counts(resume_counts, resume_skills, job_data, job_counts, boost_terms=None, resume_mask=None):
+    """
+    Score a resume from its term counts. `job_counts` are the counts of the job text,
+    `boost_terms` the tokens of the spellings that satisfy a job skill and `resume_mask` the resume's skill
+    bitset (each computed if not given).
+    Returns (score in [0, 1], job skills matched).
+    """
+    job_skills = job_data.get("skills", [])
+    if boost_terms is None:
+        boost_terms = skill_boost_tokens(job_skills)
+
+    # Credit resume terms that satisfy a job skill through the taxonomy (e.g. Django for Python)
+    credited_terms = TAXONOMY.credited_terms(resume_skills, job_skills)
+    if credited_terms:
+        job_counts = job_counts + term_counts(" ".join(sorted(credited_terms)))
+
+    score = score_counts(resume_counts, job_counts, boost_terms)
+    return score, get_skills_matched(resume_skills, job_skills, resume_mask)
+
+
+def score_features(features, job):
+    """Score stored ResumeFeatures against a CompiledJob (no text, PDF or spaCy needed)."""
+    return score_resume_counts(features.counts, features.skills, job.job_data, job.counts, job.boost_terms, features.skill_mask)
+
+
+def rank_features(features, job, limit):
+    """The `limit` best (score, skills matched, ResumeFeatures) of an iterable of stored features."""
+    scored = ((*score_features(f, job), f) for f in features)
+    return heapq.nlargest(limit, scored, key=lambda x: x[0])
+
+
+def score_resume(resume_text, resume_skills, job_data, job_text):
+    """
+    TF-IDF + cosine similarity with skill boosting.
+    Returns (score in [0, 1], job skills matched).
+    """
+    return score_resume_counts(term_counts(resume_text), resume_skills, job_data, term_counts(job_text))
@@ -0,0 +1,76 @@
+# app/services/micro_batch.py
+# Calls made at the same moment from different worker threads, coalesced into one batched call.
+import threading
+import time
+from concurrent.futures import Future
+
+
+class MicroBatcher:
+    """
+    Worker threads `submit` one item each and block until its result is ready. Items that
+    arrive within `max_wait` seconds of the first item of a batch, up to `max_size` of them,
+    go through a single `fn(items)` call, which returns one result per item. The first caller
+    of a batch waits for the others and then runs the call, so no extra thread is needed.
+    If the batched call fails, its items are retried one at a time, so one bad item does not
+    fail the others.
+    """
+
+    def __init__(self, fn, max_size, max_wait):
+        self.fn = fn
+        self.max_size = max_size
+        self.max_wait = max_wait
+        self._lock = threading.Lock()
+        self._closed = threading.Condition(self._lock)
+        self._batch = None  # [(item, future)] still gathering items
+
+        # Metrics
+        self.batches = 0
+        self.items = 0
+        self.largest_batch = 0
+
+    def submit(self, item):
+        future = Future()
+        with self._lock:
+            leader = self._batch is None
+            if leader:
+                self._batch = []
+            batch = self._batch
+            batch.append((item, future))
+            if len(batch) >= self.max_size:
+                # Full: the next item starts a new batch
+                self._batch = None
+                self._closed.notify_all()
+            elif leader:
+                deadline = time.monotonic() + self.max_wait
+                while self._batch is batch and (remaining := deadline - time.monotonic()) > 0:
+                    self._closed.wait(remaining)
+                if self._batch is batch:
+                    self._batch = None
+        if leader:
+            self._run(batch)
+        return future.result()
+
+    def _run(self, batch):
+        with self._lock:
+            self.batches += 1
+            self.items += len(batch)
+            self.largest_batch = max(self.largest_batch, len(batch))
+        try:
+            results = self.fn([item for item, _ in batch])
+        except Exception as e:
+            if len(batch) == 1:
+                batch[0][1].set_exception(e)
+                return
+            for entry in batch:
+                self._run([entry])
+            return
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+    def metrics(self):
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "largest_batch": self.largest_batch,
+        }
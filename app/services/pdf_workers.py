@@ -0,0 +1,223 @@
+# app/services/pdf_workers.py
+# PDF text extraction in isolated, killable worker processes.
+# This module is imported by the workers themselves, so it must stay light (no spaCy / sklearn).
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+from io import BytesIO
+
+import pdfplumber
+
+try:
+    import resource
+except ImportError:  # Windows: no rlimits, timeouts and recycling still apply
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Error codes reported per resume
+TIMEOUT = "timeout"
+MEMORY = "memory_limit"
+CRASHED = "worker_crashed"
+INVALID_PDF = "invalid_pdf"
+CANCELLED = "cancelled"  # the batch was cancelled while the worker was extracting
+
+
+# Time a freshly spawned worker may take to become ready
+WORKER_STARTUP_TIMEOUT_SECONDS = 30
+
+# How often an extraction checks whether its batch was cancelled
+CANCEL_POLL_SECONDS = 0.1
+
+
+class PdfExtractionError(Exception):
+    """A PDF could not be turned into text; `code` is one of the error codes above."""
+
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+
+
+# ----------------- Extract text -----------------
+def extract_text_from_pdf(file):
+    """
+    Extract text from a PDF file-like object
+    """
+    text = ""
+    with pdfplumber.open(file) as pdf:
+        for page in pdf.pages:
+            page_text = page.extract_text()
+            if page_text:
+                text += page_text + "\n"
+    return text
+
+
+# ----------------- Worker process -----------------
+def _apply_limits(memory_limit_mb):
+    if resource is None or not memory_limit_mb:
+        return
+    limit = memory_limit_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _worker_main(conn, memory_limit_mb):
+    _apply_limits(memory_limit_mb)
+    conn.send(("ready",))
+    while True:
+        try:
+            data = conn.recv_bytes()
+        except (EOFError, OSError):
+            return  # parent went away
+        except MemoryError:
+            data = None
+
+        try:
+            if data is None:
+                raise MemoryError
+            reply = ("ok", extract_text_from_pdf(BytesIO(data)))
+        except MemoryError:
+            data = None
+            conn.send(("error", MEMORY, f"PDF exceeded the {memory_limit_mb} MB memory limit"))
+            return  # exit so the parent replaces this process with a fresh one
+        except Exception as e:
+            reply = ("error", INVALID_PDF, str(e) or type(e).__name__)
+        conn.send(reply)
+
+
+class PdfWorker:
+    """One worker process and the pipe used to talk to it."""
+
+    def __init__(self, context, memory_limit_mb):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn, memory_limit_mb), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.documents = 0
+        self.ready = False
+
+    def _wait_reply(self, timeout, cancel):
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise PdfExtractionError(TIMEOUT, f"PDF extraction took longer than {timeout:g}s")
+            if self.conn.poll(remaining if cancel is None else min(remaining, CANCEL_POLL_SECONDS)):
+                return
+            if cancel is not None and cancel.is_set():
+                raise PdfExtractionError(CANCELLED, "PDF extraction cancelled")
+
+    def extract(self, data, timeout, cancel=None):
+        try:
+            # Process start-up (interpreter + pdfplumber import) does not count against the document
+            if not self.ready:
+                if not self.conn.poll(WORKER_STARTUP_TIMEOUT_SECONDS):
+                    raise PdfExtractionError(CRASHED, "PDF worker did not start")
+                self.conn.recv()
+                self.ready = True
+            self.conn.send_bytes(data)
+            self._wait_reply(timeout, cancel)
+            reply = self.conn.recv()
+        except (EOFError, OSError):
+            self.process.join(1)
+            raise PdfExtractionError(CRASHED, f"PDF worker exited with code {self.process.exitcode}")
+        finally:
+            self.documents += 1
+
+        if reply[0] == "error":
+            raise PdfExtractionError(reply[1], reply[2])
+        return reply[1]
+
+    def alive(self):
+        return self.process.is_alive()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join(1)
+        self.conn.close()
+
+
+class PdfWorkerPool:
+    """
+    Pool of sandboxed PDF extraction processes with a wall-clock timeout per document,
+    an address-space rlimit per process and recycling after `max_documents` documents.
+    A worker that times out, hits its memory limit or dies is killed and replaced, and the
+    caller gets a PdfExtractionError instead of a stalled or crashed request. So is a worker
+    whose batch is cancelled (`cancel` set) mid-document, so its CPU is freed at once.
+    Safe to call from many threads; at most `size` documents are extracted at once.
+    """
+
+    def __init__(self, size, timeout, memory_limit_mb, max_documents):
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        self.max_documents = max_documents
+        # spawn: never fork a process that is running threads and holds loaded models
+        self._context = multiprocessing.get_context("spawn")
+        self.size = size
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle = queue.LifoQueue()
+        self._workers = set()
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def start(self):
+        """Spawn every worker up front so the first requests do not pay for process start-up."""
+        for _ in range(self.size - self._idle.qsize()):
+            worker = PdfWorker(self._context, self.memory_limit_mb)
+            with self._lock:
+                self._workers.add(worker)
+            self._idle.put(worker)
+
+    def _acquire_worker(self):
+        try:
+            worker = self._idle.get_nowait()
+            if worker.alive():
+                return worker
+            self._discard(worker)
+        except queue.Empty:
+            pass
+        worker = PdfWorker(self._context, self.memory_limit_mb)
+        with self._lock:
+            self._workers.add(worker)
+        return worker
+
+    def _discard(self, worker):
+        worker.kill()
+        with self._lock:
+            self._workers.discard(worker)
+
+    def _release_worker(self, worker):
+        if self._closed or worker.documents >= self.max_documents or not worker.alive():
+            self._discard(worker)  # recycle
+        else:
+            self._idle.put(worker)
+
+    def extract_text(self, data, cancel=None):
+        """
+        Extract text from PDF bytes in a worker process. Raises PdfExtractionError.
+        `cancel` is the batch's threading.Event (or None).
+        """
+        if self._closed:
+            raise PdfExtractionError(CRASHED, "PDF worker pool is shut down")
+        with self._slots:
+            worker = self._acquire_worker()
+            try:
+                return worker.extract(data, self.timeout, cancel)
+            except PdfExtractionError as e:
+                if e.code != INVALID_PDF:
+                    level = logging.INFO if e.code == CANCELLED else logging.WARNING
+                    logger.log(level, "Killing PDF worker %s: %s", worker.process.pid, e)
+                    self._discard(worker)
+                    worker = None
+                raise
+            finally:
+                if worker is not None:
+                    self._release_worker(worker)
+
+    def close(self):
+        self._closed = True
+        with self._lock:
+            workers = list(self._workers)
+        for worker in workers:
+            self._discard(worker)
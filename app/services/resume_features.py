@@ -0,0 +1,116 @@
+# app/services/resume_features.py
+# Compact, stored form of everything scoring needs, so stored resumes can be re-scored
+# against any job without their PDF, pdfplumber or spaCy.
+import hashlib
+import math
+import struct
+import sys
+import zlib
+from array import array
+from collections import Counter, namedtuple
+from bson import Binary
+from app.services.skill_taxonomy import TAXONOMY
+
+# Bump when the encoding (or the tokenization behind term counts) changes
+FEATURES_VERSION = 1
+
+# Skill ids are positions in the sorted taxonomy, and which spellings are found inside phrases
+# decides the bits set, so masks are only valid for the same taxonomy and phrase terms
+TAXONOMY_FINGERPRINT = hashlib.sha1(
+    "\n".join(TAXONOMY.names + ["--"] + TAXONOMY.phrase_terms).encode()
+).hexdigest()[:12]
+
+# experience_years, salary_amount (NaN = unknown)
+NUMERIC_FORMAT = "<2d"
+
+# Decoded features: term counts, skill bitset, parsed skills and numeric fields
+ResumeFeatures = namedtuple(
+    "ResumeFeatures",
+    ["content_hash", "filename", "counts", "skill_mask", "skills", "experience_years", "salary_amount"]
+)
+
+# Everything decode_features needs (not the compressed text, the largest field)
+FEATURES_PROJECTION = {
+    "features.version": 1, "features.taxonomy": 1, "features.terms": 1, "features.counts": 1,
+    "features.skill_mask": 1, "features.numeric": 1
+}
+
+
+def _uint32_bytes(values):
+    counts = array("I", values)
+    if sys.byteorder == "big":
+        counts.byteswap()
+    return counts.tobytes()
+
+
+def _uint32_values(data):
+    counts = array("I")
+    counts.frombytes(data)
+    if sys.byteorder == "big":
+        counts.byteswap()
+    return counts
+
+
+def encode_counts(counts):
+    """Term counts as (sorted terms, one zlib-compressed string; counts, little-endian uint32)."""
+    terms = sorted(counts)
+    return (
+        Binary(zlib.compress("\n".join(terms).encode("utf-8"))),
+        Binary(_uint32_bytes(counts[t] for t in terms)),
+    )
+
+
+def decode_counts(terms, counts):
+    """Counter of term counts stored by encode_counts."""
+    terms = zlib.decompress(terms).decode("utf-8")
+    return Counter(dict(zip(terms.split("\n"), _uint32_values(counts)))) if terms else Counter()
+
+
+def _number(value):
+    return math.nan if value is None else float(value)
+
+
+def _optional(value):
+    return None if math.isnan(value) else value
+
+
+def encode_features(text, counts, skills, experience_years=None, salary_amount=None):
+    """
+    Stored features of a resume: zlib-compressed text, term counts (terms as one compressed
+    string, counts as little-endian uint32), the taxonomy skill bitset and packed numeric fields.
+    """
+    terms, counts = encode_counts(counts)
+    mask = TAXONOMY.skills_mask(skills)
+    return {
+        "version": FEATURES_VERSION,
+        "taxonomy": TAXONOMY_FINGERPRINT,
+        "text": Binary(zlib.compress(text.encode("utf-8"))),
+        "terms": terms,
+        "counts": counts,
+        "skill_mask": Binary(mask.to_bytes((mask.bit_length() + 7) // 8, "little")),
+        "numeric": Binary(struct.pack(NUMERIC_FORMAT, _number(experience_years), _number(salary_amount))),
+    }
+
+
+def decode_features(document):
+    """ResumeFeatures of a stored resume document, or None if it has no usable features."""
+    features = document.get("features")
+    if not features or features.get("version") != FEATURES_VERSION:
+        return None
+
+    counts = decode_counts(features["terms"], features["counts"])
+    skills = document.get("parsed_skills", [])
+    if features.get("taxonomy") == TAXONOMY_FINGERPRINT:
+        skill_mask = int.from_bytes(features["skill_mask"], "little")
+    else:
+        skill_mask = TAXONOMY.skills_mask(skills)  # taxonomy changed since the resume was stored
+    experience, salary = struct.unpack(NUMERIC_FORMAT, features["numeric"])
+    return ResumeFeatures(
+        document.get("content_hash"), document.get("filename"), counts, skill_mask, skills, _optional(experience), _optional(salary)
+    )
+
+
+def decode_text(document):
+    """Extracted text of a stored resume ("" if it was stored without features)."""
+    features = document.get("features") or {}
+    return zlib.decompress(features["text"]).decode("utf-8") if features.get("text") else ""
@@ -1,41 +1,19 @@
 # app/resume_parser.py
-import pdfplumber
 import re
 import spacy
+from app.services.pdf_workers import extract_text_from_pdf
+from app.services.section_segmenter import skills_section_text
+from app.services.field_scanner import scan_fields
 
 # Load spaCy model
 nlp = spacy.load("en_core_web_sm")
 
-# Regex patterns
-EXPERIENCE_REGEX = re.compile(r"(\d+(\.\d+)?)\s*(years?|yrs?|months?|mos?)", re.I)
-SALARY_REGEX = re.compile(r"(₹|\$)\s*\d+(,\d{3})*(\.\d+)?", re.I)
-
-# ----------------- Extract text -----------------
-def extract_text_from_pdf(file):
-    """
-    Extract text from a PDF file-like object
-    """
-    text = ""
-    with pdfplumber.open(file) as pdf:
-        for page in pdf.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text += page_text + "\n"
-    return text
+# Texts per spaCy batch when parsing many resumes at once
+SPACY_BATCH_SIZE = 32
 
 # ----------------- Extract skills from Required Skills section -----------------
-def extract_skills(text):
-    """
-    Extract only technical skills from the 'Required Skills' section using spaCy.
-    Stops before the next section heading.
-    Handles variations like 'Required Skills:', 'Required Skills & Tools:', 'Requirements:'
-    """
-    # 1️⃣ Extract Required Skills section (handles different headers)
-    skills_section_pattern = r"(Required Skills(?: & Tools)?|Requirements)\s*[:\-]?\s*(.*?)(?=\n[A-Z][A-Za-z\s&]*\n|\Z)"
-    match = re.search(skills_section_pattern, text, re.S | re.I)
-    skills_section = match.group(2) if match else text
-
-    doc = nlp(skills_section)
+def skills_from_doc(doc, skills_section):
+    """Technical skills from a spaCy doc of the skills section."""
     skills = set()
 
     # 2️⃣ Named Entities (tools, libraries, frameworks)
@@ -69,39 +47,43 @@ def extract_skills(text):
     # 6️⃣ Return sorted list
     return sorted(skills)
 
+def extract_skills(text, sections=None):
+    """
+    Extract only technical skills from the skills section using spaCy.
+    """
+    # 1️⃣ Skills section (falls back to the sections that usually mention skills)
+    skills_section = skills_section_text(text, sections)
+    return skills_from_doc(nlp(skills_section), skills_section)
+
 # ----------------- Extract education -----------------
-def extract_education(text):
+def extract_education(text, fields=None):
     """
     Dynamically detect education-related qualifications and institutions
     """
-    degree_pattern = r"(B\.?Tech|M\.?Tech|Bachelor|Master|MBA|Ph\.?D)"
-    institute_pattern = r"(University|College|Institute|School of [A-Za-z]+)"
-
-    degrees = re.findall(degree_pattern, text, re.I)
-    institutes = re.findall(institute_pattern, text, re.I)
-
+    if fields is None:
+        fields = scan_fields(text)
     return {
-        "degrees": list(set(degrees)),
-        "institutes": list(set(institutes))
+        "degrees": list({m.text for m in fields["degree"]}),
+        "institutes": list({m.text for m in fields["institute"]})
     }
 
 # ----------------- Extract experience -----------------
-def extract_experience(text):
+def extract_experience(text, fields=None):
     """
     Extract years/months of experience
     """
-    matches = EXPERIENCE_REGEX.findall(text)
-    experience_list = [match[0] + " " + match[2] for match in matches]
-    return experience_list
+    if fields is None:
+        fields = scan_fields(text)
+    return [m.text for m in fields["experience"]]
 
 # ----------------- Extract salary expectations -----------------
-def extract_salary_expectations(text):
+def extract_salary_expectations(text, fields=None):
     """
     Extract salary figures
     """
-    matches = SALARY_REGEX.findall(text)
-    salary_list = ["".join(match) for match in matches]
-    return salary_list
+    if fields is None:
+        fields = scan_fields(text)
+    return [m.text for m in fields["salary"]]
 
 # ----------------- Parse job post -----------------
 def parse_job_post(skills, experience, salary, education):
@@ -117,15 +99,35 @@ def parse_job_post(skills, experience, salary, education):
     }
 
 # ----------------- Parse resume -----------------
+def _parsed_fields(text, fields, skills):
+    return {
+        "parsed_skills": skills,
+        "parsed_education": extract_education(text, fields),
+        "parsed_experience": extract_experience(text, fields),
+        "parsed_salary": extract_salary_expectations(text, fields)
+    }
+
+def parse_resume_text(text):
+    """
+    Return structured details from already-extracted resume text
+    """
+    fields = scan_fields(text)  # one regex pass shared by every field extractor
+    return _parsed_fields(text, fields, extract_skills(text))
+
+def parse_resume_texts(texts, batch_size=SPACY_BATCH_SIZE):
+    """
+    parse_resume_text for many texts, with the skills sections run through spaCy in
+    batches (nlp.pipe) instead of one nlp() call per resume.
+    """
+    skills_sections = [skills_section_text(text) for text in texts]
+    docs = nlp.pipe(skills_sections, batch_size=batch_size)
+    return [
+        _parsed_fields(text, scan_fields(text), skills_from_doc(doc, skills_section))
+        for text, skills_section, doc in zip(texts, skills_sections, docs)
+    ]
+
 def parse_resume(file):
     """
     Main function to parse uploaded resume file and return structured details
     """
-    text = extract_text_from_pdf(file)
-    parsed_data = {
-        "parsed_skills": extract_skills(text),
-        "parsed_education": extract_education(text),
-        "parsed_experience": extract_experience(text),
-        "parsed_salary": extract_salary_expectations(text)
-    }
-    return parsed_data
+    return parse_resume_text(extract_text_from_pdf(file))
@@ -0,0 +1,181 @@
+# app/services/resume_store.py
+# Shape of stored resume documents, their indexes and the queries those indexes serve.
+import logging
+import re
+from datetime import datetime, timezone
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+from app.services.skill_taxonomy import TAXONOMY, normalize_skill
+from app.services.resume_features import FEATURES_PROJECTION, encode_features
+
+logger = logging.getLogger(__name__)
+
+# ---------------- Indexes ----------------
+RESUME_INDEXES = [
+    # One document per distinct PDF; lookups by hash are covered by this index
+    IndexModel([("content_hash", ASCENDING)], name="content_hash_unique", unique=True),
+    # Skill search (multikey), most experienced first
+    IndexModel([("skills_normalized", ASCENDING), ("experience_years", DESCENDING)], name="skills_experience"),
+    # Degree search, newest first (replaces the single-field "degrees" index, which can be dropped)
+    IndexModel([("degrees", ASCENDING), ("created_at", DESCENDING)], name="degrees_created_at"),
+    IndexModel([("experience_years", ASCENDING)], name="experience_years"),
+    IndexModel([("salary_amount", ASCENDING)], name="salary_amount"),
+    IndexModel([("created_at", DESCENDING)], name="created_at"),
+]
+
+MATCH_RESULT_INDEXES = [
+    IndexModel([("batch_id", ASCENDING)], name="batch_id"),
+]
+
+JOB_INDEXES = [
+    IndexModel([("created_at", DESCENDING)], name="created_at"),
+    IndexModel([("skills_normalized", ASCENDING)], name="skills_normalized"),
+]
+
+# Leaderboard order: best score first, ties broken by content hash, so "the top N" is one set
+LEADERBOARD_ORDER = [("score", DESCENDING), ("content_hash", ASCENDING)]
+LEADERBOARD_RANK_PROJECTION = {"score": 1, "content_hash": 1}
+
+
+def leaderboard_rank(entry):
+    """Sort key of a leaderboard entry in LEADERBOARD_ORDER: an entry ranks ahead of any with a larger key."""
+    return -entry["score"], entry["content_hash"]
+
+JOB_MATCH_INDEXES = [
+    # Leaderboard reads and trims: one job's entries in LEADERBOARD_ORDER
+    # (replaces the "job_score" index, which can be dropped)
+    IndexModel([("job_id", ASCENDING), *LEADERBOARD_ORDER], name="job_rank"),
+    IndexModel([("job_id", ASCENDING), ("content_hash", ASCENDING)], name="job_resume_unique", unique=True),
+]
+
+RESUME_FILE_INDEXES = [
+    # One stored PDF per content hash, even when the same new file is uploaded twice at once
+    # (replaces the non-unique "sha256" index, which can be dropped)
+    IndexModel([("metadata.sha256", ASCENDING)], name="sha256_unique", unique=True),
+]
+
+
+async def ensure_indexes(db, files_bucket="resume_files"):
+    """Create every index the app's queries rely on (no-op for indexes that already exist)."""
+    for collection, indexes in (
+        (db["resumes"], RESUME_INDEXES),
+        (db["match_results"], MATCH_RESULT_INDEXES),
+        (db["jobs"], JOB_INDEXES),
+        (db["job_matches"], JOB_MATCH_INDEXES),
+        (db[f"{files_bucket}.files"], RESUME_FILE_INDEXES),
+    ):
+        try:
+            await collection.create_indexes(indexes)
+        except OperationFailure as e:
+            # e.g. duplicate content hashes stored before the unique index existed
+            logger.error("Could not create indexes on %s: %s", collection.name, e)
+
+
+# ---------------- Normalized fields ----------------
+MONTH_UNITS = ("month", "mo")
+
+
+def normalize_degree(degree):
+    """"B.Tech" / "BTech" / "b.tech" -> "btech"."""
+    return re.sub(r"[^a-z]", "", degree.lower())
+
+
+def normalize_skills(skills):
+    """Lowercase skills plus every taxonomy skill they imply, for multikey skill search."""
+    normalized = {normalize_skill(s) for s in skills}
+    normalized.update(TAXONOMY.names_of(TAXONOMY.skills_mask(skills)))
+    return sorted(normalized)
+
+
+def canonical_skill(skill):
+    """Taxonomy name for known skills and aliases ("ML" -> "machine learning"), else the normalized skill."""
+    skill_id = TAXONOMY.skill_id(skill)
+    return TAXONOMY.names[skill_id] if skill_id is not None else normalize_skill(skill)
+
+
+def experience_years(experience):
+    """Largest experience figure in years ("6 months" -> 0.5), or None."""
+    years = []
+    for item in experience or []:
+        match = re.match(r"(\d+(?:\.\d+)?)\s*([a-z]+)", item.lower())
+        if match:
+            value, unit = float(match.group(1)), match.group(2)
+            years.append(value / 12 if unit.startswith(MONTH_UNITS) else value)
+    return max(years) if years else None
+
+
+def salary_amount(salaries):
+    """Largest salary figure, or None."""
+    amounts = [float(re.sub(r"[^\d.]", "", s)) for s in salaries or [] if re.search(r"\d", s)]
+    return max(amounts) if amounts else None
+
+
+def build_resume_document(filename, content_hash, parsed_resume, text=None, counts=None):
+    """
+    Resume document as stored: parsed fields plus normalized, indexable copies and, given the
+    extracted text and its term counts, the features needed to re-score it without the PDF.
+    """
+    education = parsed_resume.get("parsed_education") or {}
+    document = {
+        "content_hash": content_hash,
+        "filename": filename,
+        "parsed_skills": parsed_resume["parsed_skills"],
+        "parsed_education": parsed_resume["parsed_education"],
+        "parsed_experience": parsed_resume["parsed_experience"],
+        "parsed_salary": parsed_resume["parsed_salary"],
+        "skills_normalized": normalize_skills(parsed_resume["parsed_skills"]),
+        "degrees": sorted({normalize_degree(d) for d in education.get("degrees", [])}),
+        "experience_years": experience_years(parsed_resume["parsed_experience"]),
+        "salary_amount": salary_amount(parsed_resume["parsed_salary"]),
+        "created_at": datetime.now(timezone.utc),
+    }
+    if text is not None and counts is not None:
+        document["features"] = encode_features(
+            text, counts, parsed_resume["parsed_skills"], document["experience_years"], document["salary_amount"]
+        )
+    return document
+
+
+# ---------------- Hot queries ----------------
+# Only the indexed hash, so hash lookups are answered from content_hash_unique alone
+HASH_PROJECTION = {"_id": 0, "content_hash": 1}
+
+# Fields of a stored resume that let a repeat upload skip parsing
+STORED_PARSE_PROJECTION = {
+    "_id": 0, "content_hash": 1, "parsed_skills": 1, "parsed_education": 1,
+    "parsed_experience": 1, "parsed_salary": 1, **FEATURES_PROJECTION
+}
+
+# Fields returned by resume search
+SEARCH_PROJECTION = {
+    "_id": 0, "content_hash": 1, "filename": 1, "parsed_skills": 1, "degrees": 1,
+    "experience_years": 1, "salary_amount": 1
+}
+
+
+def known_hashes_query(hashes):
+    """(filter, projection) for which of `hashes` are stored; covered by content_hash_unique."""
+    return {"content_hash": {"$in": list(hashes)}}, HASH_PROJECTION
+
+
+def stored_parses_query(hashes):
+    """
+    (filter, projection) for the stored parses of `hashes`: content_hash_unique finds them, and
+    only those documents are fetched (parsed fields and features cannot be in an index).
+    """
+    return {"content_hash": {"$in": list(hashes)}}, STORED_PARSE_PROJECTION
+
+
+def search_query(skills=(), degree=None, min_experience=None, max_salary=None):
+    """(filter, sort) for resume search; served by the skills / degree / numeric indexes."""
+    query = {}
+    if skills:
+        query["skills_normalized"] = {"$all": [canonical_skill(s) for s in skills]}
+    if degree:
+        query["degrees"] = normalize_degree(degree)
+    if min_experience is not None:
+        query["experience_years"] = {"$gte": min_experience}
+    if max_salary is not None:
+        query["salary_amount"] = {"$lte": max_salary}
+    sort = [("experience_years", DESCENDING)] if skills else [("created_at", DESCENDING)]
+    return query, sort
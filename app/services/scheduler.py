@@ -0,0 +1,195 @@
+# app/services/scheduler.py
+# Priority classes for matching work: which requests are admitted, and in which order their
+# resumes get worker threads.
+import asyncio
+import itertools
+import queue
+import threading
+from collections import Counter, deque
+from concurrent.futures import Executor, Future
+
+# Priority classes; lower runs first
+INTERACTIVE = 0  # a recruiter waiting on a handful of resumes
+BULK = 1         # large uploads, archives, background batches and rescoring
+
+# Error codes (AdmissionRejected.code)
+CLIENT_LIMIT = "client_limit"  # the client already has too many requests in progress
+OVERLOADED = "overloaded"      # the queue of its class is full, or it waited too long there
+
+
+class AdmissionRejected(Exception):
+    """A request was turned away; `retry_after` is the number of seconds the client should wait."""
+
+    def __init__(self, code, message, retry_after):
+        super().__init__(message)
+        self.code = code
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Admits requests by priority class. At most `max_active` run at once and at most
+    `bulk_max_active` of those are BULK, so the remaining slots are always free for
+    interactive requests. Requests beyond that wait in a FIFO queue per class, bounded
+    to `max_queued` and served INTERACTIVE first, for at most `queue_timeout` seconds.
+    A client may have `client_max_active` requests running or queued. A request that cannot
+    be admitted is rejected at once instead of waiting without limit.
+    """
+
+    def __init__(self, max_active, bulk_max_active, max_queued, queue_timeout, client_max_active, retry_after):
+        self.max_active = max_active
+        self.bulk_max_active = bulk_max_active
+        self.max_queued = max_queued
+        self.queue_timeout = queue_timeout
+        self.client_max_active = client_max_active
+        self.retry_after = retry_after
+        self._active = {INTERACTIVE: 0, BULK: 0}
+        self._waiting = {INTERACTIVE: deque(), BULK: deque()}
+        self._clients = Counter()
+
+        # Metrics
+        self.admitted = Counter()
+        self.rejected = Counter()
+
+    def _has_room(self, priority):
+        if sum(self._active.values()) >= self.max_active:
+            return False
+        return priority == INTERACTIVE or self._active[BULK] < self.bulk_max_active
+
+    def _reject(self, code, message):
+        self.rejected[code] += 1
+        return AdmissionRejected(code, message, self.retry_after)
+
+    async def acquire(self, client, priority):
+        """Wait for a slot of `priority` for `client`; raises AdmissionRejected when there is none."""
+        if self._clients[client] >= self.client_max_active:
+            raise self._reject(CLIENT_LIMIT, f"At most {self.client_max_active} requests in progress per client")
+        waiting = self._waiting[priority]
+        if not (self._has_room(priority) and not waiting) and len(waiting) >= self.max_queued:
+            raise self._reject(OVERLOADED, "Server is busy; try again later")
+
+        self._clients[client] += 1
+        if self._has_room(priority) and not waiting:
+            self._active[priority] += 1
+        else:
+            waiter = asyncio.get_running_loop().create_future()
+            waiting.append(waiter)
+            try:
+                await asyncio.wait_for(waiter, self.queue_timeout)
+            except BaseException as e:
+                if waiter.done() and not waiter.cancelled():
+                    # A slot was handed over just as the wait ended
+                    self.release(client, priority)
+                else:
+                    if waiter in waiting:
+                        waiting.remove(waiter)
+                    self._release_client(client)
+                if isinstance(e, asyncio.TimeoutError):
+                    raise self._reject(OVERLOADED, "Server is busy; try again later")
+                raise
+        self.admitted[priority] += 1
+
+    def release(self, client, priority):
+        self._active[priority] -= 1
+        self._release_client(client)
+        for waiting_class in (INTERACTIVE, BULK):
+            waiting = self._waiting[waiting_class]
+            while waiting and self._has_room(waiting_class):
+                waiter = waiting.popleft()
+                if not waiter.done():  # skips waits that just timed out or were cancelled
+                    self._active[waiting_class] += 1
+                    waiter.set_result(None)
+
+    def _release_client(self, client):
+        self._clients[client] -= 1
+        if not self._clients[client]:
+            del self._clients[client]
+
+    def metrics(self):
+        return {
+            "active": {"interactive": self._active[INTERACTIVE], "bulk": self._active[BULK]},
+            "queued": {"interactive": len(self._waiting[INTERACTIVE]), "bulk": len(self._waiting[BULK])},
+            "admitted": {"interactive": self.admitted[INTERACTIVE], "bulk": self.admitted[BULK]},
+            "rejected": dict(self.rejected),
+        }
+
+
+class PriorityExecutor(Executor):
+    """
+    Thread pool whose queued work runs by priority class, then in submission order, so the
+    resumes of an interactive request overtake those of a bulk upload queued before it.
+    `submit` queues at INTERACTIVE; `with_priority(BULK)` is an executor that queues at BULK.
+    """
+
+    def __init__(self, max_workers, thread_name_prefix=""):
+        self.max_workers = max_workers
+        self.thread_name_prefix = thread_name_prefix
+        self._queue = queue.PriorityQueue()
+        self._order = itertools.count()
+        self._threads = []
+        self._lock = threading.Lock()
+        self._shutdown = False
+
+    def submit(self, fn, /, *args, **kwargs):
+        return self._submit(INTERACTIVE, fn, args, kwargs)
+
+    def with_priority(self, priority):
+        return _PriorityView(self, priority)
+
+    def _submit(self, priority, fn, args, kwargs):
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+            future = Future()
+            self._queue.put((priority, next(self._order), future, fn, args, kwargs))
+            if len(self._threads) < self.max_workers:
+                thread = threading.Thread(
+                    target=self._work, name=f"{self.thread_name_prefix}_{len(self._threads)}", daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+            return future
+
+    def _work(self):
+        while True:
+            _, _, future, fn, args, kwargs = self._queue.get()
+            if future is None:
+                return
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        with self._lock:
+            self._shutdown = True
+            if cancel_futures:
+                while True:
+                    try:
+                        work = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if work[2] is not None:
+                        work[2].cancel()
+            # Stop markers sort after all remaining work
+            for _ in self._threads:
+                self._queue.put((float("inf"), next(self._order), None, None, None, None))
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+
+class _PriorityView(Executor):
+    def __init__(self, executor, priority):
+        self._executor = executor
+        self._priority = priority
+
+    def submit(self, fn, /, *args, **kwargs):
+        return self._executor._submit(self._priority, fn, args, kwargs)
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        self._executor.shutdown(wait, cancel_futures=cancel_futures)
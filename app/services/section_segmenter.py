@@ -0,0 +1,143 @@
+# app/services/section_segmenter.py
+import re
+from collections import namedtuple
+from itertools import groupby
+from app.services.skill_taxonomy import TAXONOMY
+
+# Section name -> headings that open it (compared lowercase, without trailing ":" / "-")
+SECTION_HEADINGS = {
+    "summary": ["summary", "professional summary", "profile", "objective", "career objective", "about me"],
+    "skills": [
+        "skills", "technical skills", "key skills", "core skills", "skills & tools", "skill set",
+        "required skills", "required skills & tools", "requirements", "core competencies",
+        "technologies", "tools & technologies",
+    ],
+    "experience": [
+        "experience", "work experience", "professional experience", "employment history",
+        "work history", "internships", "internship", "employment",
+    ],
+    "education": ["education", "academic background", "academics", "educational qualifications", "qualifications"],
+    "projects": ["projects", "academic projects", "personal projects", "key projects"],
+    "certifications": ["certifications", "certificates", "courses", "licenses & certifications"],
+    "achievements": ["achievements", "awards", "honors", "accomplishments"],
+    "languages": ["languages"],
+    "interests": ["interests", "hobbies"],
+    "volunteering": ["volunteering", "volunteer experience", "volunteer work"],
+    "publications": ["publications"],
+    "references": ["references"],
+    "contact": ["contact", "contact information", "personal details"],
+}
+
+HEADING_LOOKUP = {heading: name for name, headings in SECTION_HEADINGS.items() for heading in headings}
+
+# Headings that, inside a skills section, name a group of skills ("Languages:" above "Python, Java")
+SKILLS_SUBHEADINGS = {"languages"}
+
+# Sections searched for skills when a resume has no skills heading
+SKILL_FALLBACK_SECTIONS = ("summary", "projects", "experience")
+
+# Most characters of skills text sent to spaCy, whichever section it comes from. Inline skills
+# labels and lines naming a known skill are only looked for in the first SKILL_SCAN_CHARS
+SKILL_TEXT_CHARS = 5_000
+SKILL_SCAN_CHARS = 5_000
+
+
+def _words(heading):
+    return r"[ \t]+".join(re.escape(word) for word in heading.split())
+
+
+def _known_headings():
+    # Grouped by first letter, so a line is compared with a handful of headings, not all of them
+    groups = groupby(sorted(HEADING_LOOKUP), key=lambda heading: heading[0])
+    return "|".join(
+        re.escape(first) + "(?:" + "|".join(_words(h[1:]) for h in sorted(headings, key=len, reverse=True)) + ")"
+        for first, headings in groups
+    )
+
+
+# One compiled pattern finds the heading lines, and nothing else, in a single finditer: a known
+# heading (any case and spacing) alone on its line, optionally followed by ":" or a dash.
+# Other "Label:" lines ("Frameworks:", "Key Responsibilities:") and headings followed by text on
+# the same line ("Technologies: Python, AWS") are labels inside the section they sit in.
+# The pattern starts with a literal newline, so the regex engine jumps from line start to line
+# start, and ordinary lines are rejected inside the engine rather than by Python code.
+HEADING_REGEX = re.compile(
+    r"\n[ \t•*#\-–—]*(?P<heading>" + _known_headings() + r")[ \t]*[:\-–—]?[ \t]*\r?$",
+    re.M | re.I,
+)
+
+# A skills heading with the skills after it on the same line ("Technical Skills: Python, SQL")
+INLINE_SKILLS_REGEX = re.compile(
+    r"\n[ \t•*#\-–—]*(?:" + "|".join(_words(h) for h in SECTION_HEADINGS["skills"]) + r")"
+    r"[ \t]*[:\-–—][ \t]*(?P<skills>[^\n]*[^\s])",
+    re.I,
+)
+
+Section = namedtuple("Section", ["name", "start", "end"])
+
+
+def segment_sections(text):
+    """
+    Split resume text into named sections in a single linear scan.
+    Returns a list of Section(name, start, end) spans into `text`, in document order.
+    Text before the first heading is reported as the "header" section.
+    """
+    sections = []
+    name, start = "header", 0
+    # Scan with a leading newline so the first line is a line start too; offsets shift by one
+    for match in HEADING_REGEX.finditer("\n" + text):
+        heading = HEADING_LOOKUP[" ".join(match.group("heading").lower().split())]
+        if heading in SKILLS_SUBHEADINGS and name == "skills":
+            continue
+        line_start = match.start()  # the newline sits at text offset match.start() - 1
+        if line_start > start:
+            sections.append(Section(name, start, line_start))
+        name, start = heading, match.end() - 1
+    if len(text) > start:
+        sections.append(Section(name, start, len(text)))
+    return sections
+
+
+def section_text(text, sections, *names):
+    """Concatenate the text of every section with one of the given names ("" if none)."""
+    return "\n".join(text[s.start:s.end] for s in sections if s.name in names).strip()
+
+
+def inline_skills(text):
+    """The skills after inline skills headings ("Technical Skills: Python, SQL") near the top of `text`."""
+    return "\n".join(m.group("skills") for m in INLINE_SKILLS_REGEX.finditer("\n" + text[:SKILL_SCAN_CHARS]))
+
+
+def skill_lines(text):
+    """Lines naming a known skill near the top of `text`; the top of `text` if there are none."""
+    head = text[:SKILL_SCAN_CHARS]
+    lines, size, line_end = [], 0, -1
+    for match in TAXONOMY.term_regex.finditer(head):
+        if match.start() < line_end:
+            continue  # another skill on a line already taken
+        line_start = head.rfind("\n", 0, match.start()) + 1
+        line_end = head.find("\n", match.end())
+        if line_end == -1:
+            line_end = len(head)
+        lines.append(head[line_start:line_end])
+        size += line_end - line_start + 1
+        if size >= SKILL_TEXT_CHARS:
+            break
+    return "\n".join(lines) or text[:SKILL_TEXT_CHARS]
+
+
+def skills_section_text(text, sections=None):
+    """
+    Skills section (so it stops at the next heading), falling back to inline skills headings,
+    then to the sections that usually mention skills, then to the lines that name a known skill.
+    Handles variations like 'Required Skills:', 'Required Skills & Tools:', 'Requirements:'
+    At most SKILL_TEXT_CHARS characters are returned.
+    """
+    if sections is None:
+        sections = segment_sections(text)
+    return (
+        section_text(text, sections, "skills")
+        or inline_skills(text)
+        or section_text(text, sections, *SKILL_FALLBACK_SECTIONS)
+        or skill_lines(text)
+    )[:SKILL_TEXT_CHARS]
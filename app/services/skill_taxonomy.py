@@ -0,0 +1,218 @@
+# app/services/skill_taxonomy.py
+import re
+from itertools import groupby
+
+# Canonical skill -> aliases and parent skills.
+# A resume listing a child skill (e.g. "Django") is credited for its parents ("Python").
+SKILL_TAXONOMY = {
+    # Languages
+    "python": {"aliases": ["py", "python3"], "parents": ["programming"]},
+    "java": {"aliases": ["core java"], "parents": ["programming"]},
+    "javascript": {"aliases": ["js", "ecmascript"], "parents": ["programming", "web development"]},
+    "typescript": {"aliases": [], "parents": ["javascript"]},
+    "c++": {"aliases": ["cpp"], "parents": ["programming"]},
+    "c#": {"aliases": ["csharp"], "parents": ["programming"]},
+    "go": {"aliases": ["golang"], "parents": ["programming"]},
+    "sql": {"aliases": ["structured query language"], "parents": ["databases"]},
+    "html": {"aliases": ["html5"], "parents": ["web development"]},
+    "css": {"aliases": ["css3"], "parents": ["web development"]},
+    "programming": {"aliases": ["coding", "software development"], "parents": []},
+
+    # Python ecosystem
+    "django": {"aliases": [], "parents": ["python", "backend development"]},
+    "flask": {"aliases": [], "parents": ["python", "backend development"]},
+    "fastapi": {"aliases": [], "parents": ["python", "backend development"]},
+    "pandas": {"aliases": [], "parents": ["python", "data analysis"]},
+    "numpy": {"aliases": [], "parents": ["python", "data analysis"]},
+    "scikit-learn": {"aliases": ["sklearn", "scikit learn"], "parents": ["python", "machine learning"]},
+    "tensorflow": {"aliases": [], "parents": ["deep learning"]},
+    "keras": {"aliases": [], "parents": ["deep learning"]},
+    "pytorch": {"aliases": ["torch"], "parents": ["deep learning"]},
+
+    # JavaScript ecosystem
+    "react": {"aliases": ["reactjs", "react.js"], "parents": ["javascript", "frontend development"]},
+    "angular": {"aliases": ["angularjs"], "parents": ["typescript", "frontend development"]},
+    "vue": {"aliases": ["vuejs", "vue.js"], "parents": ["javascript", "frontend development"]},
+    "node.js": {"aliases": ["node", "nodejs"], "parents": ["javascript", "backend development"]},
+    "express": {"aliases": ["expressjs", "express.js"], "parents": ["node.js"]},
+
+    # Java ecosystem
+    "spring": {"aliases": ["spring boot", "springboot"], "parents": ["java", "backend development"]},
+
+    # Databases
+    "mysql": {"aliases": [], "parents": ["sql"]},
+    "postgresql": {"aliases": ["postgres"], "parents": ["sql"]},
+    "mongodb": {"aliases": ["mongo"], "parents": ["nosql"]},
+    "nosql": {"aliases": [], "parents": ["databases"]},
+    "databases": {"aliases": ["database", "dbms"], "parents": []},
+
+    # Data / ML
+    "machine learning": {"aliases": ["ml"], "parents": ["artificial intelligence"]},
+    "deep learning": {"aliases": ["neural networks"], "parents": ["machine learning"]},
+    "natural language processing": {"aliases": ["nlp"], "parents": ["machine learning"]},
+    "computer vision": {"aliases": ["opencv"], "parents": ["deep learning"]},
+    "artificial intelligence": {"aliases": ["ai"], "parents": []},
+    "data analysis": {"aliases": ["data analytics"], "parents": []},
+
+    # Web
+    "web development": {"aliases": ["web dev"], "parents": []},
+    "frontend development": {"aliases": ["front-end", "frontend"], "parents": ["web development"]},
+    "backend development": {"aliases": ["back-end", "backend"], "parents": ["web development"]},
+
+    # Cloud / DevOps
+    "aws": {"aliases": ["amazon web services"], "parents": ["cloud computing"]},
+    "azure": {"aliases": ["microsoft azure"], "parents": ["cloud computing"]},
+    "gcp": {"aliases": ["google cloud", "google cloud platform"], "parents": ["cloud computing"]},
+    "cloud computing": {"aliases": ["cloud"], "parents": []},
+    "docker": {"aliases": [], "parents": ["devops"]},
+    "kubernetes": {"aliases": ["k8s"], "parents": ["devops"]},
+    "devops": {"aliases": [], "parents": []},
+    "git": {"aliases": ["github", "gitlab"], "parents": []},
+}
+
+
+# Spellings that are also everyday words ("a go-getter", "Spring 2021", "Express delivery").
+# They count when they are a whole parsed skill, never when found inside a longer phrase.
+AMBIGUOUS_TERMS = {
+    "go", "spring", "express", "node", "react", "angular", "flask", "cloud", "torch", "mongo",
+    "coding", "backend", "frontend", "back-end", "front-end",
+}
+
+# Shorter spellings ("ai", "js", "ml") are only matched as whole parsed skills
+MIN_PHRASE_TERM_LENGTH = 3
+
+
+def normalize_skill(skill):
+    """Lowercase and collapse whitespace so lookups are spelling-insensitive."""
+    return " ".join(str(skill).lower().split())
+
+
+class SkillTaxonomy:
+    """
+    Skill taxonomy with aliases and parent/child relationships.
+    The transitive closure is precomputed into integer bitsets (bit i = skill id i),
+    so expanding and matching skills is a few bitwise operations.
+    """
+
+    def __init__(self, taxonomy):
+        self.names = sorted(taxonomy)
+        self.ids = {name: i for i, name in enumerate(self.names)}
+
+        # Alias / canonical spelling -> skill id
+        self.lookup = {}
+        for name, entry in taxonomy.items():
+            self.lookup[normalize_skill(name)] = self.ids[name]
+            for alias in entry.get("aliases", []):
+                self.lookup[normalize_skill(alias)] = self.ids[name]
+
+        # ancestors[i]: bitset of skill i and every skill it implies
+        parents = [[self.ids[p] for p in taxonomy[name].get("parents", [])] for name in self.names]
+        self.ancestors = [0] * len(self.names)
+        for i in range(len(self.names)):
+            self._close(i, parents, set())
+
+        # descendants[i]: bitset of skill i and every skill that implies it
+        self.descendants = [0] * len(self.names)
+        for i, mask in enumerate(self.ancestors):
+            for j in self._bits(mask):
+                self.descendants[j] |= 1 << i
+
+        # Terms of each skill (canonical name + aliases), used for TF-IDF boosting
+        self.terms = [set() for _ in self.names]
+        for term, i in self.lookup.items():
+            self.terms[i].add(term)
+
+        # One pass over a free-text phrase finds the unambiguous terms in it, longest spelling first
+        self.phrase_terms = sorted(
+            (t for t in self.lookup if len(t) >= MIN_PHRASE_TERM_LENGTH and t not in AMBIGUOUS_TERMS),
+            key=len, reverse=True,
+        )
+        # Grouped by first character, so a word start is compared with a handful of terms, not all of them
+        groups = groupby(sorted(self.phrase_terms, key=lambda t: (t[0], -len(t))), key=lambda t: t[0])
+        alternation = "|".join(
+            "(?=" + re.escape(first) + ")(?:" + "|".join(re.escape(t) for t in terms) + ")" for first, terms in groups
+        )
+        self.term_regex = re.compile(r"(?<![\w+#.])(" + alternation + r")(?![\w+#])", re.I)
+
+    def _close(self, i, parents, visiting):
+        if self.ancestors[i]:
+            return self.ancestors[i]
+        if i in visiting:
+            return 1 << i  # cycle guard
+        visiting.add(i)
+        mask = 1 << i
+        for p in parents[i]:
+            mask |= self._close(p, parents, visiting)
+        visiting.discard(i)
+        self.ancestors[i] = mask
+        return mask
+
+    @staticmethod
+    def _bits(mask):
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
+
+    def names_of(self, mask):
+        """Canonical names of the skills in a bitset."""
+        return [self.names[i] for i in self._bits(mask)]
+
+    def skill_id(self, skill):
+        """Return the id of a skill or alias, or None if it is not in the taxonomy."""
+        return self.lookup.get(normalize_skill(skill))
+
+    def find_ids(self, text):
+        """Ids of the unambiguous taxonomy terms occurring in a free-text phrase."""
+        return {self.lookup[term] for term in self.find_terms(text)}
+
+    def find_terms(self, text):
+        return {normalize_skill(match.group(1)) for match in self.term_regex.finditer(text)}
+
+    def skill_terms(self, skill):
+        """
+        Taxonomy spellings a parsed skill stands for: the whole string if it is one,
+        otherwise the unambiguous terms inside it (parsed skills include spaCy noun chunks).
+        """
+        term = normalize_skill(skill)
+        if term in self.lookup:
+            return {term}
+        return self.find_terms(skill)
+
+    def skills_mask(self, skills):
+        """Bitset of the given skills plus everything they imply (e.g. Django -> Python)."""
+        mask = 0
+        for skill in skills:
+            for term in self.skill_terms(skill):
+                mask |= self.ancestors[self.lookup[term]]
+        return mask
+
+    def expand(self, skills):
+        """Bitset of the given skills plus every child skill that satisfies them."""
+        mask = 0
+        for skill in skills:
+            i = self.skill_id(skill)
+            if i is not None:
+                mask |= self.descendants[i]
+        return mask
+
+    def expand_terms(self, skills):
+        """All spellings (lowercase) that satisfy the given skills, including the skills themselves."""
+        terms = {normalize_skill(s) for s in skills}
+        for i in self._bits(self.expand(skills)):
+            terms |= self.terms[i]
+        return terms
+
+    def credited_terms(self, resume_skills, job_skills):
+        """Spellings from the resume that satisfy a job skill through an alias or child skill."""
+        wanted = self.expand(job_skills)
+        credited = set()
+        for skill in resume_skills:
+            for term in self.skill_terms(skill):
+                if wanted >> self.lookup[term] & 1:
+                    credited.add(term)
+        return credited - {normalize_skill(s) for s in job_skills}
+
+
+# Loaded once at import and shared by every request
+TAXONOMY = SkillTaxonomy(SKILL_TAXONOMY)
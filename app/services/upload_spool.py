@@ -0,0 +1,118 @@
+# app/services/upload_spool.py
+# Uploaded PDFs read where the form parser spooled them (hashed in place, memory-mapped)
+# instead of being copied again.
+import asyncio
+import hashlib
+import mmap
+import os
+from collections import namedtuple
+
+# Bytes read from an upload per write to its spool file
+SPOOL_CHUNK_BYTES = 1024 * 1024
+
+# An upload on disk: `data` is a read-only memory map of it (bytes for a file the form
+# parser kept in memory, b"" for an empty one)
+SpooledUpload = namedtuple("SpooledUpload", ["filename", "content_hash", "size", "data"])
+
+
+class UploadLimitError(Exception):
+    """An upload exceeded the per-file, per-request or file-count limit."""
+
+
+def map_file(f):
+    """Read-only memory map of an open file; pages are loaded on demand and shared with the page cache."""
+    if os.fstat(f.fileno()).st_size == 0:
+        return b""
+    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def map_path(path):
+    with open(path, "rb") as f:
+        return map_file(f)
+
+
+def upload_data(upload):
+    """
+    Contents of a parsed UploadFile without copying it: the bytes of a small file the form
+    parser kept in memory, else a memory map of the temporary file it spooled to. The map
+    stays valid after the UploadFile is closed.
+    """
+    f = upload.file
+    if not getattr(f, "_rolled", True):  # SpooledTemporaryFile still in memory
+        f.seek(0)
+        return f.read()
+    return map_file(f)
+
+
+class UploadSpool:
+    """
+    Reads the files of one request where the form parser spooled them, hashing each in place,
+    and enforces `max_files`, `max_file_bytes` per file and `max_request_bytes` over all of them.
+    (RequestSizeLimit already stops a body over the request limit while it is being received.)
+    """
+
+    def __init__(self, max_file_bytes, max_request_bytes, max_files):
+        self.max_file_bytes = max_file_bytes
+        self.max_request_bytes = max_request_bytes
+        self.max_files = max_files
+
+    def check_count(self, uploads):
+        if len(uploads) > self.max_files:
+            raise UploadLimitError(f"At most {self.max_files} files per request ({len(uploads)} sent)")
+
+    def check_size(self, filename, size, request_bytes):
+        if size > self.max_file_bytes:
+            raise UploadLimitError(f"{filename} is larger than {self.max_file_bytes} bytes")
+        if request_bytes + size > self.max_request_bytes:
+            raise UploadLimitError(f"Upload is larger than {self.max_request_bytes} bytes")
+
+    async def spool(self, uploads):
+        """SpooledUploads for a request's UploadFiles; nothing is copied."""
+        self.check_count(uploads)
+        total = 0
+        for upload in uploads:
+            self.check_size(upload.filename, upload.size, total)
+            total += upload.size
+        return [await asyncio.to_thread(self._map, upload) for upload in uploads]
+
+    @staticmethod
+    def _map(upload):
+        data = upload_data(upload)
+        return SpooledUpload(upload.filename, hashlib.sha256(data).hexdigest(), len(data), data)
+
+    async def spool_file(self, upload):
+        """One upload as an open file of its own, for readers that need a real file (zipfile)."""
+        self.check_count([upload])
+        self.check_size(upload.filename, upload.size, 0)
+
+        def reopen():
+            # fileno() moves a file still held in memory to disk; the duplicate descriptor
+            # outlives the UploadFile
+            f = os.fdopen(os.dup(upload.file.fileno()), "rb")
+            f.seek(0)
+            return f
+
+        return await asyncio.to_thread(reopen)
+
+    async def spool_to(self, uploads, directory):
+        """Copy a request's UploadFiles to `directory` as 000000.pdf, ...; returns (path, hash) per file."""
+        self.check_count(uploads)
+        await asyncio.to_thread(os.makedirs, directory, exist_ok=True)
+        spooled, total = [], 0
+        for index, upload in enumerate(uploads):
+            path = os.path.join(directory, f"{index:06d}.pdf")
+            with open(path, "wb") as f:
+                sha256, size = await self._copy(upload, f, total)
+            spooled.append((path, sha256))
+            total += size
+        return spooled
+
+    async def _copy(self, upload, f, request_bytes):
+        digest, size = hashlib.sha256(), 0
+        while chunk := await upload.read(SPOOL_CHUNK_BYTES):
+            size += len(chunk)
+            self.check_size(upload.filename, size, request_bytes)
+            digest.update(chunk)
+            await asyncio.to_thread(f.write, chunk)
+        await asyncio.to_thread(f.flush)
+        return digest.hexdigest(), size
@@ -0,0 +1,141 @@
+# app/services/write_behind.py
+import asyncio
+import logging
+import time
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, PyMongoError
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+DUPLICATE_KEY = 11000
+
+
+class WriteBehindQueue:
+    """
+    Buffers documents and writes them with unordered insert_many, so request handlers
+    never wait on a MongoDB round trip per document. With `upsert_key`, documents are
+    written with an unordered bulk_write of insert-if-absent upserts on that field instead.
+
+    A batch is flushed when it reaches `batch_size` documents or its oldest document has
+    waited `flush_interval` seconds. At most `max_pending` documents are buffered; `put`
+    waits for room when the buffer is full (backpressure). `stop` flushes everything left.
+    """
+
+    def __init__(self, get_collection, batch_size, flush_interval, max_pending, retries, upsert_key=None):
+        self.get_collection = get_collection
+        self.upsert_key = upsert_key
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retries = retries
+        self._queue = asyncio.Queue(maxsize=max_pending)
+        self._task = None
+
+        # Metrics
+        self.documents_written = 0
+        self.documents_failed = 0
+        self.flushes = 0
+        self.flush_seconds_total = 0.0
+        self.flush_seconds_max = 0.0
+        self.last_flush_seconds = 0.0
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def put(self, document):
+        """Queue a document for insertion; waits while the buffer is full."""
+        await self._queue.put(document)
+
+    async def stop(self):
+        """Flush every buffered document and stop the writer."""
+        if self._task is None:
+            return
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            document = await self._queue.get()
+            if document is _STOP:
+                break
+
+            batch = [document]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    document = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if document is _STOP:
+                    stopping = True
+                    break
+                batch.append(document)
+
+            await self._flush(batch)
+
+    async def _flush(self, batch):
+        start = time.perf_counter()
+        for attempt in range(1, self.retries + 1):
+            try:
+                await self._write(batch)
+                self.documents_written += len(batch)
+                break
+            except BulkWriteError as e:
+                # Unordered: everything except the failed documents was written. With upserts, a
+                # duplicate key means a concurrent writer inserted the same document first.
+                errors = e.details.get("writeErrors", [])
+                failed = [err for err in errors if not (self.upsert_key and err.get("code") == DUPLICATE_KEY)]
+                self.documents_written += len(batch) - len(failed)
+                self.documents_failed += len(failed)
+                if failed:
+                    logger.warning("Write-behind flush: %s of %s documents failed", len(failed), len(batch))
+                break
+            except PyMongoError as e:
+                if attempt == self.retries:
+                    self.documents_failed += len(batch)
+                    logger.error("Write-behind flush dropped %s documents after %s attempts: %s", len(batch), attempt, e)
+                else:
+                    await asyncio.sleep(0.1 * 2 ** attempt)
+            except Exception:
+                # Not a database error (e.g. an unencodable document): retrying will not help,
+                # and the writer task must keep running
+                self.documents_failed += len(batch)
+                logger.exception("Write-behind flush dropped %s documents", len(batch))
+                break
+
+        elapsed = time.perf_counter() - start
+        self.flushes += 1
+        self.flush_seconds_total += elapsed
+        self.flush_seconds_max = max(self.flush_seconds_max, elapsed)
+        self.last_flush_seconds = elapsed
+
+    async def _write(self, batch):
+        collection = self.get_collection()
+        if self.upsert_key is None:
+            await collection.insert_many(batch, ordered=False)
+        else:
+            await collection.bulk_write(
+                [UpdateOne({self.upsert_key: doc[self.upsert_key]}, {"$setOnInsert": doc}, upsert=True) for doc in batch],
+                ordered=False,
+            )
+
+    def metrics(self):
+        return {
+            "queue_depth": self._queue.qsize(),
+            "queue_capacity": self._queue.maxsize,
+            "documents_written": self.documents_written,
+            "documents_failed": self.documents_failed,
+            "flushes": self.flushes,
+            "flush_latency_ms": {
+                "last": round(self.last_flush_seconds * 1000, 2),
+                "avg": round(self.flush_seconds_total / self.flushes * 1000, 2) if self.flushes else 0.0,
+                "max": round(self.flush_seconds_max * 1000, 2),
+            },
+        }
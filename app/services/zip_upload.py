@@ -0,0 +1,92 @@
+# app/services/zip_upload.py
+# PDFs read one by one out of an uploaded ZIP archive, with zip-bomb limits.
+import threading
+import zipfile
+from app.services.upload_spool import SPOOL_CHUNK_BYTES, UploadLimitError
+
+
+class ZipMember:
+    """
+    A PDF inside the archive; `content_hash` and `data` are set once it has been decompressed.
+    `filename` keeps the member's folders, so a/cv.pdf and b/cv.pdf stay two candidates.
+    """
+
+    def __init__(self, info):
+        self.info = info
+        self.filename = info.filename.lstrip("/")
+        self.content_hash = None
+        self.data = b""
+
+
+def open_archive(f):
+    """ZipFile over the spooled archive; raises zipfile.BadZipFile if it is not one."""
+    return zipfile.ZipFile(f)
+
+
+def pdf_members(archive, max_files, max_file_bytes, max_total_bytes, max_ratio):
+    """
+    The archive's PDF members, in archive order, checked against the limits using the sizes
+    its directory declares. read_member enforces them again on the bytes actually inflated.
+    """
+    members = [
+        ZipMember(info) for info in archive.infolist()
+        if not info.is_dir()
+        and info.filename.lower().endswith(".pdf")
+        and not info.filename.startswith("__MACOSX/")
+    ]
+    if len(members) > max_files:
+        raise UploadLimitError(f"At most {max_files} PDFs per archive ({len(members)} found)")
+    total = 0
+    for member in members:
+        info = member.info
+        if info.file_size > max_file_bytes:
+            raise UploadLimitError(f"{info.filename} is larger than {max_file_bytes} bytes")
+        if info.file_size > max(info.compress_size, 1) * max_ratio:
+            raise UploadLimitError(f"{info.filename} is compressed more than {max_ratio}:1")
+        total += info.file_size
+        if total > max_total_bytes:
+            raise UploadLimitError(f"Archive contents are larger than {max_total_bytes} bytes")
+    return members
+
+
+def read_member(archive, member, max_ratio):
+    """
+    Decompress one member in chunks, stopping as soon as it inflates past its declared size
+    (which pdf_members already checked) or the allowed ratio. zipfile itself never inflates
+    past the declared size: a member whose data is larger fails its CRC check (BadZipFile).
+    Safe to call from several threads.
+    """
+    info = member.info
+    limit = min(info.file_size, max(info.compress_size, 1) * max_ratio)
+    chunks, size = [], 0
+    with archive.open(info) as f:
+        while chunk := f.read(SPOOL_CHUNK_BYTES):
+            size += len(chunk)
+            if size > limit:
+                raise UploadLimitError(f"{info.filename} inflates past its declared size")
+            chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def close_after(items, files):
+    """Close `files` once no item of the batch can still read them (late items run on after the response)."""
+    running = [item.future for item in items if item.future is not None and not item.future.done()]
+    remaining = len(running)
+    lock = threading.Lock()
+
+    def close_files():
+        for f in files:
+            f.close()
+
+    def item_done(_):
+        nonlocal remaining
+        with lock:
+            remaining -= 1
+            last = remaining == 0
+        if last:
+            close_files()
+
+    if not running:
+        close_files()
+    for future in running:
+        future.add_done_callback(item_done)
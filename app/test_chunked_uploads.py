@@ -0,0 +1,118 @@
+# Run with: python -m pytest app/test_chunked_uploads.py
+import hashlib
+import os
+import time
+import pytest
+from app.services.chunked_uploads import (
+    CHECKSUM_MISMATCH, INCOMPLETE, NOT_FOUND, OFFSET_MISMATCH, TOO_LARGE, ChunkedUploadError, ChunkedUploadStore,
+)
+
+DATA = b"%PDF-1.4 " + bytes(range(256)) * 40
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ChunkedUploadStore(str(tmp_path), max_bytes=100_000, max_chunk_bytes=4096, ttl_seconds=3600)
+
+
+def new_upload(store, data=DATA):
+    return store.create("cv.pdf", len(data), hashlib.sha256(data).hexdigest())["upload_id"]
+
+
+def rejected(code, fn, *args):
+    with pytest.raises(ChunkedUploadError) as e:
+        fn(*args)
+    assert e.value.code == code
+    return e.value
+
+
+def test_upload_in_chunks_and_take(store):
+    upload_id = new_upload(store)
+    offset = 0
+    while offset < len(DATA):
+        chunk = DATA[offset:offset + 4096]
+        offset = store.append(upload_id, offset, chunk, hashlib.sha256(chunk).hexdigest())
+    assert store.complete(upload_id)["complete"]
+    meta, f = store.take(upload_id)
+    with f:
+        assert (meta["filename"], f.read()) == ("cv.pdf", DATA)
+    assert os.listdir(store.directory) == []
+    rejected(NOT_FOUND, store.status, upload_id)
+
+
+def test_offset_mismatch_reports_the_current_offset(store):
+    upload_id = new_upload(store)
+    store.append(upload_id, 0, DATA[:1000])
+    error = rejected(OFFSET_MISMATCH, store.append, upload_id, 500, DATA[500:1500])
+    assert error.offset == 1000  # sent back as Upload-Offset
+    error = rejected(OFFSET_MISMATCH, store.append, upload_id, 2000, DATA[2000:3000])
+    assert error.offset == 1000
+    assert store.status(upload_id)["offset"] == 1000
+
+
+def test_resume_after_a_partial_chunk(store):
+    upload_id = new_upload(store)
+    store.append(upload_id, 0, DATA[:4096])
+    # The connection dropped mid-chunk: only part of the next chunk reached the server
+    store.append(upload_id, 4096, DATA[4096:6000])
+    offset = store.status(upload_id)["offset"]
+    assert offset == 6000
+    while offset < len(DATA):
+        offset = store.append(upload_id, offset, DATA[offset:offset + 4096])
+    store.complete(upload_id)
+    _, f = store.take(upload_id)
+    with f:
+        assert f.read() == DATA
+
+
+def test_chunk_checks(store):
+    upload_id = new_upload(store)
+    error = rejected(CHECKSUM_MISMATCH, store.append, upload_id, 0, DATA[:100], "0" * 64)
+    assert error.offset == 0
+    rejected(TOO_LARGE, store.append, upload_id, 0, DATA[:4097])
+    rejected(TOO_LARGE, store.create, "big.pdf", 100_001, "0" * 64)
+    small = store.create("cv.pdf", 10, "0" * 64)["upload_id"]
+    rejected(TOO_LARGE, store.append, small, 0, DATA[:11])
+    assert store.status(upload_id)["offset"] == store.status(small)["offset"] == 0
+
+
+def test_complete_checks_size_and_sha256(store):
+    upload_id = new_upload(store)
+    store.append(upload_id, 0, DATA[:4096])
+    assert rejected(INCOMPLETE, store.complete, upload_id).offset == 4096
+    rejected(INCOMPLETE, store.take, upload_id)
+
+    corrupt = DATA[:-1] + b"?"
+    upload_id = store.create("cv.pdf", len(DATA), hashlib.sha256(DATA).hexdigest())["upload_id"]
+    offset = 0
+    while offset < len(corrupt):
+        offset = store.append(upload_id, offset, corrupt[offset:offset + 4096])
+    rejected(CHECKSUM_MISMATCH, store.complete, upload_id)
+    # The session is gone: the client starts over
+    rejected(NOT_FOUND, store.status, upload_id)
+
+
+def test_no_chunks_after_complete(store):
+    upload_id = new_upload(store, DATA[:100])
+    store.append(upload_id, 0, DATA[:100])
+    store.complete(upload_id)
+    assert store.complete(upload_id)["complete"]  # completing twice is harmless
+    assert rejected(OFFSET_MISMATCH, store.append, upload_id, 100, b"x").offset == 100
+
+
+def test_upload_id_is_validated(store):
+    for upload_id in ("../../etc/passwd", "ABC", "", "0" * 31, "g" * 32, "0" * 32 + "/x", "0" * 32 + "\n"):
+        rejected(NOT_FOUND, store.status, upload_id)
+        rejected(NOT_FOUND, store.append, upload_id, 0, b"x")
+    rejected(NOT_FOUND, store.status, "0" * 32)  # well-formed but unknown
+
+
+def test_idle_sessions_are_purged(store):
+    idle, active = new_upload(store), new_upload(store)
+    old = time.time() - 7200
+    os.utime(os.path.join(store.directory, idle + ".part"), (old, old))
+    store.append(active, 0, DATA[:100])
+    store.purge_expired()
+    rejected(NOT_FOUND, store.status, idle)
+    assert store.status(active)["offset"] == 100
+    assert sorted(os.listdir(store.directory)) == sorted([active + ".part", active + ".json"])
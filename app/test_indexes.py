@@ -0,0 +1,124 @@
+# Run with: python -m pytest app/test_indexes.py  (needs a MongoDB server at MONGODB_URL)
+import asyncio
+from datetime import datetime, timedelta, timezone
+import pytest
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+from app.config import MONGODB_URL
+from app.services.dedup import BloomFilter, load_known_hashes
+from app.services.resume_store import (
+    SEARCH_PROJECTION, build_resume_document, ensure_indexes, known_hashes_query, search_query, stored_parses_query
+)
+
+TEST_DB = "resume_db_test_indexes"
+
+
+@pytest.fixture(scope="module")
+def db():
+    client = MongoClient(MONGODB_URL, serverSelectionTimeoutMS=1000)
+    try:
+        client.admin.command("ping")
+    except PyMongoError:
+        pytest.skip("MongoDB is not reachable")
+    client.drop_database(TEST_DB)
+
+    async def create_indexes():
+        motor_client = AsyncIOMotorClient(MONGODB_URL)
+        await ensure_indexes(motor_client[TEST_DB])
+        motor_client.close()
+    asyncio.run(create_indexes())
+
+    parsed = {
+        "parsed_skills": ["Django", "SQL"],
+        "parsed_education": {"degrees": ["B.Tech"], "institutes": ["University"]},
+        "parsed_experience": ["3 years"],
+        "parsed_salary": ["$85,000"],
+    }
+    client[TEST_DB]["resumes"].insert_many(
+        [build_resume_document(f"resume{i}.pdf", f"{i:064x}", parsed) for i in range(200)]
+    )
+    yield client[TEST_DB]
+    client.drop_database(TEST_DB)
+    client.close()
+
+
+def plan_stages(plan):
+    """Every stage name in an explain() winning plan (classic and SBE layouts)."""
+    stages = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for value in plan.values():
+            stages += plan_stages(value)
+    elif isinstance(plan, list):
+        for value in plan:
+            stages += plan_stages(value)
+    return stages
+
+
+def winning_plan(cursor):
+    return cursor.explain()["queryPlanner"]["winningPlan"]
+
+
+def test_known_hash_lookup_is_covered(db):
+    query, projection = known_hashes_query([f"{7:064x}", f"{9999:064x}"])
+    stages = plan_stages(winning_plan(db["resumes"].find(query, projection)))
+    assert "IXSCAN" in stages
+    assert "FETCH" not in stages and "COLLSCAN" not in stages
+
+
+def test_stored_parse_lookup_fetches_only_matches(db):
+    # The parse and features are not indexable, so the FETCH is expected; it must be driven
+    # by the unique hash index, not a scan
+    query, projection = stored_parses_query([f"{7:064x}", f"{8:064x}"])
+    plan = winning_plan(db["resumes"].find(query, projection))
+    stages = plan_stages(plan)
+    assert "IXSCAN" in stages and "content_hash_unique" in str(plan)
+    assert "COLLSCAN" not in stages and "SORT" not in stages
+    assert db["resumes"].find(query, projection).explain()["executionStats"]["totalDocsExamined"] == 2
+
+
+# Search returns stored fields, so results are fetched; what the indexes must avoid is a
+# collection scan and, for the shapes they are laid out for, an in-memory sort
+@pytest.mark.parametrize("kwargs, sorted_by_index", [
+    ({"skills": ["python"]}, True),
+    ({"skills": ["django", "sql"], "min_experience": 2}, True),
+    ({"degree": "BTech"}, True),
+    ({"min_experience": 1}, False),
+    ({"max_salary": 100000}, False),
+    ({}, True),
+])
+def test_search_uses_an_index(db, kwargs, sorted_by_index):
+    query, sort = search_query(**kwargs)
+    stages = plan_stages(winning_plan(db["resumes"].find(query, SEARCH_PROJECTION).sort(sort).limit(50)))
+    assert "IXSCAN" in stages
+    assert "COLLSCAN" not in stages
+    if sorted_by_index:
+        assert "SORT" not in stages
+
+
+def test_skill_search_is_sorted_by_the_index(db):
+    query, sort = search_query(skills=["python"])
+    plan = winning_plan(db["resumes"].find(query, SEARCH_PROJECTION).sort(sort).limit(50))
+    assert "SORT" not in plan_stages(plan)
+    assert "skills_experience" in str(plan)
+
+
+def test_bloom_refresh_reads_only_recent_resumes(db):
+    recent = build_resume_document("new.pdf", "f" * 64, {"parsed_skills": []})
+    recent["created_at"] = datetime.now(timezone.utc) + timedelta(days=1)
+    db["resumes"].insert_one(recent)
+
+    async def refresh():
+        client = AsyncIOMotorClient(MONGODB_URL)
+        bloom = BloomFilter(1000, 0.001)
+        await load_known_hashes(bloom, client[TEST_DB]["resumes"], since=recent["created_at"])
+        client.close()
+        return bloom
+    try:
+        bloom = asyncio.run(refresh())
+    finally:
+        db["resumes"].delete_one({"content_hash": "f" * 64})
+    assert bloom.count == 1
+    assert bloom.might_contain("f" * 64)
@@ -0,0 +1,38 @@
+# Run with: python -m pytest app/test_resume_parser.py  (needs the en_core_web_sm spaCy model)
+import re
+import pytest
+
+try:
+    from app.services.resume_parser import extract_education, extract_experience, parse_resume_text
+except OSError:
+    pytest.skip("spaCy model en_core_web_sm is not installed", allow_module_level=True)
+
+RESUMES = [
+    "Jane Doe\nEducation\nB.Tech, XYZ University\nRelevant Coursework:\nAlgorithms\nM.Tech, ABC Institute\n",
+    "Experience\nAcme - 3 years\nTechnologies: Python, AWS\nBeta Inc - 18 months\n"
+    "Education\nMBA, School of Business, 2 years\nCourses\nPhD prep, 6 mos\n",
+    "Summary\nMaster of data with 4.5 yrs at a College lab\nSkills\nPython\n",
+]
+
+
+def baseline_fields(text):
+    """The regexes parse_resume ran before sections and the fused scan."""
+    experience = [m[0] + " " + m[2] for m in re.findall(r"(\d+(\.\d+)?)\s*(years?|yrs?|months?|mos?)", text, re.I)]
+    degrees = set(re.findall(r"(B\.?Tech|M\.?Tech|Bachelor|Master|MBA|Ph\.?D)", text, re.I))
+    institutes = set(re.findall(r"(University|College|Institute|School of [A-Za-z]+)", text, re.I))
+    return experience, degrees, institutes
+
+
+@pytest.mark.parametrize("text", RESUMES)
+def test_education_and_experience_match_baseline(text):
+    experience, degrees, institutes = baseline_fields(text)
+    education = extract_education(text)
+    assert extract_experience(text) == experience
+    assert set(education["degrees"]) == degrees
+    assert set(education["institutes"]) == institutes
+
+
+def test_parse_resume_text_reads_education_across_sub_labels():
+    parsed = parse_resume_text(RESUMES[0])
+    assert sorted(parsed["parsed_education"]["degrees"]) == ["B.Tech", "M.Tech"]
+    assert sorted(parsed["parsed_education"]["institutes"]) == ["Institute", "University"]
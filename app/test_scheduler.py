@@ -0,0 +1,129 @@
+# Run with: python -m pytest app/test_scheduler.py
+import asyncio
+import threading
+import pytest
+from app.services.scheduler import (
+    BULK, CLIENT_LIMIT, INTERACTIVE, OVERLOADED, AdmissionController, AdmissionRejected, PriorityExecutor,
+)
+
+
+def controller(**limits):
+    settings = dict(
+        max_active=2, bulk_max_active=1, max_queued=1, queue_timeout=5, client_max_active=2, retry_after=7
+    )
+    return AdmissionController(**{**settings, **limits})
+
+
+def idle(admission):
+    return admission.metrics()["active"] == {"interactive": 0, "bulk": 0} and not admission._clients
+
+
+def test_client_limit_is_rejected_with_retry_after():
+    async def scenario():
+        admission = controller(client_max_active=1)
+        await admission.acquire("a", INTERACTIVE)
+        with pytest.raises(AdmissionRejected) as rejected:
+            await admission.acquire("a", INTERACTIVE)
+        assert (rejected.value.code, rejected.value.retry_after) == (CLIENT_LIMIT, 7)
+        await admission.acquire("b", INTERACTIVE)  # other clients are not affected
+        admission.release("a", INTERACTIVE)
+        admission.release("b", INTERACTIVE)
+        assert idle(admission)
+
+    asyncio.run(scenario())
+
+
+def test_full_queue_is_rejected_and_interactive_keeps_its_slots():
+    async def scenario():
+        admission = controller()
+        await admission.acquire("a", BULK)
+        queued = asyncio.create_task(admission.acquire("b", BULK))  # bulk slots are taken
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected) as rejected:
+            await admission.acquire("c", BULK)  # the bulk queue holds one
+        assert rejected.value.code == OVERLOADED
+        await admission.acquire("c", INTERACTIVE)
+        assert admission.metrics()["queued"] == {"interactive": 0, "bulk": 1}
+        admission.release("a", BULK)
+        await queued
+        admission.release("b", BULK)
+        admission.release("c", INTERACTIVE)
+        assert idle(admission)
+        assert admission.rejected == {OVERLOADED: 1}
+
+    asyncio.run(scenario())
+
+
+def test_wait_timeout_gives_back_the_client_slot():
+    async def scenario():
+        admission = controller(max_active=1, queue_timeout=0.05)
+        await admission.acquire("a", INTERACTIVE)
+        with pytest.raises(AdmissionRejected) as rejected:
+            await admission.acquire("b", INTERACTIVE)
+        assert (rejected.value.code, rejected.value.retry_after) == (OVERLOADED, 7)
+        assert admission.metrics()["queued"] == {"interactive": 0, "bulk": 0}
+        admission.release("a", INTERACTIVE)
+        assert idle(admission)
+        await admission.acquire("b", INTERACTIVE)  # the slot was not leaked
+        admission.release("b", INTERACTIVE)
+        assert idle(admission)
+
+    asyncio.run(scenario())
+
+
+def test_release_hands_the_slot_to_interactive_waiters_first():
+    async def scenario():
+        admission = controller(max_active=1, max_queued=5)
+        await admission.acquire("a", BULK)
+        order = []
+
+        async def wait(client, priority):
+            await admission.acquire(client, priority)
+            order.append(client)
+
+        waiters = [asyncio.create_task(wait("bulk", BULK)), asyncio.create_task(wait("interactive", INTERACTIVE))]
+        await asyncio.sleep(0)
+        admission.release("a", BULK)
+        await asyncio.sleep(0.01)
+        assert order == ["interactive"]
+        assert admission.metrics()["active"] == {"interactive": 1, "bulk": 0}
+        admission.release("interactive", INTERACTIVE)
+        await asyncio.gather(*waiters)
+        assert order == ["interactive", "bulk"]
+        admission.release("bulk", BULK)
+        assert idle(admission)
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_is_skipped_on_release():
+    async def scenario():
+        admission = controller(max_active=1, max_queued=5)
+        await admission.acquire("a", INTERACTIVE)
+        gone = asyncio.create_task(admission.acquire("b", INTERACTIVE))
+        waiting = asyncio.create_task(admission.acquire("c", INTERACTIVE))
+        await asyncio.sleep(0)
+        gone.cancel()
+        await asyncio.sleep(0)
+        admission.release("a", INTERACTIVE)
+        await waiting
+        assert admission.metrics()["active"] == {"interactive": 1, "bulk": 0}
+        admission.release("c", INTERACTIVE)
+        assert idle(admission)
+
+    asyncio.run(scenario())
+
+
+def test_priority_executor_runs_interactive_work_first():
+    executor = PriorityExecutor(max_workers=1)
+    gate, order = threading.Event(), []
+    executor.submit(gate.wait)  # keeps the only thread busy while the rest is queued
+    bulk = executor.with_priority(BULK)
+    futures = [bulk.submit(order.append, f"bulk{i}") for i in range(3)]
+    futures += [executor.submit(order.append, f"interactive{i}") for i in range(2)]
+    futures[1].cancel()
+    gate.set()
+    for future in futures[:1] + futures[2:]:
+        future.result(timeout=5)
+    assert order == ["interactive0", "interactive1", "bulk0", "bulk2"]
+    executor.shutdown()
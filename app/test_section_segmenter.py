@@ -0,0 +1,68 @@
+# Run with: python -m pytest app/test_section_segmenter.py
+from app.services.section_segmenter import SKILL_TEXT_CHARS, segment_sections, section_text, skills_section_text
+
+
+def names(text):
+    return [s.name for s in segment_sections(text)]
+
+
+def test_headings_in_any_case_spacing_and_punctuation():
+    text = "Jane\nSUMMARY\nx\n• Technical  Skills:\nPython\nWork History -\ny\nVolunteering:\nz\n"
+    assert names(text) == ["header", "summary", "skills", "experience", "volunteering"]
+
+
+def test_languages_label_stays_in_skills_section():
+    text = "Skills\nLanguages: Python, Java\nFrameworks: Django\nEducation\nB.Tech\n"
+    sections = segment_sections(text)
+    assert [s.name for s in sections] == ["skills", "education"]
+    assert "Languages: Python, Java" in section_text(text, sections, "skills")
+
+
+def test_languages_heading_outside_skills():
+    assert names("Jane\nLanguages\nEnglish, Hindi\n") == ["header", "languages"]
+    assert names("Jane\nLanguages: English, Hindi\n") == ["header"]
+
+
+def test_sub_labels_stay_in_skills_section():
+    text = (
+        "Summary\nBackend engineer.\nSkills\nProgramming Languages:\nPython, Java\n"
+        "Frameworks:\nDjango, Flask\nLanguages:\nGo\nExperience\nAcme - 2 years\n"
+    )
+    assert names(text) == ["summary", "skills", "experience"]
+    assert skills_section_text(text) == "Programming Languages:\nPython, Java\nFrameworks:\nDjango, Flask\nLanguages:\nGo"
+
+
+def test_sub_labels_stay_in_experience_and_education_sections():
+    text = (
+        "Experience\nAcme - 3 years\nKey Responsibilities:\nBuilt APIs\nAchievements Summary:\nShipped v2\n"
+        "Education\nB.Tech, XYZ University\nRelevant Coursework:\nAlgorithms\nM.Tech, ABC Institute\n"
+    )
+    sections = segment_sections(text)
+    assert [s.name for s in sections] == ["experience", "education"]
+    assert section_text(text, sections, "experience").endswith("Shipped v2")
+    assert section_text(text, sections, "education").endswith("M.Tech, ABC Institute")
+
+
+def test_inline_technologies_line_stays_in_experience():
+    text = (
+        "Experience\nAcme Corp - 3 years\nTechnologies: Python, AWS\n"
+        "Beta Inc - 2 years\nBuilt pipelines\nEducation\nB.Tech\n"
+    )
+    sections = segment_sections(text)
+    assert [s.name for s in sections] == ["experience", "education"]
+    assert "Beta Inc - 2 years" in section_text(text, sections, "experience")
+    # With no skills section, the inline skills heading is what goes to spaCy
+    assert skills_section_text(text, sections) == "Python, AWS"
+
+
+def test_skills_text_is_capped():
+    huge = "python sql docker " * 20_000
+    assert len(skills_section_text("Skills\n" + huge)) == SKILL_TEXT_CHARS
+    assert len(skills_section_text("Experience\n" + huge)) == SKILL_TEXT_CHARS
+    assert len(skills_section_text("Required Skills & Tools - " + huge)) <= SKILL_TEXT_CHARS
+
+
+def test_no_heading_sends_only_skill_lines():
+    text = "Jane\nI like hiking.\nBuilt services in Django.\nPlays chess\n" + "lorem ipsum\n" * 10_000
+    assert skills_section_text(text) == "Built services in Django."
+    assert len(skills_section_text("lorem ipsum\n" * 10_000)) == SKILL_TEXT_CHARS
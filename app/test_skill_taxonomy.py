@@ -0,0 +1,51 @@
+# Run with: python -m pytest app/test_skill_taxonomy.py
+import pytest
+from app.services.matching_service import compile_job, score_counts, skill_boost_tokens, term_counts
+from app.services.skill_taxonomy import TAXONOMY
+
+
+def names(skills):
+    return set(TAXONOMY.names_of(TAXONOMY.skills_mask(skills)))
+
+
+@pytest.mark.parametrize("phrase, not_credited", [
+    ("a go-getter attitude", "go"),
+    ("Spring 2021 internship", "java"),
+    ("Express delivery", "javascript"),
+    ("Node of team", "javascript"),
+    ("React quickly to incidents", "javascript"),
+])
+def test_everyday_words_in_phrases_are_not_skills(phrase, not_credited):
+    assert not_credited not in names([phrase])
+    assert TAXONOMY.credited_terms([phrase], [not_credited]) == set()
+
+
+@pytest.mark.parametrize("skill, credited", [
+    ("Go", "go"),
+    ("Spring", "java"),
+    ("Express", "javascript"),
+    ("Node", "javascript"),
+    ("ML", "machine learning"),
+])
+def test_whole_skills_resolve_through_aliases(skill, credited):
+    assert credited in names([skill])
+
+
+def test_unambiguous_terms_are_found_inside_phrases():
+    assert {"django", "python", "postgresql", "sql"} <= names(["built APIs with Django and PostgreSQL"])
+    assert "spring" in names(["Spring Boot microservices"])
+    assert TAXONOMY.credited_terms(["experience with django rest framework"], ["python"]) == {"django"}
+
+
+def test_short_aliases_are_not_found_inside_phrases():
+    assert "artificial intelligence" not in names(["AI research group"])
+    assert "javascript" not in names(["JS team lead"])
+
+
+def test_multi_word_skills_boost_their_tokens():
+    tokens = skill_boost_tokens(["Machine Learning"])
+    assert {"machine", "learning", "ml"} <= tokens
+    assert all(" " not in token for token in tokens)
+    job = compile_job({"skills": ["Machine Learning"]})
+    resume = term_counts("machine learning research")
+    assert score_counts(resume, job.counts, job.boost_terms) > score_counts(resume, job.counts, set())
@@ -0,0 +1,113 @@
+# Run with: python -m pytest app/test_zip_upload.py
+import io
+import os
+import struct
+import zipfile
+from concurrent.futures import Future
+import pytest
+from app.services.batch_runner import BatchItem
+from app.services.upload_spool import UploadLimitError
+from app.services.zip_upload import close_after, open_archive, pdf_members, read_member
+
+LIMITS = dict(max_files=5, max_file_bytes=1_000_000, max_total_bytes=2_000_000, max_ratio=100)
+
+
+def archive(*members):
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as z:
+        for name, data in members:
+            z.writestr(name, data)
+    return buf.getvalue()
+
+
+def pdf(size):
+    return b"%PDF-" + os.urandom(size)  # random bytes barely compress
+
+
+def test_pdf_members_skips_folders_macos_metadata_and_other_files():
+    data = archive(("a/cv.pdf", pdf(10)), ("b/cv.PDF", pdf(10)), ("__MACOSX/a/cv.pdf", b"x"), ("notes.txt", b"x"))
+    members = pdf_members(open_archive(io.BytesIO(data)), **LIMITS)
+    assert [m.filename for m in members] == ["a/cv.pdf", "b/cv.PDF"]
+
+
+def test_too_many_members():
+    data = archive(*((f"{i}.pdf", pdf(10)) for i in range(6)))
+    with pytest.raises(UploadLimitError, match="At most 5 PDFs"):
+        pdf_members(open_archive(io.BytesIO(data)), **LIMITS)
+
+
+def test_high_ratio_member():
+    data = archive(("bomb.pdf", b"%PDF-" + b"\0" * 900_000))
+    with pytest.raises(UploadLimitError, match="compressed more than 100:1"):
+        pdf_members(open_archive(io.BytesIO(data)), **LIMITS)
+
+
+def test_declared_sizes_over_the_limits():
+    with pytest.raises(UploadLimitError, match="larger than 1000000 bytes"):
+        pdf_members(open_archive(io.BytesIO(archive(("big.pdf", pdf(1_000_001))))), **LIMITS)
+    data = archive(*((f"{i}.pdf", pdf(700_000)) for i in range(3)))
+    with pytest.raises(UploadLimitError, match="Archive contents are larger"):
+        pdf_members(open_archive(io.BytesIO(data)), **LIMITS)
+
+
+def test_ratio_is_checked_again_while_inflating():
+    data = archive(("cv.pdf", pdf(1000) + b"\0" * 50_000))  # about 40:1
+    zip_archive = open_archive(io.BytesIO(data))
+    (member,) = pdf_members(zip_archive, **LIMITS)
+    with pytest.raises(UploadLimitError, match="inflates past"):
+        read_member(zip_archive, member, max_ratio=10)
+
+
+def test_false_declared_size_inflates_no_further():
+    data = bytearray(archive(("cv.pdf", b"%PDF-" + b"x" * 100_000)))
+    # Declare 1000 bytes in both the local header and the central directory
+    struct.pack_into("<I", data, 22, 1000)
+    struct.pack_into("<I", data, data.find(b"PK\x01\x02") + 24, 1000)
+    zip_archive = open_archive(io.BytesIO(bytes(data)))
+    (member,) = pdf_members(zip_archive, **LIMITS)
+    assert member.info.file_size == 1000
+    with pytest.raises(zipfile.BadZipFile):
+        read_member(zip_archive, member, LIMITS["max_ratio"])
+
+
+def test_member_inflates_in_full():
+    content = pdf(200_000)
+    zip_archive = open_archive(io.BytesIO(archive(("cv.pdf", content))))
+    (member,) = pdf_members(zip_archive, **LIMITS)
+    assert read_member(zip_archive, member, LIMITS["max_ratio"]) == content
+
+
+def test_not_a_zip():
+    with pytest.raises(zipfile.BadZipFile):
+        open_archive(io.BytesIO(b"%PDF-1.4 not an archive"))
+
+
+class Closable:
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def item_with(future):
+    item = BatchItem(0, lambda: None)
+    item.future = future
+    return item
+
+
+def test_close_after_waits_for_running_items():
+    done, running, late = Future(), Future(), Future()
+    done.set_result(None)
+    files = [Closable(), Closable()]
+    close_after([item_with(done), item_with(running), item_with(late), item_with(None)], files)
+    assert not any(f.closed for f in files)
+    running.set_result(None)
+    assert not any(f.closed for f in files)
+    late.set_exception(RuntimeError("failed"))
+    assert all(f.closed for f in files)
+
+
+def test_close_after_closes_at_once_when_nothing_runs():
+    files = [Closable()]
+    close_after([], files)
+    assert files[0].closed